@@ -6,18 +6,139 @@ Runs progressive assessments with 4 levels each.
 
 import os
 import sys
-import subprocess
 import argparse
+import contextlib
+import cProfile
+import hashlib
+import importlib
+import io
+import json
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import time
 
+import pytest
+
+from assessments.test_config import solution_imports
+
+
+LEVELS = ["level1", "level2", "level3", "level4"]
+
+# Bump when the shape of a level result changes so stale cache entries are ignored
+CACHE_VERSION = 2
+
+
+def _run_level_job(assessment_name, level_name, source_dir, verbose, options=None):
+    """Run one level in a worker process and return its result with captured output."""
+    runner = AssessmentRunner(**(options or {}))
+    level_dir = runner.assessments_dir / assessment_name / level_name
+    
+    # Timings and profiles are only meaningful for a real run, so profiling bypasses the cache
+    use_cache = runner.use_cache and not runner.profile
+    cache_key = runner._get_cache_key(level_dir, source_dir, verbose) if use_cache else None
+    if cache_key:
+        cached = runner._load_cached_result(cache_key)
+        if cached:
+            return cached
+    
+    output = io.StringIO()
+    
+    with contextlib.redirect_stdout(output):
+        level_start = time.time()
+        passed, total, tests = runner._run_level_tests(level_dir, source_dir, verbose)
+        level_time = time.time() - level_start
+    
+    result = {
+        'passed': passed,
+        'total': total,
+        'time': level_time,
+        'tests': tests,
+        'output': output.getvalue(),
+        'cached': False
+    }
+    
+    if cache_key:
+        runner._save_cached_result(cache_key, result)
+    
+    return result
+
+
+class ResultCollector:
+    """Pytest plugin that records a structured outcome for every test."""
+    
+    def __init__(self):
+        self.tests = []
+    
+    def pytest_collectreport(self, report):
+        """Record modules that fail to collect (e.g. a broken import) as errors."""
+        if report.failed:
+            self.tests.append({
+                'nodeid': report.nodeid,
+                'outcome': 'error',
+                'duration': 0.0,
+                'message': self._get_message(report)
+            })
+    
+    def pytest_runtest_logreport(self, report):
+        """Record the outcome of each test phase that decides the result."""
+        if report.when == 'call':
+            outcome = report.outcome
+        elif report.failed:
+            outcome = 'error'  # setup or teardown failure
+        elif report.when == 'setup' and report.skipped:
+            outcome = 'skipped'
+        else:
+            return
+        
+        self.tests.append({
+            'nodeid': report.nodeid,
+            'outcome': outcome,
+            'duration': report.duration,
+            'message': self._get_message(report) if report.failed else None
+        })
+    
+    def _get_message(self, report):
+        """Get the last line of a failure, e.g. 'AssertionError: assert 1 == 2'."""
+        text = report.longreprtext.strip()
+        if not text:
+            return None
+        
+        message = text.splitlines()[-1]
+        if message.startswith("E "):
+            message = message[1:].strip()  # Drop pytest's error-line marker
+        return message
+
+
+class TestProfiler:
+    """Pytest plugin that runs each test call under cProfile."""
+    
+    def __init__(self):
+        self.profiles = {}  # nodeid -> cProfile.Profile
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        # The test's outcome (including any exception) is captured by pluggy
+        outcome = yield
+        profiler.disable()
+        self.profiles[item.nodeid] = profiler
+
 
 class AssessmentRunner:
     """Assessment runner for CodeSignal practice."""
     
-    def __init__(self):
+    def __init__(self, use_cache=True, profile=False, profile_dir=None, profile_top=10):
         self.root_dir = Path(__file__).parent
         self.assessments_dir = self.root_dir / "assessments"
+        self.cache_dir = self.root_dir / ".assessment_cache"
+        self.use_cache = use_cache
+        self.profile = profile or profile_dir is not None
+        self.profile_dir = profile_dir  # dump cProfile stats for the slowest tests here
+        self.profile_top = profile_top
+        self.reports = {}  # assessment_name -> structured results of the last run
         
     def list_assessments(self):
         """List available assessments."""
@@ -30,7 +151,7 @@ class AssessmentRunner:
                 
                 # Check which levels exist
                 levels = []
-                for level in ["level1", "level2", "level3", "level4"]:
+                for level in LEVELS:
                     level_dir = assessment_dir / level
                     if level_dir.exists():
                         levels.append(level)
@@ -39,63 +160,106 @@ class AssessmentRunner:
                     print(f"     Levels: {', '.join(levels)}")
                 print()
     
-    def run_assessment(self, assessment_name, mode="candidate", level=None, verbose=False, timed=False):
+    def run_assessments(self, assessment_names, mode="candidate", level=None, verbose=False, jobs=1,
+                        output_format="text"):
+        """Run several assessments, sharing one worker pool when jobs > 1."""
+        if output_format != "text":
+            # Keep stdout machine-readable: discard the emoji report and print
+            # the collected results in the requested format instead.
+            with contextlib.redirect_stdout(io.StringIO()):
+                success = self.run_assessments(assessment_names, mode, level, verbose, jobs)
+            
+            reports = [self.reports[name] for name in assessment_names]
+            if output_format == "json":
+                print(self._format_json(reports, mode))
+            else:
+                print(self._format_junit(reports))
+            return success
+        
+        if jobs <= 1:
+            results = [self.run_assessment(name, mode, level, verbose) for name in assessment_names]
+            return all(results)
+        
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # Submit every level of every assessment up front so the pool stays busy,
+            # then report each assessment in order as its results come in.
+            scheduled = {
+                name: self._submit_levels(pool, name, mode, level, verbose)
+                for name in assessment_names
+            }
+            results = [
+                self.run_assessment(name, mode, level, verbose, scheduled=scheduled[name])
+                for name in assessment_names
+            ]
+        
+        return all(results)
+    
+    def run_assessment(self, assessment_name, mode="candidate", level=None, verbose=False, timed=False,
+                       jobs=1, scheduled=None):
         """Run an assessment."""
+        if jobs > 1 and scheduled is None and not timed:
+            return self.run_assessments([assessment_name], mode, level, verbose, jobs)
+        
         assessment_dir = self.assessments_dir / assessment_name
         
         if not assessment_dir.exists():
             print(f"❌ Assessment '{assessment_name}' not found!")
+            self.reports[assessment_name] = {
+                'assessment': assessment_name,
+                'error': f"Assessment '{assessment_name}' not found"
+            }
             return False
         
+        source_dir = self._get_source_dir(mode)
         if mode == "model":
             print(f"🧪 Testing MODEL SOLUTION: {assessment_name}")
-            source_dir = "model_solution"
         else:
             print(f"🧪 Testing YOUR IMPLEMENTATION: {assessment_name}")
-            source_dir = "candidate"
         
         print("="*60)
         
-        # Determine which levels to run
-        if level:
-            levels_to_run = [level]
-        else:
-            levels_to_run = ["level1", "level2", "level3", "level4"]
-        
         total_passed = 0
         total_tests = 0
         level_results = {}
+        level_reports = []
         
         start_time = time.time() if timed else None
         
-        for level_name in levels_to_run:
-            level_dir = assessment_dir / level_name
-            if not level_dir.exists():
-                continue
-            
+        for level_name in self._get_levels_to_run(assessment_dir, level):
             print(f"\n🎯 {level_name.upper()}: {self._get_level_description(level_name)}")
             print("-" * 50)
             
-            level_start = time.time() if timed else None
+            # Run tests for this level, or collect the result from the worker pool
+            if scheduled is not None:
+                result = scheduled[level_name].result()
+            elif timed:
+                # The timed report shows each level's time, so never replay a cached one
+                options = dict(self._get_options(), use_cache=False)
+                result = _run_level_job(assessment_name, level_name, source_dir, verbose, options)
+            else:
+                result = _run_level_job(assessment_name, level_name, source_dir, verbose, self._get_options())
+            print(result['output'], end="")
             
-            # Run tests for this level
-            passed, total = self._run_level_tests(level_dir, source_dir, verbose)
+            passed, total = result['passed'], result['total']
             total_passed += passed
             total_tests += total
             
-            level_time = time.time() - level_start if timed else None
+            level_time = result['time'] if timed else None
             level_results[level_name] = {
                 'passed': passed,
                 'total': total,
                 'time': level_time
             }
+            level_reports.append({
+                'level': level_name,
+                'passed': passed,
+                'total': total,
+                'time': result['time'],
+                'cached': result['cached'],
+                'tests': result['tests']
+            })
             
-            if passed == total and total > 0:
-                time_str = f" ({level_time:.1f}s)" if level_time else ""
-                print(f"✅ {level_name.upper()}: All {total} tests PASSED!{time_str}")
-            else:
-                time_str = f" ({level_time:.1f}s)" if level_time else ""
-                print(f"❌ {level_name.upper()}: {passed}/{total} tests passed{time_str}")
+            self._print_level_result(level_name, result, level_time)
         
         total_time = time.time() - start_time if timed else None
         
@@ -128,8 +292,139 @@ class AssessmentRunner:
         else:
             print(f"💪 Need {520-score} more points to pass")
         
+        self.reports[assessment_name] = {
+            'assessment': assessment_name,
+            'source_dir': source_dir,
+            'passed': total_passed,
+            'total': total_tests,
+            'score': score,
+            'max_score': 600,
+            'levels': level_reports
+        }
+        
         return total_passed == total_tests and total_tests > 0
     
+    def watch_assessment(self, assessment_name, mode="candidate", verbose=False, interval=0.5):
+        """Re-run only the affected level whenever a solution or test file is saved."""
+        assessment_dir = self.assessments_dir / assessment_name
+        
+        if not assessment_dir.exists():
+            print(f"❌ Assessment '{assessment_name}' not found!")
+            return False
+        
+        source_dir = self._get_source_dir(mode)
+        self.run_assessment(assessment_name, mode, verbose=verbose)
+        
+        print(f"\n👀 Watching {assessment_name} ({source_dir}/ and tests/) - press Ctrl+C to stop")
+        snapshot = self._snapshot_level_files(assessment_dir, source_dir)
+        
+        try:
+            while True:
+                time.sleep(interval)
+                current = self._snapshot_level_files(assessment_dir, source_dir)
+                changed_levels = sorted({
+                    current.get(path, snapshot.get(path))[0]
+                    for path in set(snapshot) | set(current)
+                    if snapshot.get(path) != current.get(path)
+                })
+                snapshot = current
+                
+                for level_name in changed_levels:
+                    # Modules stay imported between runs; only this level's are reloaded
+                    importlib.invalidate_caches()
+                    print(f"\n🔄 {level_name.upper()}: {self._get_level_description(level_name)}")
+                    print("-" * 50)
+                    result = _run_level_job(assessment_name, level_name, source_dir, verbose, self._get_options())
+                    print(result['output'], end="")
+                    self._print_level_result(level_name, result, result['time'])
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+        
+        return True
+    
+    def _snapshot_level_files(self, assessment_dir, source_dir):
+        """Map each watched file to its level and (mtime, size) stamp."""
+        snapshot = {}
+        for level_name in self._get_levels_to_run(assessment_dir):
+            level_dir = assessment_dir / level_name
+            for path in list((level_dir / source_dir).glob("*.py")) + list((level_dir / "tests").glob("*.py")):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue  # Deleted between glob and stat
+                snapshot[path] = (level_name, stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def _print_level_result(self, level_name, result, level_time):
+        """Print the pass/fail line for a level."""
+        passed, total = result['passed'], result['total']
+        cached_str = " (cached)" if result['cached'] else ""
+        if passed == total and total > 0:
+            time_str = f" ({level_time:.1f}s)" if level_time else ""
+            print(f"✅ {level_name.upper()}: All {total} tests PASSED!{time_str}{cached_str}")
+        else:
+            time_str = f" ({level_time:.1f}s)" if level_time else ""
+            print(f"❌ {level_name.upper()}: {passed}/{total} tests passed{time_str}{cached_str}")
+    
+    def _submit_levels(self, pool, assessment_name, mode, level, verbose):
+        """Submit each level of an assessment to the worker pool."""
+        assessment_dir = self.assessments_dir / assessment_name
+        if not assessment_dir.exists():
+            return {}
+        
+        source_dir = self._get_source_dir(mode)
+        return {
+            level_name: pool.submit(_run_level_job, assessment_name, level_name, source_dir, verbose,
+                                    self._get_options())
+            for level_name in self._get_levels_to_run(assessment_dir, level)
+        }
+    
+    def print_profile_report(self, assessment_name, top=10):
+        """Print the slowest tests of the last run and how each level's time was spent."""
+        report = self.reports.get(assessment_name)
+        if not report or 'error' in report:
+            return
+        
+        tests = [
+            (level_report['level'], test)
+            for level_report in report['levels']
+            for test in level_report['tests']
+        ]
+        slowest = sorted(tests, key=lambda item: item[1]['duration'], reverse=True)[:top]
+        
+        print(f"\n⏱️  SLOWEST {len(slowest)} TESTS: {assessment_name}")
+        print("-" * 60)
+        for level_name, test in slowest:
+            test_name = test['nodeid'].split("::")[-1]
+            print(f"  {test['duration'] * 1000:9.2f} ms  {level_name}  {test_name}")
+            if test.get('profile'):
+                print(f"                      📄 {test['profile']}")
+        
+        print("\n  Level time split (test calls vs. harness):")
+        for level_report in report['levels']:
+            test_time = sum(test['duration'] for test in level_report['tests'])
+            harness_time = level_report['time'] - test_time
+            print(f"  {level_report['level']}: {level_report['time']:.3f}s total, "
+                  f"{test_time:.3f}s in tests, {harness_time:.3f}s harness")
+    
+    def _get_options(self):
+        """Get the settings a worker process needs to run a level like this runner."""
+        return {
+            'use_cache': self.use_cache,
+            'profile': self.profile,
+            'profile_dir': self.profile_dir,
+            'profile_top': self.profile_top
+        }
+    
+    def _get_source_dir(self, mode):
+        """Get the implementation directory name for a mode."""
+        return "model_solution" if mode == "model" else "candidate"
+    
+    def _get_levels_to_run(self, assessment_dir, level=None):
+        """Get the existing levels to run, in order."""
+        levels = [level] if level else LEVELS
+        return [level_name for level_name in levels if (assessment_dir / level_name).exists()]
+    
     def _get_level_description(self, level_name):
         """Get description for a level."""
         descriptions = {
@@ -147,97 +442,207 @@ class AssessmentRunner:
         
         if not test_dir.exists() or not impl_dir.exists():
             print(f"❌ Missing test or implementation directory")
-            return 0, 1
+            return 0, 1, []
         
         # Find test files
         test_files = list(test_dir.glob("test_*.py"))
         if not test_files:
             print(f"❌ No test files found in {test_dir}")
-            return 0, 1
+            return 0, 1, []
         
-        total_passed = 0
-        total_tests = 0
+        tests = []
+        profiler = TestProfiler() if self.profile_dir else None
+        
+        # Run the real test files; the import hook points their solution
+        # imports at the chosen implementation directory.
+        with solution_imports(level_dir.parent.name, level_dir.name, impl_dir):
+            for test_file in test_files:
+                try:
+                    tests.extend(self._run_pytest(test_file, verbose, profiler))
+                except Exception as e:
+                    print(f"❌ Error running tests: {e}")
+                    tests.append({
+                        'nodeid': test_file.name,
+                        'outcome': 'error',
+                        'duration': 0.0,
+                        'message': str(e)
+                    })
+        
+        if profiler:
+            self._dump_profiles(profiler, tests)
+        
+        passed, total = self._count_test_results(tests)
+        return passed, total, tests
+    
+    def _dump_profiles(self, profiler, tests):
+        """Write cProfile stats for the slowest tests and record where they went."""
+        profile_dir = Path(self.profile_dir)
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        
+        profiled = [test for test in tests if test['nodeid'] in profiler.profiles]
+        slowest = sorted(profiled, key=lambda test: test['duration'], reverse=True)[:self.profile_top]
+        for test in slowest:
+            file_name = re.sub(r'[^\w.-]+', '_', test['nodeid']) + ".prof"
+            profile_file = profile_dir / file_name
+            profiler.profiles[test['nodeid']].dump_stats(str(profile_file))
+            test['profile'] = str(profile_file)
+    
+    def _run_pytest(self, test_file, verbose, profiler=None):
+        """Run pytest in this interpreter and return the per-test outcomes."""
+        args = [str(test_file), "-p", "no:cacheprovider"]
+        if verbose:
+            args.extend(["-v", "--tb=short"])
+        else:
+            args.extend(["-q", "--tb=no"])
+        
+        collector = ResultCollector()
+        plugins = [collector, profiler] if profiler else [collector]
+        saved_path = list(sys.path)
+        saved_modules = set(sys.modules)
+        
+        try:
+            if verbose:
+                pytest.main(args, plugins=plugins)
+            else:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pytest.main(args, plugins=plugins)
+        finally:
+            # Tests import solutions by bare module name (e.g. 'inventory') and
+            # extend sys.path, so forget both before the next level runs.
+            sys.path[:] = saved_path
+            self._unload_repo_modules(saved_modules)
+        
+        if not collector.tests:
+            return [{
+                'nodeid': test_file.name,
+                'outcome': 'error',
+                'duration': 0.0,
+                'message': 'No tests collected'
+            }]
+        
+        return collector.tests
+    
+    def _unload_repo_modules(self, keep):
+        """Remove modules imported from this repository since the snapshot was taken."""
+        root = os.path.join(str(self.root_dir.resolve()), "")
+        for name in list(sys.modules):
+            if name in keep:
+                continue
+            module_file = getattr(sys.modules[name], '__file__', None) or ''
+            if os.path.abspath(module_file).startswith(root):
+                del sys.modules[name]
+    
+    def _get_cache_key(self, level_dir, source_dir, verbose):
+        """Hash everything a level's result depends on: solution, tests, shared test helpers and interpreter."""
+        impl_dir = level_dir / source_dir
+        test_dir = level_dir / "tests"
+        if not impl_dir.exists() or not test_dir.exists():
+            return None
+        
+        # Tests also import the helpers next to the assessments (test_config, snapshot_fixtures)
+        shared = sorted(self.assessments_dir.glob("*.py"))
+        
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}|{sys.version}|{source_dir}|{verbose}".encode())
+        for path in shared + sorted(impl_dir.glob("*.py")) + sorted(test_dir.glob("*.py")):
+            digest.update(str(path.relative_to(self.assessments_dir)).encode())
+            digest.update(path.read_bytes())
+        
+        return digest.hexdigest()
+    
+    def _load_cached_result(self, cache_key):
+        """Load a cached level result, or None on a miss."""
+        cache_file = self.cache_dir / f"{cache_key}.json"
+        try:
+            with open(cache_file, 'r') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
         
-        for test_file in test_files:
-            # Create temporary test file that imports from correct location
-            temp_test_content = self._create_dynamic_test(test_file, impl_dir)
-            temp_test_file = self.root_dir / f"temp_{test_file.stem}_{source_dir}.py"
+        result['cached'] = True
+        return result
+    
+    def _save_cached_result(self, cache_key, result):
+        """Save a level result; written via a rename so concurrent runs never see partial files."""
+        self.cache_dir.mkdir(exist_ok=True)
+        cache_file = self.cache_dir / f"{cache_key}.json"
+        temp_file = self.cache_dir / f"{cache_key}.{os.getpid()}.tmp"
+        
+        with open(temp_file, 'w') as f:
+            json.dump(result, f)
+        os.replace(temp_file, cache_file)
+    
+    def _count_test_results(self, tests):
+        """Count passed tests and tests that count towards the total."""
+        passed = sum(1 for t in tests if t['outcome'] == 'passed')
+        total = sum(1 for t in tests if t['outcome'] != 'skipped')
+        return passed, total
+    
+    def _format_json(self, reports, mode):
+        """Render assessment reports as a JSON document."""
+        return json.dumps({'mode': mode, 'assessments': reports}, indent=2)
+    
+    def _format_junit(self, reports):
+        """Render assessment reports as JUnit XML, one <testsuite> per level."""
+        suites = ET.Element('testsuites', name='assessments')
+        counts = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+        total_time = 0.0
+        
+        for report in reports:
+            if 'error' in report:
+                suite = ET.SubElement(suites, 'testsuite', name=report['assessment'],
+                                      tests='1', failures='0', errors='1', skipped='0', time='0')
+                testcase = ET.SubElement(suite, 'testcase', classname=report['assessment'], name='run')
+                ET.SubElement(testcase, 'error', message=report['error'])
+                counts['tests'] += 1
+                counts['errors'] += 1
+                continue
             
-            try:
-                # Write temporary test file
-                with open(temp_test_file, 'w') as f:
-                    f.write(temp_test_content)
-                
-                # Run pytest
-                cmd = ["python", "-m", "pytest", str(temp_test_file)]
-                if verbose:
-                    cmd.extend(["-v", "--tb=short"])
-                else:
-                    cmd.extend(["-q", "--tb=no"])
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
+            for level_report in report['levels']:
+                tests = level_report['tests']
+                suite_counts = {
+                    'tests': len(tests),
+                    'failures': sum(1 for t in tests if t['outcome'] == 'failed'),
+                    'errors': sum(1 for t in tests if t['outcome'] == 'error'),
+                    'skipped': sum(1 for t in tests if t['outcome'] == 'skipped')
+                }
+                for key, value in suite_counts.items():
+                    counts[key] += value
+                total_time += level_report['time']
                 
-                # Parse results
-                passed, total = self._parse_test_results(result.stdout)
-                total_passed += passed
-                total_tests += total
+                suite = ET.SubElement(
+                    suites, 'testsuite',
+                    name=f"{report['assessment']}.{level_report['level']}",
+                    time=f"{level_report['time']:.3f}",
+                    **{key: str(value) for key, value in suite_counts.items()}
+                )
+                properties = ET.SubElement(suite, 'properties')
+                for name in ('source_dir', 'score', 'max_score'):
+                    ET.SubElement(properties, 'property', name=name, value=str(report[name]))
+                ET.SubElement(properties, 'property', name='cached', value=str(level_report['cached']).lower())
                 
-            except Exception as e:
-                print(f"❌ Error running tests: {e}")
-                total_tests += 1
-            finally:
-                # Clean up temp file
-                if temp_test_file.exists():
-                    temp_test_file.unlink()
-        
-        return total_passed, total_tests
-    
-    def _create_dynamic_test(self, test_file, impl_dir):
-        """Create a test file that imports from the specified implementation directory."""
-        with open(test_file, 'r') as f:
-            content = f.read()
-        
-        # Replace the sys.path.insert line to point to the correct directory
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if "sys.path.insert(0," in line and "candidate" in line:
-                lines[i] = f"sys.path.insert(0, r'{impl_dir}')"
-                break
-        
-        return '\n'.join(lines)
-    
-    def _parse_test_results(self, output):
-        """Parse pytest output to get pass/fail counts."""
-        if "FAILED" in output or "ERROR" in output:
-            # Look for summary line like "1 failed, 5 passed"
-            lines = output.split('\n')
-            for line in lines:
-                if "failed" in line and "passed" in line:
-                    parts = line.split()
-                    try:
-                        failed_idx = next(i for i, x in enumerate(parts) if "failed" in x)
-                        failed = int(parts[failed_idx-1])
-                        passed_idx = next(i for i, x in enumerate(parts) if "passed" in x)
-                        passed = int(parts[passed_idx-1])
-                        return passed, passed + failed
-                    except (ValueError, StopIteration):
-                        continue
-            return 0, 1  # Default if parsing fails
-        elif "passed" in output:
-            # All passed - look for "X passed"
-            lines = output.split('\n')
-            for line in lines:
-                if "passed" in line and "failed" not in line:
-                    parts = line.split()
-                    try:
-                        passed_idx = next(i for i, x in enumerate(parts) if "passed" in x)
-                        passed = int(parts[passed_idx-1])
-                        return passed, passed
-                    except (ValueError, StopIteration):
-                        continue
-            return 1, 1  # Default
-        else:
-            return 0, 1
+                for test in tests:
+                    classname, name = self._split_nodeid(test['nodeid'])
+                    testcase = ET.SubElement(suite, 'testcase', classname=classname, name=name,
+                                             time=f"{test['duration']:.3f}")
+                    if test['outcome'] in ('failed', 'error', 'skipped'):
+                        tag = {'failed': 'failure', 'error': 'error', 'skipped': 'skipped'}[test['outcome']]
+                        element = ET.SubElement(testcase, tag, message=test['message'] or '')
+                        element.text = test['message']
+        
+        suites.set('time', f"{total_time:.3f}")
+        for key, value in counts.items():
+            suites.set(key, str(value))
+        
+        ET.indent(suites)
+        return ET.tostring(suites, encoding='unicode', xml_declaration=True)
+    
+    def _split_nodeid(self, nodeid):
+        """Split a pytest node id into JUnit classname and test name."""
+        parts = nodeid.split("::")
+        path = parts[0][:-3] if parts[0].endswith(".py") else parts[0]
+        classname = ".".join([path.replace("/", ".")] + parts[1:-1])
+        return classname, parts[-1]
     
     def _estimate_score(self, level_results):
         """Estimate score based on test results."""
@@ -272,9 +677,10 @@ class AssessmentRunner:
 def main():
     parser = argparse.ArgumentParser(description="CodeSignal Assessment Runner")
     parser.add_argument(
-        "assessment",
-        nargs="?",
-        help="Assessment name (e.g., inventory_system)"
+        "assessments",
+        nargs="*",
+        metavar="assessment",
+        help="Assessment name(s) (e.g., inventory_system)"
     )
     parser.add_argument(
         "--mode", 
@@ -284,7 +690,7 @@ def main():
     )
     parser.add_argument(
         "--level",
-        choices=["level1", "level2", "level3", "level4"],
+        choices=LEVELS,
         help="Run specific level only"
     )
     parser.add_argument(
@@ -302,23 +708,89 @@ def main():
         action="store_true",
         help="Run in timed mode (90 minutes)"
     )
+    parser.add_argument(
+        "--watch", "-w",
+        action="store_true",
+        help="Re-run the affected level whenever a solution or test file is saved"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached results and re-run every level"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report the slowest tests and the harness overhead per level"
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of slowest tests to report (default: 10)"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        metavar="DIR",
+        help="Also dump cProfile stats for the slowest tests into DIR (implies --profile)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "junit"],
+        default="text",
+        help="Output format for results"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run levels and assessments on N worker processes"
+    )
     
     args = parser.parse_args()
     
-    runner = AssessmentRunner()
+    # Timed and watch runs only print the text report, and the profile report is text too
+    if args.format != "text" and (args.timed or args.watch):
+        parser.error(f"--format {args.format} cannot be combined with --timed or --watch")
+    if args.profile and args.format != "text":
+        parser.error(f"--profile prints a text report; use --profile-dir with --format {args.format}")
+    if (args.profile or args.profile_dir) and (args.timed or args.watch):
+        parser.error("--profile and --profile-dir cannot be combined with --timed or --watch")
+    
+    runner = AssessmentRunner(
+        use_cache=not args.no_cache,
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+        profile_top=args.profile_top
+    )
     
     if args.list:
         runner.list_assessments()
         return
     
-    if not args.assessment:
+    if not args.assessments:
         print("❌ Please specify an assessment name or use --list to see available assessments")
         return
     
-    if args.timed:
-        success = runner.start_timed_assessment(args.assessment, args.mode)
+    if args.watch:
+        if len(args.assessments) > 1:
+            print("❌ Watch mode follows one assessment at a time")
+            return
+        success = runner.watch_assessment(args.assessments[0], args.mode, args.verbose)
+    elif args.timed:
+        if len(args.assessments) > 1:
+            print("❌ Timed mode runs one assessment at a time")
+            return
+        success = runner.start_timed_assessment(args.assessments[0], args.mode)
     else:
-        success = runner.run_assessment(args.assessment, args.mode, args.level, args.verbose)
+        success = runner.run_assessments(args.assessments, args.mode, args.level, args.verbose, args.jobs,
+                                         args.format)
+        
+        if runner.profile and args.format == "text":
+            for assessment_name in args.assessments:
+                runner.print_profile_report(assessment_name, args.profile_top)
     
     sys.exit(0 if success else 1)
 
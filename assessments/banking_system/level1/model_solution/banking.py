@@ -4,7 +4,164 @@ Core account operations and transaction logging.
 """
 
 import time
-from collections import defaultdict
+from array import array
+from collections.abc import Mapping, Sequence
+
+
+# Descriptions in these formats are rebuilt from the amount instead of stored
+DEFAULT_DESCRIPTIONS = {
+    'deposit': 'Deposit of ${:.2f}',
+    'withdrawal': 'Withdrawal of ${:.2f}',
+}
+
+
+class StringTable:
+    """Interns strings as small integer codes."""
+    
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+    
+    def code(self, value):
+        """Get the code for a string, interning it on first use."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+class TransactionRow(Mapping):
+    """Read-through dict view of one ledger row."""
+    
+    __slots__ = ('columns', 'row')
+    
+    def __init__(self, columns, row):
+        self.columns = columns
+        self.row = row
+    
+    def __getitem__(self, key):
+        return self.columns.read(self.row, key)
+    
+    def __iter__(self):
+        return iter(('type', 'amount', 'timestamp', 'description'))
+    
+    def __len__(self):
+        return 4
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AccountColumns(Sequence):
+    """
+    One account's transactions, one typed array per field.
+    
+    Behaves as a live, read-only sequence of TransactionRow views, oldest first.
+    """
+    
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.timestamps = array('d')
+        self.amounts = array('d')
+        self.type_codes = array('B')
+        self.description_codes = array('I')  # 0 -> default description for the type
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TransactionRow(self, row) for row in range(len(self.timestamps))[index]]
+        if index < 0:
+            index += len(self.timestamps)
+        if not 0 <= index < len(self.timestamps):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+    
+    def __iter__(self):
+        for row in range(len(self.timestamps)):
+            yield TransactionRow(self, row)
+    
+    def __len__(self):
+        return len(self.timestamps)
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def append(self, transaction_type, amount, description, timestamp):
+        ledger = self.ledger
+        self.timestamps.append(timestamp)
+        self.amounts.append(amount)
+        self.type_codes.append(ledger.types.code(transaction_type))
+        self.description_codes.append(ledger.descriptions.code(description))
+        return TransactionRow(self, len(self.timestamps) - 1)
+    
+    def read(self, row, key):
+        """Read one field of a row."""
+        ledger = self.ledger
+        if key == 'type':
+            return ledger.types.values[self.type_codes[row]]
+        if key == 'amount':
+            return self.amounts[row]
+        if key == 'timestamp':
+            return self.timestamps[row]
+        if key == 'description':
+            return self.description(row)
+        raise KeyError(key)
+    
+    def description(self, row):
+        """The stored description of a row, or its default one rebuilt from the amount."""
+        ledger = self.ledger
+        description = ledger.descriptions.values[self.description_codes[row]]
+        if description is not None:
+            return description
+        
+        return DEFAULT_DESCRIPTIONS[ledger.types.values[self.type_codes[row]]].format(self.amounts[row])
+
+
+class TransactionLedger:
+    """
+    Append-only, column-oriented transaction store.
+    
+    Each account's transactions live in typed arrays (AccountColumns) rather
+    than one dict per transaction; types and descriptions are
+    interned as integer codes in tables shared by all accounts, and
+    descriptions in a default format are not stored at all.
+    """
+    
+    def __init__(self):
+        self.types = StringTable()
+        self.descriptions = StringTable()
+        self.descriptions.code(None)
+        self.accounts = {}  # account_number -> AccountColumns
+    
+    def append(self, account_number, transaction_type, amount, description=None, timestamp=None):
+        """Record a transaction and return a view of its row."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            columns = self.accounts[account_number] = AccountColumns(self)
+        if timestamp is None:
+            timestamp = time.time()
+        return columns.append(transaction_type, amount, description, timestamp)
+    
+    def history(self, account_number):
+        """All of an account's transactions, oldest first."""
+        columns = self.accounts.get(account_number)
+        return columns if columns is not None else AccountColumns(self)
+
+
+class Account:
+    """One account's fields as slots; to_dict() gives the dict shape the API returns."""
+    
+    __slots__ = ('account_number', 'customer_name', 'balance', 'created_at')
+    
+    def __init__(self, account_number, customer_name, balance, created_at):
+        self.account_number = account_number
+        self.customer_name = customer_name
+        self.balance = balance
+        self.created_at = created_at
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class BankingSystem:
@@ -12,8 +169,8 @@ class BankingSystem:
     
     def __init__(self):
         """Initialize the banking system."""
-        self.accounts = {}  # account_number -> account_data
-        self.transactions = defaultdict(list)  # account_number -> transaction_list
+        self.accounts = {}  # account_number -> Account
+        self.transactions = TransactionLedger()
         self.next_account_number = 1000001
     
     def create_account(self, customer_name, initial_deposit=0.0):
@@ -21,69 +178,52 @@ class BankingSystem:
         account_number = str(self.next_account_number)
         self.next_account_number += 1
         
-        self.accounts[account_number] = {
-            'account_number': account_number,
-            'customer_name': customer_name,
-            'balance': initial_deposit,
-            'created_at': time.time()
-        }
+        self.accounts[account_number] = Account(account_number, customer_name, initial_deposit, time.time())
         
         if initial_deposit > 0:
-            self.transactions[account_number].append({
-                'type': 'deposit',
-                'amount': initial_deposit,
-                'timestamp': time.time(),
-                'description': 'Initial deposit'
-            })
+            self.transactions.append(account_number, 'deposit', initial_deposit, 'Initial deposit')
         
         return account_number
     
     def get_account(self, account_number):
         """Get account information."""
-        return self.accounts.get(account_number)
+        account = self.accounts.get(account_number)
+        return account.to_dict() if account else None
     
     def deposit(self, account_number, amount):
         """Deposit money to account."""
-        if account_number not in self.accounts or amount <= 0:
+        account = self.accounts.get(account_number)
+        if account is None or amount <= 0:
             return False
         
-        self.accounts[account_number]['balance'] += amount
-        self.transactions[account_number].append({
-            'type': 'deposit',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Deposit of ${amount:.2f}'
-        })
+        account.balance += amount
+        self.transactions.append(account_number, 'deposit', amount)
         
         return True
     
     def withdraw(self, account_number, amount):
         """Withdraw money from account."""
-        if account_number not in self.accounts or amount <= 0:
+        account = self.accounts.get(account_number)
+        if account is None or amount <= 0:
             return False
         
-        if self.accounts[account_number]['balance'] < amount:
+        if account.balance < amount:
             return False  # Insufficient funds
         
-        self.accounts[account_number]['balance'] -= amount
-        self.transactions[account_number].append({
-            'type': 'withdrawal',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Withdrawal of ${amount:.2f}'
-        })
+        account.balance -= amount
+        self.transactions.append(account_number, 'withdrawal', amount)
         
         return True
     
     def get_balance(self, account_number):
         """Get current account balance."""
         account = self.accounts.get(account_number)
-        return account['balance'] if account else None
+        return account.balance if account else None
     
     def get_transaction_history(self, account_number):
-        """Get transaction history for account."""
-        return self.transactions.get(account_number, [])
+        """Get transaction history for account, as a list of plain dicts."""
+        return [dict(transaction) for transaction in self.transactions.history(account_number)]
     
     def list_all_accounts(self):
         """Get all accounts."""
-        return list(self.accounts.values())
+        return [account.to_dict() for account in self.accounts.values()]
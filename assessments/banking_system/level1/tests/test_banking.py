@@ -2,6 +2,7 @@
 Unit Tests for Level 1: Basic Account Management
 """
 
+import json
 import pytest
 import sys
 import os
@@ -159,6 +160,32 @@ class TestBankingSystemLevel1:
         names = [acc['customer_name'] for acc in accounts]
         assert "Alice" in names
         assert "Bob" in names
+    
+    def test_account_records_serialize_to_dicts(self):
+        """Test that accounts come back as plain dicts with the documented keys."""
+        account_number = self.bank.create_account("Alice", 500.0)
+        self.bank.deposit(account_number, 25.0)
+        
+        account = self.bank.get_account(account_number)
+        assert isinstance(account, dict)
+        assert set(account) == {'account_number', 'customer_name', 'balance', 'created_at'}
+        assert account['account_number'] == account_number
+        assert account['balance'] == 525.0
+        assert self.bank.list_all_accounts() == [account]
+    
+    def test_transaction_history_is_plain_data(self):
+        """Test that history compares and serialises like a list of dicts."""
+        account_number = self.bank.create_account("Alice")
+        assert self.bank.get_transaction_history(account_number) == []
+        
+        self.bank.deposit(account_number, 25.0)
+        history = self.bank.get_transaction_history(account_number)
+        assert type(history) is list and all(type(t) is dict for t in history)
+        assert json.loads(json.dumps(history)) == history
+        
+        # The caller owns the copy: editing it does not reach the ledger
+        history[0]['amount'] = 1000.0
+        assert self.bank.get_transaction_history(account_number)[0]['amount'] == 25.0
 
 
 def run_tests():
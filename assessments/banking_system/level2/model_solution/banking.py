@@ -4,7 +4,338 @@ Enhanced banking with account types and transaction analysis.
 """
 
 import time
-from collections import defaultdict
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping, Sequence
+
+
+# Descriptions in these formats are rebuilt from the amount instead of stored
+DEFAULT_DESCRIPTIONS = {
+    'deposit': 'Deposit of ${:.2f}',
+    'withdrawal': 'Withdrawal of ${:.2f}',
+}
+
+
+class StringTable:
+    """Interns strings as small integer codes."""
+    
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+    
+    def code(self, value):
+        """Get the code for a string, interning it on first use."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+class TextIndex:
+    """
+    Trigram index over the distinct stored descriptions.
+    
+    Each distinct lowercased description is interned once and filed under
+    every three-character substring it contains. A substring query then
+    only verifies the texts listed under its rarest trigram instead of
+    scanning every row. Default descriptions are not indexed: they embed
+    the amount, so indexing them would add a text for nearly every row.
+    """
+    
+    def __init__(self):
+        self.texts = [None]  # code 0: the row shows its type's default description
+        self.codes = {}
+        self.trigrams = {}  # trigram -> array of text codes
+    
+    def code(self, text):
+        """Get the code for a lowercased text, indexing it on first use."""
+        code = self.codes.get(text)
+        if code is None:
+            code = len(self.texts)
+            self.texts.append(text)
+            self.codes[text] = code
+            for trigram in {text[i:i + 3] for i in range(len(text) - 2)}:
+                postings = self.trigrams.get(trigram)
+                if postings is None:
+                    postings = self.trigrams[trigram] = array('I')
+                postings.append(code)
+        return code
+    
+    def candidates(self, query):
+        """Codes of the texts that can contain query, or None if it is too short to narrow down."""
+        if len(query) < 3:
+            return None
+        shortest = None
+        for i in range(len(query) - 2):
+            postings = self.trigrams.get(query[i:i + 3])
+            if postings is None:
+                return ()
+            if shortest is None or len(postings) < len(shortest):
+                shortest = postings
+        return shortest
+
+
+class TransactionRow(Mapping):
+    """Read-through dict view of one ledger row."""
+    
+    __slots__ = ('columns', 'row')
+    
+    def __init__(self, columns, row):
+        self.columns = columns
+        self.row = row
+    
+    def __getitem__(self, key):
+        return self.columns.read(self.row, key)
+    
+    def __iter__(self):
+        return iter(('type', 'amount', 'timestamp', 'description'))
+    
+    def __len__(self):
+        return 4
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AccountColumns(Sequence):
+    """
+    One account's transactions, one typed array per field.
+    
+    Behaves as a live, read-only sequence of TransactionRow views, oldest first.
+    """
+    
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.timestamps = array('d')
+        self.amounts = array('d')
+        self.type_codes = array('B')
+        self.description_codes = array('I')  # 0 -> default description for the type
+        self.type_totals = {}  # type code -> running sum of amounts
+        
+        # Search index: each row's text code (0 for a default description), the
+        # rows showing each stored text, and the default-description rows by type
+        self.text_codes = array('I')
+        self.text_rows = {}  # text code -> array of row numbers, ascending
+        self.default_rows = {}  # type code -> array of row numbers, ascending
+        
+        # Rows are normally appended in time order, so the timestamp column is
+        # itself sorted and range queries bisect it directly. The first
+        # back-dated insert switches to an explicit index of row numbers
+        # ordered by timestamp, which later inserts keep sorted.
+        self.time_order = None
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TransactionRow(self, row) for row in range(len(self.timestamps))[index]]
+        if index < 0:
+            index += len(self.timestamps)
+        if not 0 <= index < len(self.timestamps):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+    
+    def __iter__(self):
+        for row in range(len(self.timestamps)):
+            yield TransactionRow(self, row)
+    
+    def __len__(self):
+        return len(self.timestamps)
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def append(self, transaction_type, amount, description, timestamp):
+        ledger = self.ledger
+        row = len(self.timestamps)
+        backdated = row > 0 and timestamp < self.timestamps[-1]
+        type_code = ledger.types.code(transaction_type)
+        self.timestamps.append(timestamp)
+        self.amounts.append(amount)
+        self.type_codes.append(type_code)
+        self.description_codes.append(ledger.descriptions.code(description))
+        self._index_time(row, backdated)
+        self.type_totals[type_code] = self.type_totals.get(type_code, 0.0) + self.amounts[row]
+        self._index_text(row)
+        return TransactionRow(self, row)
+    
+    def _text_code(self, row):
+        """The text index code of a row's stored description, or 0 if it shows the default one."""
+        ledger = self.ledger
+        description = ledger.descriptions.values[self.description_codes[row]]
+        return ledger.text_index.code(description.lower()) if description is not None else 0
+    
+    def _text_bucket(self, row, code):
+        """The row list a row with this text code is filed in."""
+        if code:
+            return self.text_rows.setdefault(code, array('I'))
+        return self.default_rows.setdefault(self.type_codes[row], array('I'))
+    
+    def _index_text(self, row):
+        """File a newly appended row under the text it is searched by."""
+        code = self._text_code(row)
+        self.text_codes.append(code)
+        self._text_bucket(row, code).append(row)
+    
+    def _index_time(self, row, backdated):
+        """Keep the time index in step with a newly appended row."""
+        if self.time_order is not None:
+            insort(self.time_order, row, key=self.timestamps.__getitem__)
+        elif backdated:
+            self.time_order = array('I', sorted(range(row + 1), key=self.timestamps.__getitem__))
+    
+    def rows_in_timerange(self, start_time, end_time):
+        """Row numbers with start_time <= timestamp <= end_time, oldest first, in O(log n)."""
+        if self.time_order is None:
+            return range(bisect_left(self.timestamps, start_time), bisect_right(self.timestamps, end_time))
+        
+        key = self.timestamps.__getitem__
+        lo = bisect_left(self.time_order, start_time, key=key)
+        hi = bisect_right(self.time_order, end_time, key=key)
+        return self.time_order[lo:hi]
+    
+    def read(self, row, key):
+        """Read one field of a row."""
+        ledger = self.ledger
+        if key == 'type':
+            return ledger.types.values[self.type_codes[row]]
+        if key == 'amount':
+            return self.amounts[row]
+        if key == 'timestamp':
+            return self.timestamps[row]
+        if key == 'description':
+            return self.description(row)
+        raise KeyError(key)
+    
+    def description(self, row):
+        """The stored description of a row, or its default one rebuilt from the amount."""
+        ledger = self.ledger
+        description = ledger.descriptions.values[self.description_codes[row]]
+        if description is not None:
+            return description
+        
+        return DEFAULT_DESCRIPTIONS[ledger.types.values[self.type_codes[row]]].format(self.amounts[row])
+
+
+class TransactionLedger:
+    """
+    Append-only, column-oriented transaction store.
+    
+    Each account's transactions live in typed arrays (AccountColumns) rather
+    than one dict per transaction; types and descriptions are
+    interned as integer codes in tables shared by all accounts, and
+    descriptions in a default format are not stored at all.
+    """
+    
+    def __init__(self):
+        self.types = StringTable()
+        self.descriptions = StringTable()
+        self.descriptions.code(None)
+        self.text_index = TextIndex()
+        self.accounts = {}  # account_number -> AccountColumns
+    
+    def append(self, account_number, transaction_type, amount, description=None, timestamp=None):
+        """Record a transaction and return a view of its row."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            columns = self.accounts[account_number] = AccountColumns(self)
+        if timestamp is None:
+            timestamp = time.time()
+        return columns.append(transaction_type, amount, description, timestamp)
+    
+    def history(self, account_number):
+        """All of an account's transactions, oldest first."""
+        columns = self.accounts.get(account_number)
+        return columns if columns is not None else AccountColumns(self)
+    
+    def count(self, account_number):
+        """Number of transactions recorded for an account."""
+        columns = self.accounts.get(account_number)
+        return len(columns) if columns is not None else 0
+    
+    def total(self, account_number, transaction_type):
+        """Sum of an account's amounts for one transaction type, from the running totals."""
+        columns = self.accounts.get(account_number)
+        code = self.types.codes.get(transaction_type)
+        if columns is None or code is None:
+            return 0.0
+        return columns.type_totals.get(code, 0.0)
+    
+    def rows_in_timerange(self, account_number, start_time, end_time):
+        """Row numbers of an account's transactions with start_time <= timestamp <= end_time."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            return []
+        return columns.rows_in_timerange(start_time, end_time)
+    
+    def in_timerange(self, account_number, start_time, end_time):
+        """An account's transactions with start_time <= timestamp <= end_time, oldest first."""
+        columns = self.history(account_number)
+        return [TransactionRow(columns, row) for row in self.rows_in_timerange(account_number, start_time, end_time)]
+    
+    def search(self, account_number, query):
+        """
+        An account's transactions whose description contains query (case-insensitive).
+        
+        Only stored texts that can match are checked: those under the query's
+        rarest trigram, or the account's own distinct texts if that list is
+        shorter. Rows with a default description are matched by type (see
+        _default_matches).
+        """
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            return []
+        
+        query_lower = query.lower()
+        text_rows = columns.text_rows
+        candidates = self.text_index.candidates(query_lower)
+        if candidates is None or len(candidates) > len(text_rows):
+            candidates = list(text_rows)
+        
+        texts = self.text_index.texts
+        rows = []
+        for code in candidates:
+            if code in text_rows and query_lower in texts[code]:
+                rows.extend(text_rows[code])
+        for type_code, type_rows in columns.default_rows.items():
+            rows.extend(self._default_matches(columns, type_code, type_rows, query_lower))
+        rows.sort()
+        return [TransactionRow(columns, row) for row in rows]
+    
+    def _default_matches(self, columns, type_code, type_rows, query_lower):
+        """
+        Rows of one type, all showing its default description, that contain query_lower.
+        
+        A query inside the template's fixed text matches every row, and one
+        using a character the formatted text can never contain matches none;
+        only queries that reach into the amount format each row.
+        """
+        template = DEFAULT_DESCRIPTIONS.get(self.types.values[type_code])
+        if template is None:
+            return ()
+        template = template.lower()
+        if any(query_lower in part for part in template.split('{:.2f}')):
+            return type_rows
+        if not set(query_lower) <= set(template) | set('0123456789.-'):
+            return ()
+        amounts = columns.amounts
+        return [row for row in type_rows if query_lower in template.format(amounts[row])]
+
+
+class Account:
+    """One account's fields as slots; to_dict() gives the dict shape the API returns."""
+    
+    __slots__ = ('account_number', 'customer_name', 'account_type', 'balance', 'created_at')
+    
+    def __init__(self, account_number, customer_name, account_type, balance, created_at):
+        self.account_number = account_number
+        self.customer_name = customer_name
+        self.account_type = account_type
+        self.balance = balance
+        self.created_at = created_at
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class BankingSystem:
@@ -12,8 +343,8 @@ class BankingSystem:
     
     def __init__(self):
         """Initialize the banking system."""
-        self.accounts = {}  # account_number -> account_data
-        self.transactions = defaultdict(list)  # account_number -> transaction_list
+        self.accounts = {}  # account_number -> Account
+        self.transactions = TransactionLedger()
         self.next_account_number = 1000001
     
     # =================== LEVEL 1 METHODS ===================
@@ -23,110 +354,83 @@ class BankingSystem:
         account_number = str(self.next_account_number)
         self.next_account_number += 1
         
-        self.accounts[account_number] = {
-            'account_number': account_number,
-            'customer_name': customer_name,
-            'account_type': account_type,
-            'balance': initial_deposit,
-            'created_at': time.time()
-        }
+        self.accounts[account_number] = Account(account_number, customer_name, account_type, initial_deposit, time.time())
         
         if initial_deposit > 0:
-            self.transactions[account_number].append({
-                'type': 'deposit',
-                'amount': initial_deposit,
-                'timestamp': time.time(),
-                'description': 'Initial deposit'
-            })
+            self.transactions.append(account_number, 'deposit', initial_deposit, 'Initial deposit')
         
         return account_number
     
     def get_account(self, account_number):
         """Get account information."""
-        return self.accounts.get(account_number)
+        account = self.accounts.get(account_number)
+        return account.to_dict() if account else None
     
-    def deposit(self, account_number, amount):
-        """Deposit money to account."""
-        if account_number not in self.accounts or amount <= 0:
+    def deposit(self, account_number, amount, timestamp=None):
+        """Deposit money to account, optionally back-dated to timestamp."""
+        account = self.accounts.get(account_number)
+        if account is None or amount <= 0:
             return False
         
-        self.accounts[account_number]['balance'] += amount
-        self.transactions[account_number].append({
-            'type': 'deposit',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Deposit of ${amount:.2f}'
-        })
+        account.balance += amount
+        self.transactions.append(account_number, 'deposit', amount, timestamp=timestamp)
         
         return True
     
-    def withdraw(self, account_number, amount):
-        """Withdraw money from account."""
-        if account_number not in self.accounts or amount <= 0:
+    def withdraw(self, account_number, amount, timestamp=None):
+        """Withdraw money from account, optionally back-dated to timestamp."""
+        account = self.accounts.get(account_number)
+        if account is None or amount <= 0:
             return False
         
-        if self.accounts[account_number]['balance'] < amount:
+        if account.balance < amount:
             return False  # Insufficient funds
         
-        self.accounts[account_number]['balance'] -= amount
-        self.transactions[account_number].append({
-            'type': 'withdrawal',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Withdrawal of ${amount:.2f}'
-        })
+        account.balance -= amount
+        self.transactions.append(account_number, 'withdrawal', amount, timestamp=timestamp)
         
         return True
     
     def get_balance(self, account_number):
         """Get current account balance."""
         account = self.accounts.get(account_number)
-        return account['balance'] if account else None
+        return account.balance if account else None
     
     def get_transaction_history(self, account_number):
-        """Get transaction history for account."""
-        return self.transactions.get(account_number, [])
+        """Get transaction history for account, as a list of plain dicts."""
+        return [dict(transaction) for transaction in self.transactions.history(account_number)]
     
     def list_all_accounts(self):
         """Get all accounts."""
-        return list(self.accounts.values())
+        return [account.to_dict() for account in self.accounts.values()]
     
     # =================== LEVEL 2 NEW METHODS ===================
     
     def get_transactions_in_timerange(self, account_number, start_time, end_time):
         """Get transactions within a time range."""
-        transactions = self.transactions.get(account_number, [])
-        return [t for t in transactions if start_time <= t['timestamp'] <= end_time]
+        transactions = self.transactions.in_timerange(account_number, start_time, end_time)
+        return [dict(transaction) for transaction in transactions]
     
     def transfer(self, from_account, to_account, amount):
         """Transfer money between accounts."""
-        if from_account not in self.accounts or to_account not in self.accounts:
+        sender = self.accounts.get(from_account)
+        recipient = self.accounts.get(to_account)
+        if sender is None or recipient is None:
             return False
         
         if amount <= 0:
             return False
         
-        if self.accounts[from_account]['balance'] < amount:
+        if sender.balance < amount:
             return False  # Insufficient funds
         
         # Perform transfer
-        self.accounts[from_account]['balance'] -= amount
-        self.accounts[to_account]['balance'] += amount
+        sender.balance -= amount
+        recipient.balance += amount
         
         # Record transactions
-        self.transactions[from_account].append({
-            'type': 'transfer_out',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Transfer to {to_account}'
-        })
-        
-        self.transactions[to_account].append({
-            'type': 'transfer_in',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Transfer from {from_account}'
-        })
+        self.transactions.append(from_account, 'transfer_out', amount, f'Transfer to {to_account}')
+        self.transactions.append(to_account, 'transfer_in', amount, f'Transfer from {from_account}')
         
         return True
     
@@ -136,7 +440,7 @@ class BankingSystem:
             return []
         
         history = []
-        for transaction in self.transactions[account_number]:
+        for transaction in self.transactions.history(account_number):
             history.append({
                 'type': transaction['type'],
                 'amount': transaction['amount'],
@@ -148,22 +452,20 @@ class BankingSystem:
     
     def search_transactions(self, account_number, query):
         """Search transactions by description."""
-        transactions = self.transactions.get(account_number, [])
-        query_lower = query.lower()
-        return [t for t in transactions if query_lower in t['description'].lower()]
+        return [dict(transaction) for transaction in self.transactions.search(account_number, query)]
     
     def calculate_interest(self, account_number, annual_rate=0.02):
         """Calculate monthly interest for savings accounts."""
         account = self.accounts.get(account_number)
-        if not account or account['account_type'] != 'savings':
+        if not account or account.account_type != 'savings':
             return 0.0
         
-        return account['balance'] * (annual_rate / 12)  # Monthly interest
+        return account.balance * (annual_rate / 12)  # Monthly interest
     
     def get_accounts_by_type(self, account_type):
         """Get all accounts of a specific type."""
-        return [account for account in self.accounts.values() 
-                if account['account_type'] == account_type]
+        return [account.to_dict() for account in self.accounts.values()
+                if account.account_type == account_type]
     
     def get_account_summary(self, account_number):
         """Get comprehensive account summary."""
@@ -171,25 +473,21 @@ class BankingSystem:
             return None
         
         account = self.accounts[account_number]
-        transactions = self.transactions[account_number]
-        
-        # Calculate transaction statistics
-        deposits = [t for t in transactions if t['type'] == 'deposit']
-        withdrawals = [t for t in transactions if t['type'] == 'withdrawal']
         
-        total_deposits = sum(t['amount'] for t in deposits)
-        total_withdrawals = sum(t['amount'] for t in withdrawals)
+        # Transaction statistics come from running totals, not a scan of the history
+        total_deposits = self.transactions.total(account_number, 'deposit')
+        total_withdrawals = self.transactions.total(account_number, 'withdrawal')
         
         return {
             'account_number': account_number,
-            'customer_name': account['customer_name'],
-            'account_type': account['account_type'],
-            'current_balance': account['balance'],
+            'customer_name': account.customer_name,
+            'account_type': account.account_type,
+            'current_balance': account.balance,
             'total_deposits': total_deposits,
             'total_withdrawals': total_withdrawals,
-            'transaction_count': len(transactions),
+            'transaction_count': self.transactions.count(account_number),
             'monthly_interest': self.calculate_interest(account_number),
-            'account_age_days': (time.time() - account['created_at']) / 86400
+            'account_age_days': (time.time() - account.created_at) / 86400
         }
 
 
@@ -1,3 +1,4 @@
+import json
 import pytest
 import sys
 import os
@@ -56,3 +57,84 @@ class TestBankingLevel2:
         # Test total system balance
         total = sum([bank.get_balance(acc1), bank.get_balance(acc2), bank.get_balance(acc3)])
         assert total == 600
+    
+    def test_transactions_in_timerange_with_backdated_deposits(self):
+        bank = BankingSystem()
+        acc = bank.create_account("user1", initial_deposit=0)
+        bank.deposit(acc, 10, timestamp=1000)
+        bank.deposit(acc, 30, timestamp=3000)
+        bank.deposit(acc, 20, timestamp=2000)  # Back-dated
+        
+        in_range = bank.get_transactions_in_timerange(acc, 1500, 3000)
+        assert [t['amount'] for t in in_range] == [20, 30]
+        assert bank.get_transactions_in_timerange(acc, 3001, 4000) == []
+        
+        # History keeps insertion order
+        assert [t['amount'] for t in bank.get_transaction_history(acc)] == [10, 30, 20]
+    
+    def test_summary_totals_track_every_change(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("user1", initial_deposit=500)
+        acc2 = bank.create_account("user2", initial_deposit=0)
+        bank.deposit(acc1, 100)
+        bank.withdraw(acc1, 50)
+        bank.transfer(acc1, acc2, 25)
+        
+        summary = bank.get_account_summary(acc1)
+        assert summary['total_deposits'] == 600
+        assert summary['total_withdrawals'] == 50
+        assert summary['transaction_count'] == 4
+        
+        # Back-dated rows count towards the running totals too
+        bank.deposit(acc1, 20, timestamp=1000)
+        bank.withdraw(acc1, 5, timestamp=1000)
+        summary = bank.get_account_summary(acc1)
+        assert summary['total_deposits'] == 620
+        assert summary['total_withdrawals'] == 55
+        assert summary['transaction_count'] == 6
+    
+    def test_search_transactions_substrings_and_amounts(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("user1", initial_deposit=1000)
+        acc2 = bank.create_account("user2", initial_deposit=0)
+        bank.deposit(acc1, 250)
+        bank.transfer(acc1, acc2, 75)
+        
+        assert [t['amount'] for t in bank.search_transactions(acc1, "DEPOSIT")] == [1000, 250]
+        assert [t['amount'] for t in bank.search_transactions(acc1, "t")] == [1000, 250, 75]
+        assert len(bank.search_transactions(acc2, f"from {acc1}")) == 1
+        assert bank.search_transactions(acc1, "refund") == []
+        
+        # Default descriptions show the amount, back-dated rows included
+        bank.deposit(acc1, 300, timestamp=1000)
+        assert [t['amount'] for t in bank.search_transactions(acc1, "$250")] == [250]
+        assert [t['amount'] for t in bank.search_transactions(acc1, "$300")] == [300]
+        assert [t['amount'] for t in bank.search_transactions(acc1, "deposit of")] == [250, 300]
+    
+    def test_query_results_are_plain_data(self):
+        bank = BankingSystem()
+        acc = bank.create_account("user1")
+        assert bank.get_transaction_history(acc) == []
+        
+        bank.deposit(acc, 25)
+        for result in (bank.get_transaction_history(acc), bank.search_transactions(acc, "deposit"),
+                       bank.get_transactions_in_timerange(acc, 0, float('inf'))):
+            assert type(result) is list and all(type(t) is dict for t in result)
+            assert json.loads(json.dumps(result)) == result
+        
+        # The caller owns the copies: editing one does not reach the ledger
+        bank.search_transactions(acc, "deposit")[0]['amount'] = 1000
+        bank.get_transactions_in_timerange(acc, 0, float('inf'))[0]['amount'] = 1000
+        history = bank.get_transaction_history(acc)
+        history[0]['amount'] = 1000
+        assert bank.get_transaction_history(acc)[0]['amount'] == 25
+    
+    def test_search_across_many_distinct_amounts(self):
+        bank = BankingSystem()
+        acc = bank.create_account("user1")
+        for i in range(500):
+            bank.deposit(acc, 1 + i / 100)
+        
+        assert len(bank.search_transactions(acc, "deposit of")) == 500
+        assert [t['amount'] for t in bank.search_transactions(acc, "$1.25")] == [1.25]
+        assert bank.search_transactions(acc, "$1.2x") == []
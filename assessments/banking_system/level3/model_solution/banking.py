@@ -3,277 +3,1364 @@ LEVEL 3: Advanced Banking Logic - MODEL SOLUTION
 Complex financial operations and validation.
 """
 
+import asyncio
+import heapq
+import json
+import multiprocessing
+import os
+import pickle
+import threading
 import time
-from collections import defaultdict
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager, nullcontext
 
 
-class BankingSystem:
-    """Advanced banking system with financial logic."""
+# Descriptions in these formats are rebuilt from the amount instead of stored
+DEFAULT_DESCRIPTIONS = {
+    'deposit': 'Deposit of ${:.2f}',
+    'withdrawal': 'Withdrawal of ${:.2f}',
+}
+
+
+class StringTable:
+    """Interns strings as small integer codes."""
     
     def __init__(self):
-        """Initialize the banking system."""
-        self.accounts = {}
-        self.transactions = defaultdict(list)
-        self.next_account_number = 1000001
-        self.frozen_accounts = set()
-        self.overdraft_fees = {}  # account_number -> fee_amount
+        self.values = []
+        self.codes = {}
+        self.lock = threading.Lock()  # Tables are shared by every account
     
-    # =================== LEVEL 1-2 METHODS ===================
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
     
-    def create_account(self, customer_name, account_type="checking", initial_deposit=0.0):
-        """Create a new account with type."""
-        account_number = str(self.next_account_number)
-        self.next_account_number += 1
-        
-        self.accounts[account_number] = {
-            'account_number': account_number,
-            'customer_name': customer_name,
-            'account_type': account_type,
-            'balance': initial_deposit,
-            'created_at': time.time(),
-            'overdraft_limit': 500.0 if account_type == "checking" else 0.0
-        }
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+    
+    def code(self, value):
+        """Get the code for a string, interning it on first use."""
+        code = self.codes.get(value)
+        if code is None:
+            with self.lock:
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.codes[value] = code
+        return code
+
+
+class TextIndex:
+    """
+    Trigram index over the distinct stored descriptions.
+    
+    Each distinct lowercased description is interned once and filed under
+    every three-character substring it contains. A substring query then
+    only verifies the texts listed under its rarest trigram instead of
+    scanning every row. Default descriptions are not indexed: they embed
+    the amount, so indexing them would add a text for nearly every row.
+    """
+    
+    def __init__(self):
+        self.texts = [None]  # code 0: the row shows its type's default description
+        self.codes = {}
+        self.trigrams = {}  # trigram -> array of text codes
+        self.lock = threading.Lock()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+    
+    def code(self, text):
+        """Get the code for a lowercased text, indexing it on first use."""
+        code = self.codes.get(text)
+        if code is None:
+            with self.lock:
+                code = self.codes.get(text)
+                if code is None:
+                    code = len(self.texts)
+                    self.texts.append(text)
+                    for trigram in {text[i:i + 3] for i in range(len(text) - 2)}:
+                        postings = self.trigrams.get(trigram)
+                        if postings is None:
+                            postings = self.trigrams[trigram] = array('I')
+                        postings.append(code)
+                    self.codes[text] = code
+        return code
+    
+    def candidates(self, query):
+        """Codes of the texts that can contain query, or None if it is too short to narrow down."""
+        if len(query) < 3:
+            return None
+        shortest = None
+        for i in range(len(query) - 2):
+            postings = self.trigrams.get(query[i:i + 3])
+            if postings is None:
+                return ()
+            if shortest is None or len(postings) < len(shortest):
+                shortest = postings
+        return shortest
+
+
+class TransactionRow(Mapping):
+    """Read-through dict view of one ledger row; assigning a key updates the ledger."""
+    
+    __slots__ = ('columns', 'row')
+    
+    def __init__(self, columns, row):
+        self.columns = columns
+        self.row = row
+    
+    def __getitem__(self, key):
+        return self.columns.read(self.row, key)
+    
+    def __setitem__(self, key, value):
+        self.columns.write(self.row, key, value)
+    
+    def __iter__(self):
+        yield from ('type', 'amount', 'timestamp', 'description', 'category')
+        if self.columns.overdraft_fees[self.row]:
+            yield 'overdraft_fee'
+    
+    def __len__(self):
+        return 6 if self.columns.overdraft_fees[self.row] else 5
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AccountColumns(Sequence):
+    """
+    One account's transactions, one typed array per field.
+    
+    Behaves as a live, read-only sequence of TransactionRow views, oldest first.
+    """
+    
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.timestamps = array('d')
+        self.amounts = array('d')
+        self.overdraft_fees = array('d')
+        self.type_codes = array('B')
+        self.category_codes = array('H')
+        self.description_codes = array('I')  # 0 -> default description for the type
         
-        if initial_deposit > 0:
-            self.transactions[account_number].append({
-                'type': 'deposit',
-                'amount': initial_deposit,
-                'timestamp': time.time(),
-                'description': 'Initial deposit',
-                'category': 'initial'
-            })
+        # Running aggregates, kept up to date as rows are added or rewritten
+        self.type_totals = {}  # type code -> sum of amounts
+        self.category_totals = {}  # category code -> sum of amounts
+        self.category_rows = {}  # category code -> array of row numbers, ascending
         
-        return account_number
+        # Search index: each row's text code (0 for a default description), the
+        # rows showing each stored text, and the default-description rows by type
+        self.text_codes = array('I')
+        self.text_rows = {}  # text code -> array of row numbers, ascending
+        self.default_rows = {}  # type code -> array of row numbers, ascending
+        
+        # Rows are normally appended in time order, so the timestamp column is
+        # itself sorted and range queries bisect it directly. The first
+        # back-dated insert switches to an explicit index of row numbers
+        # ordered by timestamp, which later inserts keep sorted.
+        self.time_order = None
     
-    def get_account(self, account_number):
-        return self.accounts.get(account_number)
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TransactionRow(self, row) for row in range(len(self.timestamps))[index]]
+        if index < 0:
+            index += len(self.timestamps)
+        if not 0 <= index < len(self.timestamps):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
     
-    def deposit(self, account_number, amount, category="general"):
-        if account_number not in self.accounts or amount <= 0:
-            return False
+    def __iter__(self):
+        for row in range(len(self.timestamps)):
+            yield TransactionRow(self, row)
+    
+    def __len__(self):
+        return len(self.timestamps)
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def append(self, transaction_type, amount, category, description, overdraft_fee, timestamp):
+        ledger = self.ledger
+        row = len(self.timestamps)
+        backdated = row > 0 and timestamp < self.timestamps[-1]
+        type_code = ledger.types.code(transaction_type)
+        category_code = ledger.categories.code(category)
+        self.timestamps.append(timestamp)
+        self.amounts.append(amount)
+        self.overdraft_fees.append(overdraft_fee)
+        self.type_codes.append(type_code)
+        self.category_codes.append(category_code)
+        self.description_codes.append(ledger.descriptions.code(description))
+        self._index_time(row, backdated)
+        self._aggregate(row, type_code, category_code, self.amounts[row])
+        self._index_text(row)
+        return TransactionRow(self, row)
+    
+    def extend(self, entries):
+        """Append many (type, amount, category, description, overdraft_fee, timestamp) rows at once."""
+        timestamps = [entry[5] for entry in entries]
+        in_order = all(a <= b for a, b in zip(timestamps, timestamps[1:]))
+        if not entries or self.time_order is not None or not in_order or (
+                self.timestamps and timestamps[0] < self.timestamps[-1]):
+            return [self.append(*entry) for entry in entries]
         
-        if account_number in self.frozen_accounts:
-            return False
+        # In time order: one extend per column, and the time index stays implicit
+        ledger = self.ledger
+        first_row = len(self.timestamps)
+        self.timestamps.extend(timestamps)
+        self.amounts.extend([entry[1] for entry in entries])
+        self.overdraft_fees.extend([entry[4] for entry in entries])
+        type_codes = [ledger.types.code(entry[0]) for entry in entries]
+        category_codes = [ledger.categories.code(entry[2]) for entry in entries]
+        self.type_codes.extend(type_codes)
+        self.category_codes.extend(category_codes)
+        self.description_codes.extend([ledger.descriptions.code(entry[3]) for entry in entries])
         
-        self.accounts[account_number]['balance'] += amount
-        self.transactions[account_number].append({
-            'type': 'deposit',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Deposit of ${amount:.2f}',
-            'category': category
-        })
+        rows = range(first_row, len(self.timestamps))
+        for row, type_code, category_code in zip(rows, type_codes, category_codes):
+            self._aggregate(row, type_code, category_code, self.amounts[row])
+            self._index_text(row)
+        return [TransactionRow(self, row) for row in rows]
+    
+    def _aggregate(self, row, type_code, category_code, amount):
+        """Fold a new row into the running totals and the category index."""
+        self.type_totals[type_code] = self.type_totals.get(type_code, 0.0) + amount
+        self.category_totals[category_code] = self.category_totals.get(category_code, 0.0) + amount
+        category_rows = self.category_rows.get(category_code)
+        if category_rows is None:
+            category_rows = self.category_rows[category_code] = array('I')
+        category_rows.append(row)
+    
+    def _text_code(self, row):
+        """The text index code of a row's stored description, or 0 if it shows the default one."""
+        ledger = self.ledger
+        description = ledger.descriptions.values[self.description_codes[row]]
+        return ledger.text_index.code(description.lower()) if description is not None else 0
+    
+    def _text_bucket(self, row, code):
+        """The row list a row with this text code is filed in."""
+        if code:
+            return self.text_rows.setdefault(code, array('I'))
+        return self.default_rows.setdefault(self.type_codes[row], array('I'))
+    
+    def _index_text(self, row):
+        """File a newly appended row under the text it is searched by."""
+        code = self._text_code(row)
+        self.text_codes.append(code)
+        self._text_bucket(row, code).append(row)
+    
+    def _reindex_text(self, row):
+        """Move a row whose description changed to its new text."""
+        old_code = self.text_codes[row]
+        new_code = self._text_code(row)
+        if new_code == old_code:
+            return
+        self.text_codes[row] = new_code
+        old_rows = self._text_bucket(row, old_code)
+        old_rows.remove(row)
+        if not old_rows:
+            if old_code:
+                del self.text_rows[old_code]
+            else:
+                del self.default_rows[self.type_codes[row]]
+        insort(self._text_bucket(row, new_code), row)
+    
+    def _index_time(self, row, backdated):
+        """Keep the time index in step with a newly appended row."""
+        if self.time_order is not None:
+            insort(self.time_order, row, key=self.timestamps.__getitem__)
+        elif backdated:
+            self.time_order = array('I', sorted(range(row + 1), key=self.timestamps.__getitem__))
+    
+    def rows_in_timerange(self, start_time, end_time):
+        """Row numbers with start_time <= timestamp <= end_time, oldest first, in O(log n)."""
+        if self.time_order is None:
+            return range(bisect_left(self.timestamps, start_time), bisect_right(self.timestamps, end_time))
         
-        return True
+        key = self.timestamps.__getitem__
+        lo = bisect_left(self.time_order, start_time, key=key)
+        hi = bisect_right(self.time_order, end_time, key=key)
+        return self.time_order[lo:hi]
     
-    def withdraw(self, account_number, amount, category="general"):
-        if account_number not in self.accounts or amount <= 0:
-            return False
+    def read(self, row, key):
+        """Read one field of a row."""
+        ledger = self.ledger
+        if key == 'type':
+            return ledger.types.values[self.type_codes[row]]
+        if key == 'amount':
+            return self.amounts[row]
+        if key == 'timestamp':
+            return self.timestamps[row]
+        if key == 'category':
+            return ledger.categories.values[self.category_codes[row]]
+        if key == 'description':
+            return self.description(row)
+        if key == 'overdraft_fee' and self.overdraft_fees[row]:
+            return self.overdraft_fees[row]
+        raise KeyError(key)
+    
+    def write(self, row, key, value):
+        """Overwrite one field of a row."""
+        ledger = self.ledger
+        if key == 'description':
+            self.description_codes[row] = ledger.descriptions.code(value)
+            self._reindex_text(row)
+        elif key == 'category':
+            old_code = self.category_codes[row]
+            new_code = ledger.categories.code(value)
+            if new_code != old_code:
+                amount = self.amounts[row]
+                self.category_codes[row] = new_code
+                self.category_totals[old_code] -= amount
+                self.category_totals[new_code] = self.category_totals.get(new_code, 0.0) + amount
+                self.category_rows[old_code].remove(row)
+                insort(self.category_rows.setdefault(new_code, array('I')), row)
+        elif key == 'amount':
+            delta = value - self.amounts[row]
+            self.amounts[row] = value
+            self.type_totals[self.type_codes[row]] += delta
+            self.category_totals[self.category_codes[row]] += delta
+        else:
+            raise KeyError(key)
+    
+    def description(self, row):
+        """The stored description of a row, or its default one rebuilt from the amount."""
+        ledger = self.ledger
+        description = ledger.descriptions.values[self.description_codes[row]]
+        if description is not None:
+            return description
         
-        if account_number in self.frozen_accounts:
-            return False
+        description = DEFAULT_DESCRIPTIONS[ledger.types.values[self.type_codes[row]]].format(self.amounts[row])
+        fee = self.overdraft_fees[row]
+        if fee:
+            description += f' (Overdraft fee: ${fee:.2f})'
+        return description
+
+
+class TransactionLedger:
+    """
+    Append-only, column-oriented transaction store.
+    
+    Each account's transactions live in typed arrays (AccountColumns) rather
+    than one dict per transaction; types, categories and descriptions are
+    interned as integer codes in tables shared by all accounts, and
+    descriptions in a default format are not stored at all.
+    """
+    
+    def __init__(self):
+        self.types = StringTable()
+        self.categories = StringTable()
+        self.descriptions = StringTable()
+        self.descriptions.code(None)
+        self.text_index = TextIndex()
+        self.accounts = {}  # account_number -> AccountColumns
+    
+    def append(self, account_number, transaction_type, amount, category,
+               description=None, overdraft_fee=0.0, timestamp=None):
+        """Record a transaction and return a view of its row."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            columns = self.accounts[account_number] = AccountColumns(self)
+        if timestamp is None:
+            timestamp = time.time()
+        return columns.append(transaction_type, amount, category, description, overdraft_fee, timestamp)
+    
+    def extend(self, account_number, entries):
+        """Record many transactions for one account in bulk; return views of their rows."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            columns = self.accounts[account_number] = AccountColumns(self)
+        return columns.extend(entries)
+    
+    def history(self, account_number):
+        """All of an account's transactions, oldest first."""
+        columns = self.accounts.get(account_number)
+        return columns if columns is not None else AccountColumns(self)
+    
+    def count(self, account_number):
+        """Number of transactions recorded for an account."""
+        columns = self.accounts.get(account_number)
+        return len(columns) if columns is not None else 0
+    
+    def total(self, account_number, transaction_type):
+        """Sum of an account's amounts for one transaction type, from the running totals."""
+        columns = self.accounts.get(account_number)
+        code = self.types.codes.get(transaction_type)
+        if columns is None or code is None:
+            return 0.0
+        return columns.type_totals.get(code, 0.0)
+    
+    def category_totals(self, account_number):
+        """Sum of an account's amounts per category."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            return {}
+        names = self.categories.values
+        return {names[code]: total for code, total in columns.category_totals.items()}
+    
+    def rows_in_timerange(self, account_number, start_time, end_time):
+        """Row numbers of an account's transactions with start_time <= timestamp <= end_time."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            return []
+        return columns.rows_in_timerange(start_time, end_time)
+    
+    def in_timerange(self, account_number, start_time, end_time):
+        """An account's transactions with start_time <= timestamp <= end_time, oldest first."""
+        columns = self.history(account_number)
+        return [TransactionRow(columns, row) for row in self.rows_in_timerange(account_number, start_time, end_time)]
+    
+    def with_category(self, account_number, category):
+        """An account's transactions in one category, read from the category index."""
+        columns = self.accounts.get(account_number)
+        code = self.categories.codes.get(category)
+        if columns is None or code is None or code not in columns.category_rows:
+            return []
+        return [TransactionRow(columns, row) for row in columns.category_rows[code]]
+    
+    def search(self, account_number, query):
+        """
+        An account's transactions whose description contains query (case-insensitive).
         
-        account = self.accounts[account_number]
-        available_balance = account['balance'] + account['overdraft_limit']
+        Only stored texts that can match are checked: those under the query's
+        rarest trigram, or the account's own distinct texts if that list is
+        shorter. Rows with a default description are matched by type (see
+        _default_matches).
+        """
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            return []
         
-        if available_balance < amount:
-            return False
+        query_lower = query.lower()
+        text_rows = columns.text_rows
+        candidates = self.text_index.candidates(query_lower)
+        if candidates is None or len(candidates) > len(text_rows):
+            candidates = list(text_rows)
         
-        # Check if overdraft will occur
-        overdraft_amount = max(0, amount - account['balance'])
+        texts = self.text_index.texts
+        rows = []
+        for code in candidates:
+            if code in text_rows and query_lower in texts[code]:
+                rows.extend(text_rows[code])
+        for type_code, type_rows in columns.default_rows.items():
+            rows.extend(self._default_matches(columns, type_code, type_rows, query_lower))
+        rows.sort()
+        return [TransactionRow(columns, row) for row in rows]
+    
+    def _default_matches(self, columns, type_code, type_rows, query_lower):
+        """
+        Rows of one type, all showing its default description, that contain query_lower.
         
-        account['balance'] -= amount
+        A query inside the template's fixed text matches every row, and one
+        using a character the formatted text can never contain matches none;
+        only queries that reach into the amount format each row.
+        """
+        template = DEFAULT_DESCRIPTIONS.get(self.types.values[type_code])
+        if template is None:
+            return ()
+        template = template.lower()
+        if any(query_lower in part for part in template.split('{:.2f}')):
+            return type_rows
+        if not set(query_lower) <= set(template) | set(' (overdraft fee: $)0123456789.-'):
+            return ()
+        return [row for row in type_rows if query_lower in columns.description(row).lower()]
+
+
+def is_large_withdrawal(transaction):
+    return transaction['type'] == 'withdrawal' and transaction['amount'] > 5000
+
+
+def has_overdraft_fee(transaction):
+    return transaction.get('overdraft_fee', 0) > 0
+
+
+def any_transaction(transaction):
+    return True
+
+
+class FraudRule:
+    """Flags an account when more than `threshold` matching transactions fall inside the window."""
+    
+    def __init__(self, name, matches, threshold=0):
+        self.name = name
+        self.matches = matches  # transaction -> bool
+        self.threshold = threshold
+
+
+def default_fraud_rules():
+    return [
+        FraudRule("high_frequency", any_transaction, threshold=10),
+        FraudRule("large_withdrawals", is_large_withdrawal),
+        FraudRule("multiple_overdrafts", has_overdraft_fee, threshold=2),
+    ]
+
+
+class FraudEngine:
+    """
+    Streaming fraud detection over a sliding time window.
+    
+    Each recorded transaction is matched against every rule once; matches are
+    kept as per-account, per-rule deques of timestamps that are trimmed to the
+    window on read, so checking an account never rescans its history.
+    Listeners are called with an event dict whenever a flag is raised.
+    """
+    
+    def __init__(self, rules=None, window=3600):
+        self.rules = rules if rules is not None else default_fraud_rules()
+        self.window = window
+        self.hits = {}  # account_number -> {rule name: deque of matching timestamps}
+        self.listeners = []
+    
+    def subscribe(self, listener):
+        """Call listener(event) for every flag raised from now on."""
+        self.listeners.append(listener)
+    
+    def add_rule(self, rule):
+        self.rules.append(rule)
+    
+    def record(self, account_number, transaction, rules=None):
+        """Feed one transaction through the rules, emitting an event for each newly raised flag."""
+        timestamp = transaction['timestamp']
+        now = time.time()
+        account_hits = self.hits.setdefault(account_number, {})
         
-        transaction = {
-            'type': 'withdrawal',
-            'amount': amount,
-            'timestamp': time.time(),
-            'description': f'Withdrawal of ${amount:.2f}',
-            'category': category
-        }
+        for rule in rules if rules is not None else self.rules:
+            if not rule.matches(transaction):
+                continue
+            
+            times = account_hits.get(rule.name)
+            if times is None:
+                times = account_hits[rule.name] = deque()
+            if times and timestamp < times[-1]:
+                insort(times, timestamp)  # Back-dated
+            else:
+                times.append(timestamp)
+            
+            if self._trim(times, now) == rule.threshold + 1:
+                event = {
+                    'account_number': account_number,
+                    'flag': rule.name,
+                    'count': rule.threshold + 1,
+                    'timestamp': timestamp
+                }
+                for listener in self.listeners:
+                    listener(event)
+    
+    def flags(self, account_number):
+        """Names of the rules currently over threshold for an account, in rule order."""
+        account_hits = self.hits.get(account_number)
+        if not account_hits:
+            return []
         
-        # Add overdraft fee if applicable
-        if overdraft_amount > 0:
-            fee = 35.0  # Standard overdraft fee
-            account['balance'] -= fee
-            self.overdraft_fees[account_number] = self.overdraft_fees.get(account_number, 0) + fee
+        now = time.time()
+        flags = []
+        for rule in self.rules:
+            times = account_hits.get(rule.name)
+            if times and self._trim(times, now) > rule.threshold:
+                flags.append(rule.name)
+        return flags
+    
+    def evaluate(self, transactions):
+        """Apply the rules to an explicit list of transactions (for windows other than self.window)."""
+        return [rule.name for rule in self.rules
+                if sum(1 for t in transactions if rule.matches(t)) > rule.threshold]
+    
+    def _trim(self, times, now):
+        """Drop timestamps that have left the window; return how many remain."""
+        cutoff = now - self.window
+        while times and times[0] < cutoff:
+            times.popleft()
+        if times and times[-1] > now:
+            return bisect_right(times, now)  # Future-dated entries are not in the window yet
+        return len(times)
+
+
+class BankStorage:
+    """
+    Durable storage for a BankingSystem: a write-ahead log plus snapshots.
+    
+    Every mutation (an account opened, or a group of ledger rows recorded
+    together) is appended to wal.log as one JSON line with a sequence
+    number. The log is fsynced once per group of group_size records, and a
+    timer armed by the first unsynced record syncs the group at the latest
+    group_interval seconds later, so many operations share one fsync and a
+    crash loses at most the last group_interval seconds of writes.
+    A snapshot replaces the log once snapshot_every records have built up;
+    recovery loads the snapshot and replays only the records after it.
+    """
+    
+    def __init__(self, directory, group_size=256, group_interval=0.05, snapshot_every=100000):
+        self.directory = directory
+        self.wal_path = os.path.join(directory, 'wal.log')
+        self.snapshot_path = os.path.join(directory, 'snapshot.pkl')
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.snapshot_every = snapshot_every
+        self.lock = threading.Lock()
+        self.wal = None
+        self.seq = 0  # sequence number of the last record written
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.sync_timer = None  # Pending deadline sync for the current group
+        self.since_snapshot = 0
+    
+    def load(self):
+        """Read the snapshot state (or None) and the log records after it, then open the log for appending."""
+        os.makedirs(self.directory, exist_ok=True)
+        state = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                state = pickle.load(f)
+            self.seq = state['seq']
+        
+        records = []
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, 'rb') as f:
+                data = f.read()
+            end = 0
+            while True:
+                newline = data.find(b'\n', end)
+                if newline < 0:
+                    break  # Whatever follows the last newline is a torn write
+                try:
+                    record = json.loads(data[end:newline])
+                except ValueError:
+                    break
+                end = newline + 1
+                # Records at or below the snapshot's seq survived a crash before the log was reset
+                if record[0] > self.seq:
+                    records.append(record)
+                    self.seq = record[0]
+            if end < len(data):
+                with open(self.wal_path, 'r+b') as f:
+                    f.truncate(end)
+        
+        self.since_snapshot = len(records)
+        self.wal = open(self.wal_path, 'a', encoding='utf-8')
+        return state, records
+    
+    def append(self, kind, payload):
+        """Log one mutation; it is durable within group_interval seconds."""
+        with self.lock:
+            self.seq += 1
+            self.wal.write(json.dumps([self.seq, kind, payload], separators=(',', ':')) + '\n')
+            self.unsynced += 1
+            self.since_snapshot += 1
+            if self.unsynced >= self.group_size or time.monotonic() - self.last_sync >= self.group_interval:
+                self._sync()
+            elif self.sync_timer is None:
+                self.sync_timer = threading.Timer(self.group_interval, self._sync_due)
+                self.sync_timer.daemon = True
+                self.sync_timer.start()
+    
+    def sync(self):
+        """Make every record written so far durable."""
+        with self.lock:
+            self._sync()
+    
+    def _sync_due(self):
+        """Timer callback: sync a group that has waited group_interval seconds."""
+        with self.lock:
+            if self.wal is not None and self.unsynced:
+                self._sync()
+    
+    def _sync(self):
+        self.wal.flush()
+        os.fsync(self.wal.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        if self.sync_timer is not None:
+            self.sync_timer.cancel()
+            self.sync_timer = None
+    
+    @property
+    def snapshot_due(self):
+        return self.since_snapshot >= self.snapshot_every
+    
+    def write_snapshot(self, state):
+        """Atomically replace the snapshot with state (tagged with the current seq), then reset the log."""
+        with self.lock:
+            self._sync()
+            state['seq'] = self.seq
+            temp_path = self.snapshot_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            self._sync_directory()
+            
+            self.wal.close()
+            self.wal = open(self.wal_path, 'w', encoding='utf-8')
+            self._sync()
+            self.since_snapshot = 0
+    
+    def _sync_directory(self):
+        """Persist the rename of the snapshot file (POSIX only)."""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def close(self):
+        """Sync and close the log."""
+        with self.lock:
+            if self.wal is not None:
+                self._sync()
+                self.wal.close()
+                self.wal = None
+
+
+class AccountLocks:
+    """
+    Striped per-account locks.
+    
+    Account numbers hash onto a fixed set of stripes, so the number of locks
+    stays bounded however many accounts exist. Stripes are always acquired
+    in ascending order, which rules out deadlock between operations that
+    lock overlapping sets of accounts (e.g. transfers in opposite directions).
+    """
+    
+    def __init__(self, stripes=64):
+        self.stripes = [threading.RLock() for _ in range(stripes)]
+    
+    def stripes_for(self, account_numbers):
+        """The stripes covering some accounts, in acquisition order."""
+        indices = sorted({hash(account_number) % len(self.stripes) for account_number in account_numbers})
+        return [self.stripes[index] for index in indices]
+    
+    @contextmanager
+    def hold(self, account_numbers):
+        """Hold the locks of all the given accounts for the duration of the block."""
+        yield from self._hold(self.stripes_for(account_numbers))
+    
+    @contextmanager
+    def hold_all(self):
+        """Hold every stripe, excluding all per-account operations."""
+        yield from self._hold(self.stripes)
+    
+    def _hold(self, locks):
+        acquired = []
+        try:
+            for lock in locks:
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+
+class Account:
+    """One account's fields as slots; to_dict() gives the dict shape the API returns."""
+    
+    __slots__ = ('account_number', 'customer_name', 'account_type', 'balance', 'created_at', 'overdraft_limit')
+    
+    def __init__(self, account_number, customer_name, account_type, balance, created_at, overdraft_limit):
+        self.account_number = account_number
+        self.customer_name = customer_name
+        self.account_type = account_type
+        self.balance = balance
+        self.created_at = created_at
+        self.overdraft_limit = overdraft_limit
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class BankingSystem:
+    """Advanced banking system with financial logic."""
+    
+    def __init__(self, thread_safe=False, lock_stripes=64, storage=None):
+        """
+        Initialize the banking system.
+        
+        With thread_safe=True every operation locks the accounts it touches
+        (see AccountLocks), so the system can be shared between threads;
+        operations on unrelated accounts do not block each other.
+        
+        With a BankStorage, accounts and transactions are persisted as they
+        change, and any state already in its directory is recovered first.
+        """
+        self.accounts = {}  # account_number -> Account
+        self.transactions = TransactionLedger()
+        self.next_account_number = 1000001
+        self.frozen_accounts = set()
+        self.overdraft_fees = {}  # account_number -> fee_amount
+        self.fraud_engine = FraudEngine()
+        self.scheduled_transfers = {}  # transfer_id -> pending transfer
+        self.transfer_archive = {}  # transfer_id -> completed or failed transfer
+        self.transfer_queue = []  # min-heap of (schedule_time, transfer_id)
+        self.next_transfer_id = 0
+        self.scheduler_thread = None
+        self.scheduler_stop = None
+        self.account_locks = AccountLocks(lock_stripes) if thread_safe else None
+        # Guards account numbering and the transfer schedule
+        self.registry_lock = threading.Lock() if thread_safe else nullcontext()
+        self.prepared_transfers = {}  # transfer_id -> reserved half of a cross-shard transfer
+        self.storage = storage
+        if storage is not None:
+            self._recover()
+    
+    def _locked(self, *account_numbers):
+        """Context manager holding the given accounts' locks (a no-op unless thread-safe)."""
+        if self.account_locks is None:
+            return nullcontext()
+        return self.account_locks.hold(account_numbers)
+    
+    def _locked_all(self):
+        """Context manager holding every account lock (a no-op unless thread-safe)."""
+        if self.account_locks is None:
+            return nullcontext()
+        return self.account_locks.hold_all()
+    
+    # =================== LEVEL 1-2 METHODS ===================
+    
+    def create_account(self, customer_name, account_type="checking", initial_deposit=0.0):
+        """Create a new account with type."""
+        with self.registry_lock:
+            account_number = str(self.next_account_number)
+            self.next_account_number += 1
+        
+        self._maybe_checkpoint()
+        with self._locked(account_number):
+            overdraft_limit = 500.0 if account_type == "checking" else 0.0
+            account = self.accounts[account_number] = Account(
+                account_number, customer_name, account_type, initial_deposit, time.time(), overdraft_limit
+            )
+            # The initial deposit row credits the balance again on replay
+            self._log('open', dict(account.to_dict(), balance=0.0 if initial_deposit > 0 else initial_deposit))
             
-            transaction['overdraft_fee'] = fee
-            transaction['description'] += f' (Overdraft fee: ${fee:.2f})'
+            if initial_deposit > 0:
+                self._record_transaction(account_number, 'deposit', initial_deposit, 'initial', 'Initial deposit')
         
-        self.transactions[account_number].append(transaction)
-        return True
+        return account_number
+    
+    def get_account(self, account_number):
+        account = self.accounts.get(account_number)
+        return account.to_dict() if account else None
+    
+    def deposit(self, account_number, amount, category="general", timestamp=None):
+        self._maybe_checkpoint()
+        with self._locked(account_number):
+            account = self.accounts.get(account_number)
+            if account is None or amount <= 0:
+                return False
+            
+            if account_number in self.frozen_accounts:
+                return False
+            
+            account.balance += amount
+            self._record_transaction(account_number, 'deposit', amount, category, timestamp=timestamp)
+            
+            return True
+    
+    def withdraw(self, account_number, amount, category="general", timestamp=None):
+        self._maybe_checkpoint()
+        with self._locked(account_number):
+            account = self.accounts.get(account_number)
+            if account is None or amount <= 0:
+                return False
+            
+            if account_number in self.frozen_accounts:
+                return False
+            
+            available_balance = account.balance + account.overdraft_limit
+            
+            if available_balance < amount:
+                return False
+            
+            # Check if overdraft will occur
+            overdraft_amount = max(0, amount - account.balance)
+            
+            account.balance -= amount
+            
+            # Add overdraft fee if applicable
+            fee = 0.0
+            if overdraft_amount > 0:
+                fee = 35.0  # Standard overdraft fee
+                account.balance -= fee
+                self.overdraft_fees[account_number] = self.overdraft_fees.get(account_number, 0) + fee
+            
+            self._record_transaction(account_number, 'withdrawal', amount, category, overdraft_fee=fee, timestamp=timestamp)
+            return True
+    
+    def _record_transaction(self, account_number, transaction_type, amount, category, description=None,
+                            overdraft_fee=0.0, timestamp=None):
+        """Append a transaction to the ledger and feed it to the fraud engine."""
+        transaction = self.transactions.append(
+            account_number, transaction_type, amount, category, description, overdraft_fee, timestamp
+        )
+        self.fraud_engine.record(account_number, transaction)
+        self._log('transactions', [[
+            account_number, transaction_type, amount, category, description, overdraft_fee, transaction['timestamp']
+        ]])
+        return transaction
     
     def get_balance(self, account_number):
         account = self.accounts.get(account_number)
-        return account['balance'] if account else None
+        return account.balance if account else None
     
     def get_transaction_history(self, account_number, category=None):
-        transactions = self.transactions.get(account_number, [])
-        if category:
-            return [t for t in transactions if t.get('category') == category]
-        return transactions
+        """An account's transactions (optionally one category's), as a list of plain dicts."""
+        with self._locked(account_number):
+            if category:
+                transactions = self.transactions.with_category(account_number, category)
+            else:
+                transactions = self.transactions.history(account_number)
+            return [dict(transaction) for transaction in transactions]
     
     def list_all_accounts(self):
-        return list(self.accounts.values())
+        return [account.to_dict() for account in self.accounts.values()]
     
     def get_transactions_in_timerange(self, account_number, start_time, end_time):
-        transactions = self.transactions.get(account_number, [])
-        return [t for t in transactions if start_time <= t['timestamp'] <= end_time]
+        with self._locked(account_number):
+            transactions = self.transactions.in_timerange(account_number, start_time, end_time)
+            return [dict(transaction) for transaction in transactions]
     
     def search_transactions(self, account_number, query):
-        transactions = self.transactions.get(account_number, [])
-        query_lower = query.lower()
-        return [t for t in transactions if query_lower in t['description'].lower()]
+        with self._locked(account_number):
+            return [dict(transaction) for transaction in self.transactions.search(account_number, query)]
     
     def calculate_interest(self, account_number, annual_rate=0.02):
         account = self.accounts.get(account_number)
-        if not account or account['account_type'] != 'savings':
+        if not account or account.account_type != 'savings':
             return 0.0
-        return account['balance'] * (annual_rate / 12)  # Monthly interest
+        return account.balance * (annual_rate / 12)  # Monthly interest
     
     # =================== LEVEL 3 NEW METHODS ===================
     
     def transfer_funds(self, from_account, to_account, amount, description="Transfer"):
         """Transfer funds between accounts."""
-        if from_account not in self.accounts or to_account not in self.accounts:
-            return False
+        transfer = {
+            'from_account': from_account,
+            'to_account': to_account,
+            'amount': amount,
+            'description': description
+        }
+        return self.transfer_batch([transfer])['transferred'] == 1
+    
+    def transfer_batch(self, transfers, atomic=True):
+        """
+        Apply many transfers in one pass.
         
-        if amount <= 0:
-            return False
+        Each transfer is a dict with from_account, to_account, amount and an
+        optional description. The whole batch is checked against balances,
+        overdraft limits and frozen accounts before anything is written; with
+        atomic=True any failure rejects the entire batch. Balances are then
+        set once per account and ledger rows are written in bulk, so a
+        failed item never needs a compensating write.
         
-        # Check if sender has sufficient funds (including overdraft)
-        sender = self.accounts[from_account]
-        available_balance = sender['balance'] + sender['overdraft_limit']
+        Returns:
+            dict: {'transferred': count, 'failed': [{'index': i, 'reason': str}]}
+        """
+        involved = set()
+        for transfer in transfers:
+            involved.add(transfer.get('from_account'))
+            involved.add(transfer.get('to_account'))
         
-        if available_balance < amount:
-            return False
+        self._maybe_checkpoint()
+        # Every account in the batch stays locked from validation to the last ledger write
+        with self._locked(*involved):
+            return self._transfer_batch(transfers, atomic)
+    
+    def _transfer_batch(self, transfers, atomic):
+        """Validate and apply a batch of transfers; the caller holds the accounts' locks."""
+        balances = {}  # account_number -> balance after the batch
+        fees = {}  # account_number -> overdraft fees charged by the batch
+        entries = {}  # account_number -> ledger rows to write
+        failed = []
+        current_time = time.time()
         
-        # Process withdrawal from sender
-        withdraw_success = self.withdraw(from_account, amount, "transfer_out")
-        if not withdraw_success:
-            return False
+        for index, transfer in enumerate(transfers):
+            from_account = transfer.get('from_account')
+            to_account = transfer.get('to_account')
+            amount = transfer.get('amount', 0)
+            
+            sender = self.accounts.get(from_account)
+            recipient = self.accounts.get(to_account)
+            if sender is None or recipient is None:
+                failed.append({'index': index, 'reason': 'invalid_account'})
+                continue
+            if amount <= 0:
+                failed.append({'index': index, 'reason': 'invalid_amount'})
+                continue
+            if from_account in self.frozen_accounts or to_account in self.frozen_accounts:
+                failed.append({'index': index, 'reason': 'frozen'})
+                continue
+            
+            balance = balances.get(from_account, sender.balance)
+            if balance + sender.overdraft_limit < amount:
+                failed.append({'index': index, 'reason': 'insufficient_funds'})
+                continue
+            
+            # Same overdraft fee a single withdrawal would charge
+            fee = 35.0 if amount > balance else 0.0
+            balances[from_account] = balance - amount - fee
+            if fee:
+                fees[from_account] = fees.get(from_account, 0) + fee
+            balances[to_account] = balances.get(to_account, recipient.balance) + amount
+            
+            description = transfer.get('description', "Transfer")
+            entries.setdefault(from_account, []).append(
+                ('withdrawal', amount, 'transfer_out', f"Transfer to {to_account}: {description}", fee, current_time)
+            )
+            entries.setdefault(to_account, []).append(
+                ('deposit', amount, 'transfer_in', f"Transfer from {from_account}: {description}", 0.0, current_time)
+            )
         
-        # Process deposit to receiver
-        deposit_success = self.deposit(to_account, amount, "transfer_in")
-        if not deposit_success:
-            # Rollback withdrawal
-            self.deposit(from_account, amount, "transfer_rollback")
-            return False
+        if failed and atomic:
+            return {'transferred': 0, 'failed': failed}
         
-        # Update transaction descriptions
-        sender_transactions = self.transactions[from_account]
-        receiver_transactions = self.transactions[to_account]
+        for account_number, balance in balances.items():
+            self.accounts[account_number].balance = balance
+        for account_number, fee in fees.items():
+            self.overdraft_fees[account_number] = self.overdraft_fees.get(account_number, 0) + fee
+        for account_number, account_entries in entries.items():
+            for transaction in self.transactions.extend(account_number, account_entries):
+                self.fraud_engine.record(account_number, transaction)
+        
+        # One log record for the whole batch, so recovery never sees half of it
+        self._log('transactions', [
+            [account_number, *entry] for account_number, account_entries in entries.items() for entry in account_entries
+        ])
         
-        sender_transactions[-1]['description'] = f"Transfer to {to_account}: {description}"
-        receiver_transactions[-1]['description'] = f"Transfer from {from_account}: {description}"
+        return {'transferred': len(transfers) - len(failed), 'failed': failed}
+    
+    def prepare_transfer_out(self, transfer_id, from_account, to_account, amount, description="Transfer"):
+        """
+        Phase one of a cross-shard transfer on the sending shard.
         
+        Runs the same checks as a local transfer and reserves the amount
+        (plus any overdraft fee) by taking it off the balance, so later
+        operations cannot spend it. Nothing is logged until commit_transfer.
+        Returns None when prepared, otherwise the failure reason.
+        """
+        self._maybe_checkpoint()
+        with self._locked(from_account):
+            account = self.accounts.get(from_account)
+            if account is None:
+                return 'invalid_account'
+            if amount <= 0:
+                return 'invalid_amount'
+            if from_account in self.frozen_accounts:
+                return 'frozen'
+            
+            balance = account.balance
+            if balance + account.overdraft_limit < amount:
+                return 'insufficient_funds'
+            
+            fee = 35.0 if amount > balance else 0.0
+            account.balance = balance - amount - fee
+            self.prepared_transfers[transfer_id] = (
+                from_account, 'withdrawal', amount, 'transfer_out', f"Transfer to {to_account}: {description}", fee
+            )
+            return None
+    
+    def prepare_transfer_in(self, transfer_id, to_account, from_account, amount, description="Transfer"):
+        """Phase one of a cross-shard transfer on the receiving shard; None when prepared, otherwise the reason."""
+        with self._locked(to_account):
+            if to_account not in self.accounts:
+                return 'invalid_account'
+            if amount <= 0:
+                return 'invalid_amount'
+            if to_account in self.frozen_accounts:
+                return 'frozen'
+            
+            self.prepared_transfers[transfer_id] = (
+                to_account, 'deposit', amount, 'transfer_in', f"Transfer from {from_account}: {description}", 0.0
+            )
+            return None
+    
+    def commit_transfer(self, transfer_id):
+        """Phase two: write a prepared half of a transfer to the ledger (and credit it, on the receiving side)."""
+        with self._locked_transfer(transfer_id) as prepared:
+            if prepared is None:
+                return False
+            
+            account_number, transaction_type, amount, category, description, fee = prepared
+            if transaction_type == 'deposit':
+                self.accounts[account_number].balance += amount
+            elif fee:
+                self.overdraft_fees[account_number] = self.overdraft_fees.get(account_number, 0) + fee
+            self._record_transaction(account_number, transaction_type, amount, category, description, overdraft_fee=fee)
+            del self.prepared_transfers[transfer_id]
+        return True
+    
+    def abort_transfer(self, transfer_id):
+        """Phase two: release a prepared half of a transfer, returning any reserved funds."""
+        with self._locked_transfer(transfer_id) as prepared:
+            if prepared is None:
+                return False
+            
+            account_number, transaction_type, amount, _, _, fee = prepared
+            if transaction_type == 'withdrawal':
+                self.accounts[account_number].balance += amount + fee
+            del self.prepared_transfers[transfer_id]
         return True
     
+    @contextmanager
+    def _locked_transfer(self, transfer_id):
+        """
+        Hold the lock of a prepared transfer's account and yield the prepared half (None if there is none).
+        
+        The account is only known from the entry itself, so it is read once
+        to pick the lock and read again under it; a concurrent commit or
+        abort of the same transfer then finds nothing left to do.
+        """
+        while True:
+            prepared = self.prepared_transfers.get(transfer_id)
+            if prepared is None:
+                yield None
+                return
+            with self._locked(prepared[0]):
+                if self.prepared_transfers.get(transfer_id) is prepared:
+                    yield prepared
+                    return
+    
     def freeze_account(self, account_number, reason="Security hold"):
         """Freeze an account to prevent transactions."""
-        if account_number not in self.accounts:
-            return False
-        
-        self.frozen_accounts.add(account_number)
-        self.transactions[account_number].append({
-            'type': 'freeze',
-            'amount': 0,
-            'timestamp': time.time(),
-            'description': f'Account frozen: {reason}',
-            'category': 'administrative'
-        })
-        
-        return True
+        self._maybe_checkpoint()
+        with self._locked(account_number):
+            if account_number not in self.accounts:
+                return False
+            
+            self.frozen_accounts.add(account_number)
+            self._record_transaction(account_number, 'freeze', 0, 'administrative', f'Account frozen: {reason}')
+            
+            return True
     
     def unfreeze_account(self, account_number):
         """Unfreeze an account."""
-        if account_number not in self.accounts:
-            return False
-        
-        self.frozen_accounts.discard(account_number)
-        self.transactions[account_number].append({
-            'type': 'unfreeze',
-            'amount': 0,
-            'timestamp': time.time(),
-            'description': 'Account unfrozen',
-            'category': 'administrative'
-        })
-        
-        return True
+        self._maybe_checkpoint()
+        with self._locked(account_number):
+            if account_number not in self.accounts:
+                return False
+            
+            self.frozen_accounts.discard(account_number)
+            self._record_transaction(account_number, 'unfreeze', 0, 'administrative', 'Account unfrozen')
+            
+            return True
     
     def detect_suspicious_activity(self, account_number, time_window=3600):
         """Detect potentially fraudulent activity."""
+        with self._locked(account_number):
+            if time_window == self.fraud_engine.window:
+                return self.fraud_engine.flags(account_number)
+            
+            # Windows the engine does not track fall back to a scan of the time index
+            current_time = time.time()
+            recent_transactions = self.transactions.in_timerange(
+                account_number, current_time - time_window, current_time
+            )
+            return self.fraud_engine.evaluate(recent_transactions)
+    
+    def screen_accounts(self):
+        """Current fraud flags for every flagged account, without rescanning any history."""
+        screened = {}
+        for account_number in list(self.accounts):
+            flags = self.detect_suspicious_activity(account_number)
+            if flags:
+                screened[account_number] = flags
+        return screened
+    
+    def add_fraud_rule(self, rule):
+        """Add a fraud rule; transactions already inside the window are replayed through it."""
+        # No transaction may be recorded between adding the rule and replaying, or it would count twice
+        with self._locked_all():
+            self.fraud_engine.add_rule(rule)
+            self._replay_fraud_window(rules=[rule])
+    
+    def _replay_fraud_window(self, rules=None):
+        """Feed every account's transactions inside the fraud window through the given rules (default: all)."""
         current_time = time.time()
-        recent_transactions = self.get_transactions_in_timerange(
-            account_number, current_time - time_window, current_time
-        )
+        for account_number in list(self.accounts):
+            recent_transactions = self.transactions.in_timerange(
+                account_number, current_time - self.fraud_engine.window, current_time
+            )
+            for transaction in recent_transactions:
+                self.fraud_engine.record(account_number, transaction, rules=rules)
+    
+    def schedule_transfer(self, from_account, to_account, amount, schedule_time, description="Scheduled transfer"):
+        """Schedule a future transfer."""
+        with self.registry_lock:
+            transfer_id = self.next_transfer_id
+            self.next_transfer_id += 1
+            
+            self.scheduled_transfers[transfer_id] = {
+                'transfer_id': transfer_id,
+                'from_account': from_account,
+                'to_account': to_account,
+                'amount': amount,
+                'schedule_time': schedule_time,
+                'description': description,
+                'status': 'pending'
+            }
+            heapq.heappush(self.transfer_queue, (schedule_time, transfer_id))
+        return transfer_id
+    
+    def get_scheduled_transfer(self, transfer_id):
+        """Get a scheduled transfer, whether still pending or archived."""
+        return self.scheduled_transfers.get(transfer_id) or self.transfer_archive.get(transfer_id)
+    
+    def process_scheduled_transfers(self):
+        """Process all due scheduled transfers; cost is proportional to the number due."""
+        current_time = time.time()
+        processed_count = 0
         
-        # Flag suspicious patterns
-        suspicious_flags = []
+        while True:
+            # Take one due transfer off the schedule; the transfer itself runs under account locks only
+            with self.registry_lock:
+                if not self.transfer_queue or self.transfer_queue[0][0] > current_time:
+                    break
+                _, transfer_id = heapq.heappop(self.transfer_queue)
+                transfer = self.scheduled_transfers.pop(transfer_id)
+            
+            success = self.transfer_funds(
+                transfer['from_account'],
+                transfer['to_account'],
+                transfer['amount'],
+                transfer['description']
+            )
+            
+            transfer['status'] = 'completed' if success else 'failed'
+            transfer['processed_at'] = current_time
+            with self.registry_lock:
+                self.transfer_archive[transfer_id] = transfer
+            
+            if success:
+                processed_count += 1
         
-        # High frequency transactions
-        if len(recent_transactions) > 10:
-            suspicious_flags.append("high_frequency")
+        return processed_count
+    
+    def _seconds_until_next_transfer(self, interval):
+        """How long a scheduler loop can sleep: until the next transfer is due, at most interval."""
+        with self.registry_lock:
+            if not self.transfer_queue:
+                return interval
+            next_time = self.transfer_queue[0][0]
+        return max(0.0, min(interval, next_time - time.time()))
+    
+    def start_scheduler(self, interval=1.0):
+        """
+        Process due transfers on a background daemon thread, waking at least every interval seconds.
         
-        # Large withdrawal amounts
-        large_withdrawals = [t for t in recent_transactions 
-                           if t['type'] == 'withdrawal' and t['amount'] > 5000]
-        if large_withdrawals:
-            suspicious_flags.append("large_withdrawals")
+        The thread calls process_scheduled_transfers concurrently with the
+        caller, so other calls must not race with it unless the system was
+        created with thread_safe=True.
+        """
+        if self.scheduler_thread is not None:
+            return False
         
-        # Multiple overdrafts
-        overdraft_transactions = [t for t in recent_transactions 
-                                if t.get('overdraft_fee', 0) > 0]
-        if len(overdraft_transactions) > 2:
-            suspicious_flags.append("multiple_overdrafts")
+        stop = self.scheduler_stop = threading.Event()
         
-        return suspicious_flags
-    
-    def schedule_transfer(self, from_account, to_account, amount, schedule_time, description="Scheduled transfer"):
-        """Schedule a future transfer."""
-        # For simplicity, we'll store scheduled transfers and process them when requested
-        if not hasattr(self, 'scheduled_transfers'):
-            self.scheduled_transfers = []
+        def run():
+            while not stop.wait(self._seconds_until_next_transfer(interval)):
+                self.process_scheduled_transfers()
         
-        transfer = {
-            'from_account': from_account,
-            'to_account': to_account,
-            'amount': amount,
-            'schedule_time': schedule_time,
-            'description': description,
-            'status': 'pending'
-        }
+        self.scheduler_thread = threading.Thread(target=run, name="transfer-scheduler", daemon=True)
+        self.scheduler_thread.start()
+        return True
+    
+    def stop_scheduler(self):
+        """Stop the background scheduler thread started by start_scheduler."""
+        if self.scheduler_thread is None:
+            return False
         
-        self.scheduled_transfers.append(transfer)
-        return len(self.scheduled_transfers) - 1  # Return transfer ID
+        self.scheduler_stop.set()
+        self.scheduler_thread.join()
+        self.scheduler_thread = None
+        self.scheduler_stop = None
+        return True
     
-    def process_scheduled_transfers(self):
-        """Process all due scheduled transfers."""
-        if not hasattr(self, 'scheduled_transfers'):
-            return 0
+    async def run_scheduler(self, interval=1.0):
+        """Process due transfers forever on the running event loop; cancel the task to stop."""
+        while True:
+            self.process_scheduled_transfers()
+            await asyncio.sleep(self._seconds_until_next_transfer(interval))
+    
+    def checkpoint(self):
+        """Snapshot accounts and the ledger to storage and start a fresh log."""
+        if self.storage is None:
+            return False
         
-        current_time = time.time()
-        processed_count = 0
+        with self._locked_all(), self.registry_lock:
+            # A prepared transfer's reservation is in a balance but not yet in the log
+            if self.prepared_transfers:
+                return False
+            self.storage.write_snapshot({
+                'accounts': self.accounts,
+                'transactions': self.transactions,
+                'frozen_accounts': self.frozen_accounts,
+                'overdraft_fees': self.overdraft_fees,
+                'next_account_number': self.next_account_number
+            })
+        return True
+    
+    def close(self):
+        """Flush and close storage; every operation so far is durable afterwards."""
+        if self.storage is not None:
+            self.storage.close()
+    
+    def _maybe_checkpoint(self):
+        """Take a due periodic snapshot; called before an operation takes any locks."""
+        if self.storage is not None and self.storage.snapshot_due:
+            self.checkpoint()
+    
+    def _log(self, kind, payload):
+        if self.storage is not None:
+            self.storage.append(kind, payload)
+    
+    def _recover(self):
+        """Rebuild state from the storage snapshot and log, then refill the fraud windows."""
+        state, records = self.storage.load()
+        if state is not None:
+            self.accounts = state['accounts']
+            self.transactions = state['transactions']
+            self.frozen_accounts = state['frozen_accounts']
+            self.overdraft_fees = state['overdraft_fees']
+            self.next_account_number = state['next_account_number']
         
-        for transfer in self.scheduled_transfers:
-            if (transfer['status'] == 'pending' and 
-                transfer['schedule_time'] <= current_time):
-                
-                success = self.transfer_funds(
-                    transfer['from_account'],
-                    transfer['to_account'],
-                    transfer['amount'],
-                    transfer['description']
-                )
-                
-                transfer['status'] = 'completed' if success else 'failed'
-                transfer['processed_at'] = current_time
-                
-                if success:
-                    processed_count += 1
+        for _, kind, payload in records:
+            if kind == 'open':
+                self.accounts[payload['account_number']] = Account(**payload)
+                self.next_account_number = max(self.next_account_number, int(payload['account_number']) + 1)
+            else:
+                for account_number, *entry in payload:
+                    self.transactions.append(account_number, *entry)
+                    self._replay_balance(account_number, entry[0], entry[1], entry[4])
         
-        return processed_count
+        self._replay_fraud_window()
+    
+    def _replay_balance(self, account_number, transaction_type, amount, overdraft_fee):
+        """Apply a logged row's effect on balances, fees and freezes, in the same order the operation did."""
+        account = self.accounts[account_number]
+        if transaction_type == 'deposit':
+            account.balance += amount
+        elif transaction_type == 'withdrawal':
+            account.balance -= amount
+            if overdraft_fee:
+                account.balance -= overdraft_fee
+                self.overdraft_fees[account_number] = self.overdraft_fees.get(account_number, 0) + overdraft_fee
+        elif transaction_type == 'freeze':
+            self.frozen_accounts.add(account_number)
+        elif transaction_type == 'unfreeze':
+            self.frozen_accounts.discard(account_number)
     
     def get_account_summary(self, account_number):
         """Get comprehensive account summary."""
@@ -281,25 +1368,242 @@ class BankingSystem:
             return None
         
         account = self.accounts[account_number]
-        transactions = self.transactions[account_number]
-        
-        # Calculate transaction stats
-        deposits = [t for t in transactions if t['type'] == 'deposit']
-        withdrawals = [t for t in transactions if t['type'] == 'withdrawal']
-        
-        return {
-            'account_number': account_number,
-            'customer_name': account['customer_name'],
-            'account_type': account['account_type'],
-            'current_balance': account['balance'],
-            'overdraft_limit': account['overdraft_limit'],
-            'total_deposits': sum(t['amount'] for t in deposits),
-            'total_withdrawals': sum(t['amount'] for t in withdrawals),
-            'transaction_count': len(transactions),
-            'overdraft_fees': self.overdraft_fees.get(account_number, 0),
-            'is_frozen': account_number in self.frozen_accounts,
-            'suspicious_flags': self.detect_suspicious_activity(account_number)
-        }
+        
+        # Balance and ledger totals are read as one consistent snapshot
+        with self._locked(account_number):
+            return {
+                'account_number': account_number,
+                'customer_name': account.customer_name,
+                'account_type': account.account_type,
+                'current_balance': account.balance,
+                'overdraft_limit': account.overdraft_limit,
+                'total_deposits': self.transactions.total(account_number, 'deposit'),
+                'total_withdrawals': self.transactions.total(account_number, 'withdrawal'),
+                'transaction_count': self.transactions.count(account_number),
+                'overdraft_fees': self.overdraft_fees.get(account_number, 0),
+                'category_totals': self.transactions.category_totals(account_number),
+                'is_frozen': account_number in self.frozen_accounts,
+                'suspicious_flags': self.detect_suspicious_activity(account_number)
+            }
+
+
+# Methods whose first argument is an account number; the router sends them to that account's shard
+ROUTED_METHODS = frozenset({
+    'get_account', 'deposit', 'withdraw', 'get_balance', 'get_transaction_history',
+    'get_transactions_in_timerange', 'search_transactions', 'calculate_interest',
+    'freeze_account', 'unfreeze_account', 'detect_suspicious_activity', 'get_account_summary',
+})
+
+
+def _portable(value):
+    """Copy ledger views into plain dicts and lists before they cross a process boundary."""
+    if isinstance(value, TransactionRow):
+        return dict(value)
+    if isinstance(value, (list, AccountColumns)):
+        return [_portable(item) for item in value]
+    return value
+
+
+def _serve_shard(connection):
+    """Worker loop: own one BankingSystem and run each batch of calls sent down the pipe."""
+    bank = BankingSystem()
+    while True:
+        calls = connection.recv()
+        if calls is None:
+            break
+        results = []
+        for method, args in calls:
+            try:
+                if method == 'create_account':
+                    # The router numbers accounts, so every shard agrees on who owns which number
+                    bank.next_account_number = int(args[0])
+                    args = args[1:]
+                results.append((True, _portable(getattr(bank, method)(*args))))
+            except Exception as error:
+                results.append((False, error))
+        connection.send(results)
+    connection.close()
+
+
+class ShardedBankingSystem:
+    """
+    BankingSystem partitioned across worker processes.
+    
+    Account number n lives on shard n % shards, and each shard is a
+    BankingSystem in its own process, reached over a pipe. Single-account
+    methods keep their BankingSystem signatures and run on the owning
+    shard. A transfer_funds between shards runs as a two-phase commit:
+    both shards prepare (the sender reserves the funds), then both commit,
+    or any prepared half is aborted.
+    
+    One call waits for one round trip, so use execute() to send many
+    operations at once: each shard gets its share in a single message and
+    all shards work in parallel. The router is thread-safe; calls to
+    different shards do not wait for each other.
+    """
+    
+    def __init__(self, shards=None):
+        shards = shards or os.cpu_count() or 1
+        self.connections = []
+        self.processes = []
+        for _ in range(shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.shard_locks = [threading.Lock() for _ in range(shards)]
+        self.registry_lock = threading.Lock()
+        self.next_account_number = 1000001
+        self.next_transfer_id = 0
+    
+    def shard_of(self, account_number):
+        """Index of the shard that owns an account."""
+        try:
+            return int(account_number) % len(self.connections)
+        except (TypeError, ValueError):
+            return 0  # Unknown accounts fail on any shard
+    
+    def _send(self, batches):
+        """
+        Send {shard: [(method, args), ...]} and return {shard: results}.
+        
+        Every batch is sent before any reply is read, so the shards run
+        them concurrently. Shard locks are taken in index order, which
+        keeps concurrent callers from deadlocking.
+        """
+        shards = sorted(batches)
+        for shard in shards:
+            self.shard_locks[shard].acquire()
+        try:
+            for shard in shards:
+                self.connections[shard].send(batches[shard])
+            return {shard: self.connections[shard].recv() for shard in shards}
+        finally:
+            for shard in reversed(shards):
+                self.shard_locks[shard].release()
+    
+    def _call(self, shard, method, *args):
+        ok, value = self._send({shard: [(method, args)]})[shard][0]
+        if not ok:
+            raise value
+        return value
+    
+    def __getattr__(self, name):
+        if name not in ROUTED_METHODS:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        
+        def routed(account_number, *args):
+            return self._call(self.shard_of(account_number), name, account_number, *args)
+        routed.__name__ = name
+        return routed
+    
+    def create_account(self, customer_name, account_type="checking", initial_deposit=0.0):
+        """Create a new account on the shard its number maps to."""
+        with self.registry_lock:
+            account_number = self.next_account_number
+            self.next_account_number += 1
+        return self._call(
+            self.shard_of(account_number), 'create_account', account_number, customer_name, account_type, initial_deposit
+        )
+    
+    def list_all_accounts(self):
+        batches = {shard: [('list_all_accounts', ())] for shard in range(len(self.connections))}
+        replies = self._send(batches)
+        return [account for shard in sorted(replies) for account in replies[shard][0][1]]
+    
+    def transfer_funds(self, from_account, to_account, amount, description="Transfer"):
+        """Transfer funds; between shards this is a two-phase commit."""
+        source = self.shard_of(from_account)
+        target = self.shard_of(to_account)
+        if source == target:
+            return self._call(source, 'transfer_funds', from_account, to_account, amount, description)
+        
+        with self.registry_lock:
+            transfer_id = self.next_transfer_id
+            self.next_transfer_id += 1
+        
+        # Phase one: both shards check and reserve in parallel
+        replies = self._send({
+            source: [('prepare_transfer_out', (transfer_id, from_account, to_account, amount, description))],
+            target: [('prepare_transfer_in', (transfer_id, to_account, from_account, amount, description))],
+        })
+        prepared = {shard for shard, ((ok, reason),) in replies.items() if ok and reason is None}
+        
+        # Phase two: commit only if both halves prepared, otherwise release whatever did
+        decision = 'commit_transfer' if prepared == {source, target} else 'abort_transfer'
+        if prepared:
+            self._send({shard: [(decision, (transfer_id,))] for shard in prepared})
+        return decision == 'commit_transfer'
+    
+    def execute(self, operations):
+        """
+        Run many operations with one message per shard; returns their results in order.
+        
+        Each operation is (method, *args) with a routed method, create_account
+        or transfer_funds. The outcome is the same as running them one by one
+        in submission order: operations on different shards never touch the
+        same account, so they run concurrently, and a cross-shard transfer
+        first flushes whatever is queued for its two shards, then runs its
+        two-phase commit before any later operation on them. A failing
+        operation's exception is returned as its result.
+        """
+        results = [None] * len(operations)
+        batches = {}
+        positions = {}  # shard -> indices of its operations, in batch order
+        
+        for index, (method, *args) in enumerate(operations):
+            if method == 'create_account':
+                with self.registry_lock:
+                    account_number = self.next_account_number
+                    self.next_account_number += 1
+                args = [account_number, *args]
+                shard = self.shard_of(account_number)
+            elif method == 'transfer_funds':
+                shard = self.shard_of(args[0])
+                target = self.shard_of(args[1])
+                if shard != target:
+                    self._flush(batches, positions, results, (shard, target))
+                    results[index] = self.transfer_funds(*args)
+                    continue
+            elif method in ROUTED_METHODS:
+                shard = self.shard_of(args[0])
+            else:
+                results[index] = AttributeError(f"{method!r} cannot be routed to a shard")
+                continue
+            batches.setdefault(shard, []).append((method, tuple(args)))
+            positions.setdefault(shard, []).append(index)
+        
+        self._flush(batches, positions, results, list(batches))
+        return results
+    
+    def _flush(self, batches, positions, results, shards):
+        """Send the queued operations of some shards and file their replies into results."""
+        pending = {shard: batches.pop(shard) for shard in shards if shard in batches}
+        if not pending:
+            return
+        for shard, replies in self._send(pending).items():
+            for index, (_, value) in zip(positions.pop(shard), replies):
+                results[index] = value
+    
+    def close(self):
+        """Stop every shard process."""
+        for connection, process in zip(self.connections, self.processes):
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=5)
+            connection.close()
+        self.connections = []
+        self.processes = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
+import json
 import pytest
 import sys
+import asyncio
 import os
+import random
+import threading
+import time
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
-from banking_system.level3.model_solution.banking import BankingSystem
+from banking_system.level3.model_solution.banking import BankingSystem, BankStorage, FraudRule, ShardedBankingSystem
 
 class TestBankingLevel3:
     def test_interest_calculation(self):
@@ -47,3 +52,569 @@ class TestBankingLevel3:
         result = bank.withdraw("user1", 200)
         assert result == True
         assert bank.get_balance("user1") == 800
+
+
+class TestTransactionLedger:
+    def test_history_rows_behave_like_dicts(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 1000)
+        bank.deposit(acc, 250, "salary")
+        
+        history = bank.get_transaction_history(acc)
+        assert len(history) == 2
+        assert history[-1]['type'] == 'deposit'
+        assert history[-1]['amount'] == 250
+        assert history[-1]['description'] == 'Deposit of $250.00'
+        assert history[-1].get('overdraft_fee', 0) == 0
+        assert dict(history[0]) == {
+            'type': 'deposit', 'amount': 1000, 'timestamp': history[0]['timestamp'],
+            'description': 'Initial deposit', 'category': 'initial'
+        }
+    
+    def test_query_results_are_plain_data(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 0)
+        assert bank.get_transaction_history(acc) == []
+        
+        bank.deposit(acc, 25, "salary")
+        for result in (bank.get_transaction_history(acc), bank.get_transaction_history(acc, "salary"),
+                       bank.search_transactions(acc, "deposit"),
+                       bank.get_transactions_in_timerange(acc, 0, float('inf'))):
+            assert len(result) == 1
+            assert type(result) is list and all(type(t) is dict for t in result)
+            assert json.loads(json.dumps(result)) == result
+            result[0]['amount'] = 1000  # The caller owns the copy
+        assert bank.get_transaction_history(acc)[0]['amount'] == 25
+    
+    def test_overdraft_fee_recorded_on_row(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 100)
+        
+        assert bank.withdraw(acc, 300) == True
+        row = bank.get_transaction_history(acc)[-1]
+        assert row['overdraft_fee'] == 35.0
+        assert row['description'] == 'Withdrawal of $300.00 (Overdraft fee: $35.00)'
+        assert bank.search_transactions(acc, "overdraft fee") == [row]
+        
+    def test_transfer_rewrites_descriptions(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 1000)
+        acc2 = bank.create_account("bob", "savings", 0)
+        
+        assert bank.transfer_funds(acc1, acc2, 200, "Rent") == True
+        assert bank.get_transaction_history(acc1)[-1]['description'] == f"Transfer to {acc2}: Rent"
+        assert bank.get_transaction_history(acc2)[-1]['description'] == f"Transfer from {acc1}: Rent"
+        assert len(bank.search_transactions(acc2, "rent")) == 1
+    
+    def test_search_index_follows_description_rewrites(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 1000)
+        acc2 = bank.create_account("bob", "savings", 0)
+        bank.deposit(acc1, 120)
+        bank.transfer_funds(acc1, acc2, 200, "Rent")
+        bank.withdraw(acc1, 1200)
+        
+        assert [t['amount'] for t in bank.search_transactions(acc1, "de")] == [1000, 120]
+        assert [t['amount'] for t in bank.search_transactions(acc1, "RENT")] == [200]
+        assert [t['amount'] for t in bank.search_transactions(acc1, "fee: $35")] == [1200]
+        
+        history = bank.transactions.history(acc1)
+        history[2]['description'] = "Landlord"
+        history[1]['amount'] = 130
+        assert bank.search_transactions(acc1, "rent") == []
+        assert [t['amount'] for t in bank.search_transactions(acc1, "landlord")] == [200]
+        assert bank.search_transactions(acc1, "$120.00") == []
+        assert [t['amount'] for t in bank.search_transactions(acc1, "$130.00")] == [130]
+    
+    def test_search_index_does_not_grow_with_amounts(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 0)
+        for i in range(500):
+            bank.deposit(acc, 1 + i / 100)
+        bank.withdraw(acc, 2000)  # Into the overdraft
+        
+        assert len(bank.transactions.text_index.texts) == 1  # Only the default-description marker
+        assert len(bank.search_transactions(acc, "deposit of")) == 500
+        assert [t['amount'] for t in bank.search_transactions(acc, "$1.25")] == [1.25]
+        assert [t['amount'] for t in bank.search_transactions(acc, "overdraft fee")] == [2000]
+    
+    def test_category_filter_and_summary_totals(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 1000)
+        bank.deposit(acc, 100, "salary")
+        bank.deposit(acc, 50, "salary")
+        bank.withdraw(acc, 30, "groceries")
+        
+        assert [t['amount'] for t in bank.get_transaction_history(acc, "salary")] == [100, 50]
+        assert bank.get_transaction_history(acc, "unknown") == []
+        
+        summary = bank.get_account_summary(acc)
+        assert summary['total_deposits'] == 1150
+        assert summary['total_withdrawals'] == 30
+        assert summary['transaction_count'] == 4
+        assert summary['category_totals'] == {'initial': 1000, 'salary': 150, 'groceries': 30}
+    
+    def test_category_index_and_totals_follow_rewrites(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 1000)
+        bank.deposit(acc, 100, "salary")
+        bank.deposit(acc, 40, "refund")
+        bank.deposit(acc, 60, "salary")
+        
+        bank.transactions.history(acc)[1]['category'] = "bonus"
+        bank.transactions.with_category(acc, "salary")[0]['amount'] = 70
+        
+        assert [t['amount'] for t in bank.get_transaction_history(acc, "salary")] == [70]
+        assert [t['amount'] for t in bank.get_transaction_history(acc, "bonus")] == [100]
+        summary = bank.get_account_summary(acc)
+        assert summary['total_deposits'] == 1210
+        assert summary['category_totals'] == {'initial': 1000, 'salary': 70, 'refund': 40, 'bonus': 100}
+    
+    def test_timerange_bisects_in_order_history(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 0)
+        for day in range(100):
+            bank.deposit(acc, day + 1, timestamp=day * 86400)
+        
+        week = bank.get_transactions_in_timerange(acc, 7 * 86400, 13 * 86400)
+        assert [t['amount'] for t in week] == [8, 9, 10, 11, 12, 13, 14]
+        assert bank.get_transactions_in_timerange(acc, 13 * 86400, 7 * 86400) == []
+    
+    def test_backdated_transactions_in_timerange_and_fraud_window(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 20000)
+        now = time.time()
+        bank.withdraw(acc, 6000, timestamp=now - 7200)
+        assert "large_withdrawals" not in bank.detect_suspicious_activity(acc)
+        
+        # Back-dated into the last hour, behind the initial deposit
+        bank.withdraw(acc, 100, timestamp=now - 1800)
+        bank.withdraw(acc, 5500, timestamp=now - 600)
+        assert "large_withdrawals" in bank.detect_suspicious_activity(acc)
+        
+        recent = bank.get_transactions_in_timerange(acc, now - 3600, now + 60)
+        assert [t['amount'] for t in recent] == [100, 5500, 20000]
+
+
+class TestFraudEngine:
+    def test_flags_raised_incrementally_with_events(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 50000)
+        events = []
+        bank.fraud_engine.subscribe(events.append)
+        
+        bank.withdraw(acc, 6000)
+        assert bank.detect_suspicious_activity(acc) == ["large_withdrawals"]
+        bank.withdraw(acc, 7000)
+        
+        # One event per flag raised, not per matching transaction
+        assert [(e['account_number'], e['flag']) for e in events] == [(acc, "large_withdrawals")]
+        
+        for _ in range(9):
+            bank.deposit(acc, 10)
+        assert bank.detect_suspicious_activity(acc) == ["high_frequency", "large_withdrawals"]
+        assert events[-1]['flag'] == "high_frequency"
+        assert events[-1]['count'] == 11
+    
+    def test_old_transactions_leave_the_window(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 50000)
+        bank.withdraw(acc, 6000, timestamp=time.time() - 7200)
+        
+        assert bank.detect_suspicious_activity(acc) == []
+        assert bank.detect_suspicious_activity(acc, time_window=86400) == ["large_withdrawals"]
+    
+    def test_screen_accounts(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 50000)
+        acc2 = bank.create_account("bob", "checking", 0)
+        bank.create_account("carol", "savings", 100)
+        bank.withdraw(acc1, 6000)
+        for _ in range(3):
+            assert bank.withdraw(acc2, 50) == True
+        
+        assert bank.screen_accounts() == {acc1: ["large_withdrawals"], acc2: ["multiple_overdrafts"]}
+        assert bank.get_account_summary(acc2)['suspicious_flags'] == ["multiple_overdrafts"]
+    
+    def test_custom_rule_replays_recent_transactions(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", "checking", 1000)
+        bank.transfer_funds(acc, bank.create_account("bob", "savings", 0), 100)
+        bank.transfer_funds(acc, bank.create_account("carol", "savings", 0), 100)
+        
+        bank.add_fraud_rule(FraudRule("transfer_burst", lambda t: t['category'] == 'transfer_out', threshold=1))
+        assert bank.detect_suspicious_activity(acc) == ["transfer_burst"]
+
+
+class TestTransferBatch:
+    def test_batch_nets_balances_and_writes_rows(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 100)
+        acc2 = bank.create_account("bob", "checking", 0)
+        transfers = [
+            {'from_account': acc1, 'to_account': acc2, 'amount': 150, 'description': "Rent"},
+            {'from_account': acc2, 'to_account': acc1, 'amount': 100},
+        ]
+        
+        assert bank.transfer_batch(transfers) == {'transferred': 2, 'failed': []}
+        # 100 - 150 dips into the overdraft once: one $35 fee
+        assert bank.get_balance(acc1) == 100 - 150 - 35 + 100
+        assert bank.get_balance(acc2) == 50
+        assert bank.get_account_summary(acc1)['overdraft_fees'] == 35.0
+        
+        sent = bank.get_transaction_history(acc1, "transfer_out")
+        assert [(t['amount'], t['overdraft_fee'], t['description']) for t in sent] == [
+            (150, 35.0, f"Transfer to {acc2}: Rent")
+        ]
+        assert bank.get_transaction_history(acc2, "transfer_in")[0]['description'] == f"Transfer from {acc1}: Rent"
+    
+    def test_atomic_batch_writes_nothing_on_failure(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 100)
+        acc2 = bank.create_account("bob", "checking", 0)
+        transfers = [
+            {'from_account': acc1, 'to_account': acc2, 'amount': 50},
+            {'from_account': acc1, 'to_account': acc2, 'amount': 1000},
+            {'from_account': acc1, 'to_account': "missing", 'amount': 10},
+            {'from_account': acc1, 'to_account': acc2, 'amount': -5},
+        ]
+        
+        result = bank.transfer_batch(transfers)
+        assert result == {'transferred': 0, 'failed': [
+            {'index': 1, 'reason': 'insufficient_funds'},
+            {'index': 2, 'reason': 'invalid_account'},
+            {'index': 3, 'reason': 'invalid_amount'},
+        ]}
+        assert bank.get_balance(acc1) == 100
+        assert len(bank.get_transaction_history(acc1)) == 1
+        assert len(bank.get_transaction_history(acc2)) == 0
+    
+    def test_non_atomic_batch_applies_valid_items(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 100)
+        acc2 = bank.create_account("bob", "checking", 0)
+        acc3 = bank.create_account("carol", "savings", 0)
+        bank.freeze_account(acc3)
+        transfers = [
+            {'from_account': acc1, 'to_account': acc3, 'amount': 10},
+            {'from_account': acc1, 'to_account': acc2, 'amount': 60},
+            {'from_account': acc1, 'to_account': acc2, 'amount': 60},
+        ]
+        
+        result = bank.transfer_batch(transfers, atomic=False)
+        assert result == {'transferred': 2, 'failed': [{'index': 0, 'reason': 'frozen'}]}
+        assert bank.get_balance(acc1) == 100 - 120 - 35
+        assert bank.get_balance(acc2) == 120
+        assert bank.get_balance(acc3) == 0
+        # Rejected items leave no rows behind, not even a rollback
+        assert [t['category'] for t in bank.get_transaction_history(acc1)] == [
+            'initial', 'transfer_out', 'transfer_out'
+        ]
+
+
+class TestScheduledTransfers:
+    def test_only_due_transfers_are_processed_and_archived(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 1000)
+        acc2 = bank.create_account("bob", "savings", 0)
+        now = time.time()
+        
+        later = bank.schedule_transfer(acc1, acc2, 100, now + 3600)
+        due = bank.schedule_transfer(acc1, acc2, 200, now - 10, "Rent")
+        failing = bank.schedule_transfer(acc1, "missing", 50, now - 5)
+        assert (later, due, failing) == (0, 1, 2)
+        
+        assert bank.process_scheduled_transfers() == 1
+        assert bank.get_balance(acc2) == 200
+        assert bank.get_scheduled_transfer(due)['status'] == 'completed'
+        assert bank.get_scheduled_transfer(failing)['status'] == 'failed'
+        assert bank.get_scheduled_transfer(later)['status'] == 'pending'
+        assert set(bank.transfer_archive) == {due, failing}
+        assert list(bank.scheduled_transfers) == [later]
+        
+        # Archived transfers are never revisited
+        assert bank.process_scheduled_transfers() == 0
+        assert bank.get_balance(acc2) == 200
+    
+    def test_background_thread_scheduler(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 1000)
+        acc2 = bank.create_account("bob", "savings", 0)
+        bank.schedule_transfer(acc1, acc2, 100, time.time() + 0.05)
+        
+        assert bank.start_scheduler(interval=0.01) == True
+        assert bank.start_scheduler() == False
+        deadline = time.time() + 5
+        while bank.get_balance(acc2) == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert bank.stop_scheduler() == True
+        
+        assert bank.get_balance(acc2) == 100
+        assert bank.stop_scheduler() == False
+    
+    def test_asyncio_scheduler(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 1000)
+        acc2 = bank.create_account("bob", "savings", 0)
+        bank.schedule_transfer(acc1, acc2, 100, time.time() + 0.05)
+        
+        async def run_briefly():
+            task = asyncio.create_task(bank.run_scheduler(interval=0.01))
+            await asyncio.sleep(0.2)
+            task.cancel()
+        
+        asyncio.run(run_briefly())
+        assert bank.get_balance(acc2) == 100
+
+
+class TestThreadSafety:
+    def test_concurrent_transfers_conserve_money(self):
+        bank = BankingSystem(thread_safe=True)
+        accounts = [bank.create_account(f"customer{i}", "checking", 100) for i in range(10)]
+        
+        def hammer(seed):
+            rng = random.Random(seed)
+            for _ in range(2000):
+                from_account, to_account = rng.sample(accounts, 2)
+                bank.transfer_funds(from_account, to_account, rng.choice([10, 50, 120]))
+        
+        # Switch threads as often as possible to expose check-then-act races
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=hammer, args=(seed,)) for seed in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=60)
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert not any(thread.is_alive() for thread in threads)  # No deadlock
+        
+        # Money only leaves the system as overdraft fees
+        balances = sum(bank.get_balance(account) for account in accounts)
+        assert balances + sum(bank.overdraft_fees.values()) == 1000
+        for account in accounts:
+            summary = bank.get_account_summary(account)
+            assert summary['current_balance'] >= -summary['overdraft_limit'] - 35.0
+            assert summary['current_balance'] == pytest.approx(
+                summary['total_deposits'] - summary['total_withdrawals'] - summary['overdraft_fees']
+            )
+    
+    def test_readers_see_consistent_history_during_writes(self):
+        bank = BankingSystem(thread_safe=True)
+        acc1 = bank.create_account("alice", "checking", 100)
+        acc2 = bank.create_account("bob", "savings", 10000)
+        start = time.time()
+        errors = []
+        
+        def write():
+            for i in range(3000):
+                if i % 2:
+                    bank.transfer_funds(acc2, acc1, 1, "Salary bonus")
+                else:
+                    bank.deposit(acc1, 1)
+        
+        def read():
+            try:
+                while writer.is_alive():
+                    for transaction in bank.get_transactions_in_timerange(acc1, start - 0.0005, start + 60):
+                        assert transaction['amount'] in (100, 1)
+                    bank.search_transactions(acc1, "bonus")
+                    bank.get_transaction_history(acc1)
+            except Exception as e:
+                errors.append(e)
+        
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            writer = threading.Thread(target=write)
+            readers = [threading.Thread(target=read) for _ in range(3)]
+            writer.start()
+            for reader in readers:
+                reader.start()
+            for thread in [writer] + readers:
+                thread.join(timeout=60)
+        finally:
+            sys.setswitchinterval(switch_interval)
+        
+        assert errors == []
+        assert len(bank.get_transactions_in_timerange(acc1, start - 0.0005, start + 60)) == 3001
+        assert len(bank.search_transactions(acc1, "bonus")) == 1500
+    
+    def test_independent_accounts_do_not_block_each_other(self):
+        bank = BankingSystem(thread_safe=True)
+        acc1 = bank.create_account("alice", "checking", 100)
+        acc2 = bank.create_account("bob", "checking", 100)
+        while bank.account_locks.stripes_for([acc1]) == bank.account_locks.stripes_for([acc2]):
+            acc2 = bank.create_account("bob", "checking", 100)
+        
+        with bank._locked(acc1):
+            other = threading.Thread(target=bank.deposit, args=(acc2, 50))
+            other.start()
+            other.join(timeout=5)
+            assert not other.is_alive()
+            assert bank.get_balance(acc2) == 150
+
+
+class TestPersistence:
+    def build_bank(self, storage):
+        bank = BankingSystem(storage=storage)
+        acc1 = bank.create_account("alice", "checking", 100)
+        acc2 = bank.create_account("bob", "savings", 0)
+        bank.deposit(acc1, 50, "salary")
+        bank.withdraw(acc1, 200)  # Overdraft fee
+        bank.transfer_batch([
+            {'from_account': acc1, 'to_account': acc2, 'amount': 40, 'description': "Rent"},
+            {'from_account': acc2, 'to_account': acc1, 'amount': 10}
+        ])
+        bank.freeze_account(acc2)
+        return bank, acc1, acc2
+    
+    def test_recovery_replays_the_log(self, tmp_path):
+        bank, acc1, acc2 = self.build_bank(BankStorage(tmp_path))
+        bank.close()
+        
+        recovered = BankingSystem(storage=BankStorage(tmp_path))
+        for account in (acc1, acc2):
+            assert recovered.get_account_summary(account) == bank.get_account_summary(account)
+            assert [dict(t) for t in recovered.get_transaction_history(account)] == \
+                [dict(t) for t in bank.get_transaction_history(account)]
+        assert recovered.create_account("carol") == "1000003"
+        assert recovered.deposit(acc2, 10) == False  # Still frozen
+    
+    def test_snapshot_then_log(self, tmp_path):
+        bank, acc1, acc2 = self.build_bank(BankStorage(tmp_path, snapshot_every=3))
+        bank.deposit(acc1, 5)
+        assert (tmp_path / "snapshot.pkl").exists()
+        bank.close()
+        
+        recovered = BankingSystem(storage=BankStorage(tmp_path))
+        assert recovered.get_balance(acc1) == bank.get_balance(acc1)
+        assert recovered.get_account_summary(acc1)['transaction_count'] == 6
+        
+        # A crash between writing the snapshot and resetting the log must not apply records twice
+        recovered.checkpoint()
+        recovered.deposit(acc1, 1)
+        recovered.close()
+        stale_log = (tmp_path / "wal.log").read_bytes()
+        again = BankingSystem(storage=BankStorage(tmp_path))
+        again.checkpoint()
+        again.close()
+        (tmp_path / "wal.log").write_bytes(stale_log)
+        assert BankingSystem(storage=BankStorage(tmp_path)).get_balance(acc1) == bank.get_balance(acc1) + 1
+    
+    def test_torn_final_record_is_discarded(self, tmp_path):
+        bank, acc1, _ = self.build_bank(BankStorage(tmp_path))
+        bank.close()
+        with open(tmp_path / "wal.log", "a") as wal:
+            wal.write('[99,"transactions",[["')
+        
+        recovered = BankingSystem(storage=BankStorage(tmp_path))
+        assert recovered.get_balance(acc1) == bank.get_balance(acc1)
+        recovered.deposit(acc1, 25)
+        recovered.close()
+        assert BankingSystem(storage=BankStorage(tmp_path)).get_balance(acc1) == bank.get_balance(acc1) + 25
+    
+    def test_idle_group_is_synced_after_the_interval(self, tmp_path, monkeypatch):
+        synced = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+        storage = BankStorage(tmp_path, group_size=1000, group_interval=0.2)
+        bank = BankingSystem(storage=storage)
+        acc1 = bank.create_account("alice", "checking", 100)
+        bank.deposit(acc1, 50)
+        assert storage.unsynced > 0
+        synced.clear()
+        
+        # No further writes: the timer alone must make the group durable
+        deadline = time.monotonic() + 5
+        while storage.unsynced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert storage.unsynced == 0
+        assert synced
+        assert BankingSystem(storage=BankStorage(tmp_path)).get_balance(acc1) == 150
+        bank.close()
+
+
+class TestSharding:
+    def test_two_phase_halves_on_one_bank(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", "checking", 100)
+        
+        assert bank.prepare_transfer_out(1, acc1, "2000001", 150) is None  # Uses the overdraft
+        assert bank.get_balance(acc1) == 100 - 150 - 35  # Reserved, not yet in the ledger
+        assert bank.withdraw(acc1, 500) == False
+        assert bank.get_account_summary(acc1)['transaction_count'] == 1
+        
+        assert bank.abort_transfer(1) == True
+        assert bank.get_balance(acc1) == 100
+        assert bank.abort_transfer(1) == False
+        assert bank.commit_transfer(1) == False
+        
+        assert bank.prepare_transfer_out(2, acc1, "2000001", 60) is None
+        assert bank.commit_transfer(2) == True
+        assert bank.get_balance(acc1) == 40
+        assert bank.get_transaction_history(acc1)[-1]['category'] == "transfer_out"
+        assert bank.prepare_transfer_out(3, acc1, "2000001", 1000) == "insufficient_funds"
+        assert bank.prepare_transfer_in(4, "2000001", acc1, 10) == "invalid_account"
+    
+    def test_routing_and_cross_shard_transfers(self):
+        with ShardedBankingSystem(shards=3) as bank:
+            accounts = [bank.create_account(f"customer{i}", "savings", 100) for i in range(6)]
+            assert len({bank.shard_of(account) for account in accounts}) == 3
+            assert sorted(account['account_number'] for account in bank.list_all_accounts()) == accounts
+            
+            acc1, acc2, acc3 = accounts[:3]
+            assert bank.deposit(acc1, 50) == True
+            assert bank.transfer_funds(acc1, acc2, 120, "Rent") == True
+            assert bank.get_balance(acc1) == 30
+            assert bank.get_balance(acc2) == 220
+            assert bank.get_transaction_history(acc2)[-1]['description'] == f"Transfer from {acc1}: Rent"
+            
+            # A refused half aborts the other, leaving both balances as they were
+            assert bank.transfer_funds(acc1, acc2, 500) == False
+            bank.freeze_account(acc3)
+            assert bank.transfer_funds(acc2, acc3, 10) == False
+            assert bank.get_balance(acc2) == 220
+            assert bank.transfer_funds(acc2, "9999999", 10) == False
+            assert sum(bank.get_balance(account) for account in accounts) == 650
+    
+    def test_execute_batches_operations_per_shard(self):
+        with ShardedBankingSystem(shards=2) as bank:
+            created = bank.execute([("create_account", "alice", "savings", 100), ("create_account", "bob", "savings", 100)])
+            acc1, acc2 = created
+            assert bank.shard_of(acc1) != bank.shard_of(acc2)
+            
+            results = bank.execute([
+                ("deposit", acc1, 25),
+                ("transfer_funds", acc1, acc2, 75),
+                ("get_balance", acc1),
+                ("withdraw", acc2, 1000),
+                ("transfer_batch", []),
+            ])
+            assert results[:4] == [True, True, 50, False]  # Same outcome as running them one by one
+            assert isinstance(results[4], AttributeError)
+            assert bank.get_balance(acc1) == 50
+            assert bank.get_balance(acc2) == 175
+
+
+class TestAccountRecords:
+    def test_accounts_serialize_to_the_same_dict_shape(self, tmp_path):
+        bank = BankingSystem(storage=BankStorage(tmp_path))
+        acc1 = bank.create_account("alice", "checking", 100)
+        bank.withdraw(acc1, 150)
+        
+        account = bank.get_account(acc1)
+        assert list(account) == ['account_number', 'customer_name', 'account_type', 'balance', 'created_at',
+                                 'overdraft_limit']
+        assert account['balance'] == 100 - 150 - 35
+        assert account['overdraft_limit'] == 500.0
+        assert bank.list_all_accounts() == [account]
+        
+        # Changing the returned dict does not change the account
+        account['balance'] = 10**6
+        assert bank.get_balance(acc1) == -85
+        
+        bank.close()
+        assert BankingSystem(storage=BankStorage(tmp_path)).get_account(acc1) == bank.get_account(acc1)
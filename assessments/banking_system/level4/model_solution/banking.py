@@ -4,8 +4,512 @@ Investment accounts, loans, credit scoring, and premium features.
 """
 
 import time
-import random
-from collections import defaultdict
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import compress
+from operator import add, attrgetter, sub
+
+
+# Descriptions in these formats are rebuilt from the amount instead of stored
+DEFAULT_DESCRIPTIONS = {
+    'deposit': 'Deposit of ${:.2f}',
+    'withdrawal': 'Withdrawal of ${:.2f}',
+}
+
+# Monthly fee by account type; premium accounts pay nothing
+MONTHLY_FEES = {
+    'checking': 10,
+    'savings': 5,
+}
+DEFAULT_MONTHLY_FEE = 15
+
+# Credit scores: a base score moved up or down by each feature, then clamped
+CREDIT_SCORE_BASE = 600
+CREDIT_SCORE_MIN = 300
+CREDIT_SCORE_MAX = 850
+LOAN_MIN_CREDIT_SCORE = 650
+LOAN_ANNUAL_RATE = 0.06
+
+
+class StringTable:
+    """Interns strings as small integer codes."""
+    
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+    
+    def code(self, value):
+        """Get the code for a string, interning it on first use."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+class TransactionRow(Mapping):
+    """Read-through dict view of one ledger row."""
+    
+    __slots__ = ('columns', 'row')
+    
+    def __init__(self, columns, row):
+        self.columns = columns
+        self.row = row
+    
+    def __getitem__(self, key):
+        return self.columns.read(self.row, key)
+    
+    def __iter__(self):
+        return iter(('type', 'amount', 'timestamp', 'description'))
+    
+    def __len__(self):
+        return 4
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AccountColumns(Sequence):
+    """
+    One account's transactions, one typed array per field.
+    
+    Behaves as a live, read-only sequence of TransactionRow views, oldest first.
+    """
+    
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.timestamps = array('d')
+        self.amounts = array('d')
+        self.type_codes = array('B')
+        self.description_codes = array('I')  # 0 -> default description for the type
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TransactionRow(self, row) for row in range(len(self.timestamps))[index]]
+        if index < 0:
+            index += len(self.timestamps)
+        if not 0 <= index < len(self.timestamps):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+    
+    def __iter__(self):
+        for row in range(len(self.timestamps)):
+            yield TransactionRow(self, row)
+    
+    def __len__(self):
+        return len(self.timestamps)
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def append(self, transaction_type, amount, description, timestamp):
+        ledger = self.ledger
+        self.timestamps.append(timestamp)
+        self.amounts.append(amount)
+        self.type_codes.append(ledger.types.code(transaction_type))
+        self.description_codes.append(ledger.descriptions.code(description))
+        return TransactionRow(self, len(self.timestamps) - 1)
+    
+    def read(self, row, key):
+        """Read one field of a row."""
+        ledger = self.ledger
+        if key == 'type':
+            return ledger.types.values[self.type_codes[row]]
+        if key == 'amount':
+            return self.amounts[row]
+        if key == 'timestamp':
+            return self.timestamps[row]
+        if key == 'description':
+            return self.description(row)
+        raise KeyError(key)
+    
+    def description(self, row):
+        """The stored description of a row, or its default one rebuilt from the amount."""
+        ledger = self.ledger
+        description = ledger.descriptions.values[self.description_codes[row]]
+        if description is not None:
+            return description
+        
+        return DEFAULT_DESCRIPTIONS[ledger.types.values[self.type_codes[row]]].format(self.amounts[row])
+
+
+class TransactionLedger:
+    """
+    Append-only, column-oriented transaction store.
+    
+    Each account's transactions live in typed arrays (AccountColumns) rather
+    than one dict per transaction; types and descriptions are
+    interned as integer codes in tables shared by all accounts, and
+    descriptions in a default format are not stored at all.
+    """
+    
+    def __init__(self):
+        self.types = StringTable()
+        self.descriptions = StringTable()
+        self.descriptions.code(None)
+        self.accounts = {}  # account_number -> AccountColumns
+    
+    def append(self, account_number, transaction_type, amount, description=None, timestamp=None):
+        """Record a transaction and return a view of its row."""
+        columns = self.accounts.get(account_number)
+        if columns is None:
+            columns = self.accounts[account_number] = AccountColumns(self)
+        if timestamp is None:
+            timestamp = time.time()
+        return columns.append(transaction_type, amount, description, timestamp)
+    
+    def history(self, account_number):
+        """All of an account's transactions, oldest first."""
+        columns = self.accounts.get(account_number)
+        return columns if columns is not None else AccountColumns(self)
+    
+    def count(self, account_number):
+        """Number of transactions recorded for an account."""
+        columns = self.accounts.get(account_number)
+        return len(columns) if columns is not None else 0
+    
+    def total(self, account_number, transaction_type):
+        """Sum of an account's amounts for one transaction type."""
+        columns = self.accounts.get(account_number)
+        code = self.types.codes.get(transaction_type)
+        if columns is None or code is None:
+            return 0.0
+        return sum(compress(columns.amounts, map(code.__eq__, columns.type_codes)))
+    
+    def post(self, account_numbers, transaction_type, amounts, description, timestamp):
+        """
+        Append one row per account, all sharing a type, description and timestamp.
+        
+        The bulk path for batch jobs: the type and description are interned
+        once for the whole batch rather than once per row. Returns the number
+        of rows posted.
+        """
+        type_code = self.types.code(transaction_type)
+        description_code = self.descriptions.code(description)
+        posted = 0
+        for account_number, amount in zip(account_numbers, amounts):
+            columns = self.accounts.get(account_number)
+            if columns is None:
+                columns = self.accounts[account_number] = AccountColumns(self)
+            columns.timestamps.append(timestamp)
+            columns.amounts.append(amount)
+            columns.type_codes.append(type_code)
+            columns.description_codes.append(description_code)
+            posted += 1
+        return posted
+
+
+class Portfolio:
+    """One account's open investment lots, oldest first, one typed array per field."""
+    
+    def __init__(self):
+        self.ids = array('Q')
+        self.type_codes = array('B')
+        self.amounts = array('d')  # amount still invested in each lot
+        self.timestamps = array('d')
+        self.head = 0  # lots before head are fully withdrawn
+        self.total = 0.0
+    
+    def compact(self):
+        """Drop withdrawn lots once they make up most of the arrays."""
+        if self.head > 64 and self.head * 2 > len(self.ids):
+            for column in (self.ids, self.type_codes, self.amounts, self.timestamps):
+                del column[:self.head]
+            self.head = 0
+
+
+class PositionBook:
+    """
+    Investment positions for every account, held as FIFO lots.
+    
+    Each account keeps a running total, so balance reads are O(1).
+    Withdrawals consume the oldest lots first, reducing the last one
+    partially, and cost O(lots consumed). Investment IDs come from a single
+    counter and are never reused.
+    """
+    
+    def __init__(self):
+        self.types = StringTable()
+        self.portfolios = {}  # account_number -> Portfolio
+        self.next_id = 1
+    
+    def open(self, account_number, investment_type, amount, timestamp):
+        """Add a lot to an account's portfolio and return its investment ID."""
+        portfolio = self.portfolios.get(account_number)
+        if portfolio is None:
+            portfolio = self.portfolios[account_number] = Portfolio()
+        
+        lot_id = self.next_id
+        self.next_id += 1
+        portfolio.ids.append(lot_id)
+        portfolio.type_codes.append(self.types.code(investment_type))
+        portfolio.amounts.append(amount)
+        portfolio.timestamps.append(timestamp)
+        portfolio.total += amount
+        return f"inv_{lot_id}"
+    
+    def balance(self, account_number):
+        portfolio = self.portfolios.get(account_number)
+        return portfolio.total if portfolio is not None else 0
+    
+    def withdraw(self, account_number, amount):
+        """Take amount out of the oldest lots first; False (and no change) if the portfolio is too small."""
+        portfolio = self.portfolios.get(account_number)
+        if portfolio is None or portfolio.total < amount:
+            return False
+        
+        amounts = portfolio.amounts
+        remaining = amount
+        while remaining > 0 and portfolio.head < len(amounts):
+            lot_amount = amounts[portfolio.head]
+            if lot_amount > remaining:
+                amounts[portfolio.head] = lot_amount - remaining
+                break
+            remaining -= lot_amount
+            portfolio.head += 1
+        
+        if portfolio.head == len(amounts):
+            portfolio.total = 0.0  # Nothing left; do not carry rounding error forward
+        else:
+            portfolio.total -= amount
+        portfolio.compact()
+        return True
+    
+    def positions(self, account_number):
+        """An account's open lots, oldest first."""
+        portfolio = self.portfolios.get(account_number)
+        if portfolio is None:
+            return []
+        types = self.types.values
+        return [
+            {
+                'investment_id': f"inv_{portfolio.ids[lot]}",
+                'type': types[portfolio.type_codes[lot]],
+                'amount': portfolio.amounts[lot],
+                'timestamp': portfolio.timestamps[lot]
+            }
+            for lot in range(portfolio.head, len(portfolio.ids))
+        ]
+
+
+def credit_score(balance, payment_total, debt, declined, age_days):
+    """
+    Deterministic credit score from an account's aggregates.
+    
+    Balance (up to +100 at $10,000), payments made (up to +100 at $5,000)
+    and account age (up to +50 at 50 weeks) raise the score; loan
+    utilization (up to -200) and declined withdrawals (-30 each, up to
+    -150) lower it.
+    """
+    utilization = debt / (debt + balance) if debt > 0 else 0.0
+    score = (CREDIT_SCORE_BASE
+             + min(100.0, balance / 100)
+             + min(100.0, payment_total / 50)
+             + min(50.0, age_days / 7)
+             - 200 * utilization
+             - min(150, 30 * declined))
+    return max(CREDIT_SCORE_MIN, min(CREDIT_SCORE_MAX, round(score)))
+
+
+class CreditScorer:
+    """
+    Per-account credit features, kept as columns and updated as events arrive.
+    
+    Scoring one account reads its aggregates in O(1), never its history.
+    Balance and age drift between events, so score_all recomputes every
+    account in one pass over the columns (e.g. nightly or at month end).
+    """
+    
+    def __init__(self):
+        self.rows = {}  # account_number -> row in the feature columns
+        self.account_numbers = []
+        self.opened_at = array('d')
+        self.payment_totals = array('d')
+        self.debts = array('d')  # loan amounts granted, less payments made
+        self.declined = array('I')  # withdrawals refused for insufficient funds
+    
+    def open(self, account_number, opened_at):
+        self.rows[account_number] = len(self.account_numbers)
+        self.account_numbers.append(account_number)
+        self.opened_at.append(opened_at)
+        self.payment_totals.append(0.0)
+        self.debts.append(0.0)
+        self.declined.append(0)
+    
+    def record_payment(self, account_number, amount, principal=None):
+        """Count a payment; only its principal part (default: all of it) pays down debt."""
+        row = self.rows[account_number]
+        self.payment_totals[row] += amount
+        self.debts[row] = max(0.0, self.debts[row] - (amount if principal is None else principal))
+    
+    def record_loan(self, account_number, amount):
+        self.debts[self.rows[account_number]] += amount
+    
+    def record_declined(self, account_number):
+        self.declined[self.rows[account_number]] += 1
+    
+    def score(self, account_number, balance, now=None):
+        """Score one account from its current aggregates."""
+        if now is None:
+            now = time.time()
+        row = self.rows[account_number]
+        age_days = (now - self.opened_at[row]) / 86400
+        return credit_score(balance, self.payment_totals[row], self.debts[row], self.declined[row], age_days)
+    
+    def score_all(self, balances, now=None):
+        """Scores for every account, in account_numbers order; balances must be in the same order."""
+        if now is None:
+            now = time.time()
+        ages = [(now - opened_at) / 86400 for opened_at in self.opened_at]
+        return list(map(credit_score, balances, self.payment_totals, self.debts, self.declined, ages))
+
+
+def amortize(remaining, monthly_rate, installment, months_left):
+    """
+    One month of a loan: (payment, principal, interest, remaining after).
+    
+    Interest is charged on the remaining principal and the rest of the
+    installment repays principal; the final month pays off whatever is
+    left, absorbing any rounding.
+    """
+    interest = round(remaining * monthly_rate, 2)
+    if months_left <= 1 or installment - interest >= remaining:
+        return round(remaining + interest, 2), remaining, interest, 0.0
+    principal = round(installment - interest, 2)
+    return installment, principal, interest, round(remaining - principal, 2)
+
+
+class LoanBook:
+    """
+    Active loans as columns: one row per loan, stepped forward one month at a time.
+    
+    The installment is fixed when a loan is approved, so each month costs
+    one amortize() step per loan and a schedule is never rebuilt from the
+    start. Paid-off loans are swapped out of the columns, so a month-end
+    pass only touches loans that still owe something.
+    """
+    
+    def __init__(self):
+        self.rows = {}  # loan_id -> row in the columns
+        self.by_account = {}  # account_number -> its active loan_ids, oldest first
+        self.loan_ids = []
+        self.account_numbers = []
+        self.remaining = array('d')  # principal still owed
+        self.monthly_rates = array('d')
+        self.installments = array('d')
+        self.months_left = array('I')
+        self.missed = array('I')  # installments the linked account could not cover
+    
+    def __len__(self):
+        return len(self.loan_ids)
+    
+    def open(self, loan_id, account_number, principal, annual_rate, months):
+        """Start amortizing a loan; returns its fixed monthly installment."""
+        if principal <= 0 or months < 1:
+            raise ValueError("a loan needs a positive principal and at least one month")
+        
+        # Everything is computed before any column is touched, so a failure leaves the book unchanged
+        monthly_rate = annual_rate / 12
+        if monthly_rate:
+            installment = round(principal * monthly_rate / (1 - (1 + monthly_rate) ** -months), 2)
+        else:
+            installment = round(principal / months, 2)
+        row = len(self.loan_ids)
+        
+        self.rows[loan_id] = row
+        self.by_account.setdefault(account_number, []).append(loan_id)
+        self.loan_ids.append(loan_id)
+        self.account_numbers.append(account_number)
+        self.remaining.append(principal)
+        self.monthly_rates.append(monthly_rate)
+        self.installments.append(installment)
+        self.months_left.append(months)
+        self.missed.append(0)
+        return installment
+    
+    def balance(self, loan_id):
+        row = self.rows.get(loan_id)
+        return self.remaining[row] if row is not None else 0.0
+    
+    def prepay(self, account_number, amount):
+        """
+        Pay up to amount off an account's loans, oldest first.
+        
+        Only the principal goes down: installments stay fixed, so a prepaid
+        loan finishes sooner. Returns the amount applied and the rows of the
+        loans it paid off (still to be closed).
+        """
+        applied = 0.0
+        finished = []
+        for loan_id in self.by_account.get(account_number, ()):
+            if applied >= amount:
+                break
+            row = self.rows[loan_id]
+            part = min(amount - applied, self.remaining[row])
+            self.remaining[row] = round(self.remaining[row] - part, 2)
+            applied += part
+            if self.remaining[row] == 0:
+                finished.append(row)
+        return round(applied, 2), finished
+    
+    def schedule(self, loan_id):
+        """Yield the remaining payments of a loan, starting from its current state."""
+        row = self.rows.get(loan_id)
+        if row is None:
+            return
+        remaining = self.remaining[row]
+        monthly_rate = self.monthly_rates[row]
+        installment = self.installments[row]
+        months_left = self.months_left[row]
+        month = 1
+        while remaining > 0:
+            payment, principal, interest, remaining = amortize(remaining, monthly_rate, installment, months_left)
+            yield {
+                'month': month,
+                'payment': payment,
+                'principal': principal,
+                'interest': interest,
+                'remaining': remaining
+            }
+            month += 1
+            months_left -= 1
+    
+    def close(self, rows):
+        """Remove paid-off loans by moving the last row into each freed slot."""
+        columns = (self.loan_ids, self.account_numbers, self.remaining, self.monthly_rates,
+                   self.installments, self.months_left, self.missed)
+        for row in sorted(rows, reverse=True):
+            loan_id = self.loan_ids[row]
+            del self.rows[loan_id]
+            owned = self.by_account[self.account_numbers[row]]
+            owned.remove(loan_id)
+            if not owned:
+                del self.by_account[self.account_numbers[row]]
+            last = len(self.loan_ids) - 1
+            if row != last:
+                for column in columns:
+                    column[row] = column[last]
+                self.rows[self.loan_ids[row]] = row
+            for column in columns:
+                column.pop()
+
+
+class Account:
+    """One account's fields as slots; to_dict() gives the dict shape the API returns."""
+    
+    __slots__ = ('account_number', 'customer_name', 'balance', 'account_type', 'created_at', 'is_premium')
+    
+    def __init__(self, account_number, customer_name, balance, account_type, created_at, is_premium):
+        self.account_number = account_number
+        self.customer_name = customer_name
+        self.balance = balance
+        self.account_type = account_type
+        self.created_at = created_at
+        self.is_premium = is_premium
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class BankingSystem:
@@ -13,11 +517,13 @@ class BankingSystem:
     
     def __init__(self):
         """Initialize the premium banking system."""
-        self.accounts = {}  # account_number -> account_data
-        self.transactions = defaultdict(list)  # account_number -> transaction_list
-        self.investments = defaultdict(dict)  # account_number -> investment_data
+        self.accounts = {}  # account_number -> Account
+        self.transactions = TransactionLedger()
+        self.investments = PositionBook()
         self.loans = {}  # loan_id -> loan_data
+        self.loan_book = LoanBook()
         self.credit_scores = {}  # account_number -> credit_score
+        self.credit_scorer = CreditScorer()
         self.next_account_number = 1000001
         self.next_loan_id = 10001
     
@@ -26,82 +532,65 @@ class BankingSystem:
         account_number = str(self.next_account_number)
         self.next_account_number += 1
         
-        self.accounts[account_number] = {
-            'account_number': account_number,
-            'customer_name': customer_name,
-            'balance': initial_deposit,
-            'account_type': account_type,
-            'created_at': time.time(),
-            'is_premium': account_type in ["premium", "investment"]
-        }
+        account = self.accounts[account_number] = Account(
+            account_number, customer_name, initial_deposit, account_type, time.time(),
+            account_type in ["premium", "investment"]
+        )
         
         if initial_deposit > 0:
-            self.transactions[account_number].append({
-                'type': 'deposit',
-                'amount': initial_deposit,
-                'timestamp': time.time(),
-                'description': 'Initial deposit'
-            })
+            self.transactions.append(account_number, 'deposit', initial_deposit, 'Initial deposit')
         
         # Initialize credit score
-        self.credit_scores[account_number] = random.randint(600, 750)
+        self.credit_scorer.open(account_number, account.created_at)
+        self._rescore(account_number)
         
         return account_number
     
     def invest(self, account_number, amount, investment_type):
         """Invest money in investment account."""
-        if account_number not in self.accounts:
-            return False
-        
-        account = self.accounts[account_number]
-        if account['account_type'] != 'investment':
+        account = self.accounts.get(account_number)
+        if account is None or account.account_type != 'investment':
             return False
         
-        if account['balance'] < amount:
+        if account.balance < amount:
             return False
         
-        account['balance'] -= amount
-        
-        if account_number not in self.investments:
-            self.investments[account_number] = {}
-        
-        investment_id = f"inv_{len(self.investments[account_number]) + 1}"
-        self.investments[account_number][investment_id] = {
-            'type': investment_type,
-            'amount': amount,
-            'timestamp': time.time()
-        }
+        account.balance -= amount
+        self.transactions.append(account_number, 'investment', amount, f"Investment in {investment_type}")
+        self._rescore(account_number)
         
+        self.investments.open(account_number, investment_type, amount, time.time())
         return True
     
     def get_investment_balance(self, account_number):
         """Get total investment balance."""
-        if account_number not in self.investments:
-            return 0
-        
-        total = sum(inv['amount'] for inv in self.investments[account_number].values())
-        return total
+        return self.investments.balance(account_number)
+    
+    def get_investments(self, account_number):
+        """Get open investment lots, oldest first."""
+        return self.investments.positions(account_number)
     
     def withdraw_investment(self, account_number, amount):
-        """Withdraw from investment account."""
-        if account_number not in self.investments:
+        """Withdraw from investments, oldest lots first, into the cash balance."""
+        account = self.accounts.get(account_number)
+        if account is None or amount <= 0:
             return False
         
-        current_balance = self.get_investment_balance(account_number)
-        if current_balance < amount:
+        if not self.investments.withdraw(account_number, amount):
             return False
         
-        # Simple withdrawal - in reality would need more complex logic
-        self.accounts[account_number]['balance'] += amount
+        account.balance += amount
+        self.transactions.append(account_number, 'investment_withdrawal', amount, "Investment withdrawal")
+        self._rescore(account_number)
         return True
     
     def request_loan(self, account_number, amount, months):
         """Request a loan."""
-        if account_number not in self.accounts:
+        if account_number not in self.accounts or amount <= 0 or months < 1:
             return None
         
-        credit_score = self.credit_scores.get(account_number, 600)
-        if credit_score < 650:
+        # Scores are kept fresh as events arrive, so decisioning is a lookup
+        if self.credit_scores[account_number] < LOAN_MIN_CREDIT_SCORE:
             return None
         
         loan_id = str(self.next_loan_id)
@@ -123,26 +612,126 @@ class BankingSystem:
         loan = self.loans.get(loan_id)
         return loan['status'] if loan else None
     
+    def approve_loan(self, loan_id, annual_rate=LOAN_ANNUAL_RATE):
+        """Approve a pending loan: pay out the principal and start its amortization schedule."""
+        loan = self.loans.get(loan_id)
+        if not loan or loan['status'] != 'pending':
+            return False
+        if loan['amount'] <= 0 or loan['months'] < 1:
+            return False
+        
+        account_number = loan['account_number']
+        loan['installment'] = self.loan_book.open(loan_id, account_number, loan['amount'], annual_rate, loan['months'])
+        loan['annual_rate'] = annual_rate
+        loan['status'] = 'approved'
+        
+        self.accounts[account_number].balance += loan['amount']
+        self.transactions.append(account_number, 'loan', loan['amount'], f"Loan {loan_id} disbursement")
+        # Debt only counts against the score once the loan is actually granted
+        self.credit_scorer.record_loan(account_number, loan['amount'])
+        self._rescore(account_number)
+        return True
+    
+    def get_loan_balance(self, loan_id):
+        """Principal still owed on an approved loan."""
+        return self.loan_book.balance(loan_id)
+    
+    def get_loan_schedule(self, loan_id):
+        """Remaining payments of an approved loan: month, payment, principal, interest, remaining."""
+        return list(self.loan_book.schedule(loan_id))
+    
+    def run_loan_payments(self, timestamp=None):
+        """
+        Collect one month's installment on every active loan in one pass.
+        
+        Each loan advances by one amortize() step and its installment is
+        debited from the linked account. A loan whose account cannot cover
+        the installment is left where it is and counted as missed. Payments
+        go to the ledger in bulk as 'loan_payment' rows, loans that are
+        paid off are closed, and every account that paid is rescored once.
+        
+        Returns:
+            dict: {'loans': count, 'collected': total, 'missed': count, 'paid_off': count}
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        
+        book = self.loan_book
+        accounts = self.accounts
+        scorer = self.credit_scorer
+        paid_accounts = []
+        payments = []
+        finished = []
+        missed = 0
+        
+        rows = zip(book.account_numbers, book.remaining, book.monthly_rates, book.installments, book.months_left)
+        for row, (account_number, remaining, monthly_rate, installment, months_left) in enumerate(rows):
+            payment, principal, interest, remaining = amortize(remaining, monthly_rate, installment, months_left)
+            account = accounts[account_number]
+            if account.balance < payment:
+                book.missed[row] += 1
+                missed += 1
+                continue
+            
+            account.balance -= payment
+            book.remaining[row] = remaining
+            book.months_left[row] = months_left - 1
+            scorer.record_payment(account_number, payment, principal)
+            paid_accounts.append(account_number)
+            payments.append(payment)
+            if remaining == 0:
+                finished.append(row)
+        
+        self.transactions.post(paid_accounts, 'loan_payment', payments, 'Loan payment', timestamp)
+        for row in finished:
+            self.loans[book.loan_ids[row]]['status'] = 'paid_off'
+        loans = len(book)
+        book.close(finished)
+        for account_number in set(paid_accounts):
+            self._rescore(account_number)
+        
+        return {'loans': loans, 'collected': sum(payments), 'missed': missed, 'paid_off': len(finished)}
+    
     def get_credit_score(self, account_number):
         """Get credit score."""
         return self.credit_scores.get(account_number, 600)
     
     def make_payment(self, account_number, amount):
-        """Make a payment to improve credit score."""
-        if account_number not in self.accounts:
+        """Pay down the account's outstanding loans from its balance; False if it owes nothing or cannot pay."""
+        account = self.accounts.get(account_number)
+        if not account or amount <= 0 or account.balance < amount:
             return False
         
-        # Improve credit score with payment
-        current_score = self.credit_scores.get(account_number, 600)
-        improvement = min(10, amount // 100)  # Max 10 point improvement
-        self.credit_scores[account_number] = min(850, current_score + improvement)
+        paid, finished = self.loan_book.prepay(account_number, amount)
+        if not paid:
+            return False
         
+        account.balance -= paid
+        self.transactions.append(account_number, 'loan_payment', paid, 'Loan prepayment')
+        # Only money that actually reduced a loan builds history and lowers debt
+        self.credit_scorer.record_payment(account_number, paid)
+        for row in finished:
+            self.loans[self.loan_book.loan_ids[row]]['status'] = 'paid_off'
+        self.loan_book.close(finished)
+        self._rescore(account_number)
         return True
     
+    def rescore_all_accounts(self, now=None):
+        """Recompute every account's credit score in one pass; returns the number scored."""
+        account_numbers = self.credit_scorer.account_numbers
+        balances = [self.accounts[account_number].balance for account_number in account_numbers]
+        self.credit_scores.update(zip(account_numbers, self.credit_scorer.score_all(balances, now)))
+        return len(account_numbers)
+    
+    def _rescore(self, account_number):
+        """Refresh one account's stored credit score from its aggregates."""
+        balance = self.accounts[account_number].balance
+        self.credit_scores[account_number] = self.credit_scorer.score(account_number, balance)
+    
     def has_premium_features(self, account_number):
         """Check if account has premium features."""
         account = self.accounts.get(account_number)
-        return account and account.get('is_premium', False)
+        return account and account.is_premium
     
     def get_monthly_fee(self, account_number):
         """Get monthly fee for account."""
@@ -150,36 +739,90 @@ class BankingSystem:
         if not account:
             return 0
         
-        if account.get('is_premium', False):
+        if account.is_premium:
             return 0
-        elif account['account_type'] == 'checking':
-            return 10
-        elif account['account_type'] == 'savings':
-            return 5
-        else:
-            return 15
+        return MONTHLY_FEES.get(account.account_type, DEFAULT_MONTHLY_FEE)
+    
+    def calculate_interest(self, account_number, annual_rate=0.02):
+        """Calculate monthly interest for savings accounts."""
+        account = self.accounts.get(account_number)
+        if not account or account.account_type != 'savings':
+            return 0.0
+        return account.balance * (annual_rate / 12)  # Monthly interest
+    
+    def run_month_end(self, annual_rate=0.02, timestamp=None):
+        """
+        Pay a month of interest and charge monthly fees on every account in one pass.
+        
+        Balances, account types and premium flags are pulled out as columns,
+        and interest and fees are computed a whole column at a time (same
+        rules as calculate_interest and get_monthly_fee). Each balance is then
+        written once, and the non-zero postings go to the ledger in bulk as
+        'interest' and 'fee' rows. A fee is only charged if the balance,
+        including this month's interest, covers it. Every credit score is
+        then refreshed in one rescore_all_accounts pass.
+        
+        Returns:
+            dict: {'accounts': count, 'interest_paid': total, 'fees_charged': total}
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        
+        account_numbers = list(self.accounts)
+        accounts = list(self.accounts.values())
+        balances = list(map(attrgetter('balance'), accounts))
+        account_types = list(map(attrgetter('account_type'), accounts))
+        
+        monthly_rate = annual_rate / 12
+        interest = [balance * monthly_rate if account_type == 'savings' else 0.0
+                    for balance, account_type in zip(balances, account_types)]
+        balances = list(map(add, balances, interest))
+        
+        fees = [0 if account.is_premium else MONTHLY_FEES.get(account_type, DEFAULT_MONTHLY_FEE)
+                for account, account_type in zip(accounts, account_types)]
+        fees = [fee if fee <= balance else 0 for fee, balance in zip(fees, balances)]
+        balances = list(map(sub, balances, fees))
+        
+        for account, balance in zip(accounts, balances):
+            account.balance = balance
+        
+        self.transactions.post(
+            compress(account_numbers, interest), 'interest', compress(interest, interest), 'Monthly interest', timestamp
+        )
+        self.transactions.post(compress(account_numbers, fees), 'fee', compress(fees, fees), 'Monthly fee', timestamp)
+        self.rescore_all_accounts()
+        
+        return {'accounts': len(accounts), 'interest_paid': sum(interest), 'fees_charged': sum(fees)}
     
     # Basic methods from level 1
     def get_balance(self, account_number):
         """Get current account balance."""
         account = self.accounts.get(account_number)
-        return account['balance'] if account else None
+        return account.balance if account else None
     
     def deposit(self, account_number, amount):
         """Deposit money to account."""
-        if account_number not in self.accounts or amount <= 0:
+        account = self.accounts.get(account_number)
+        if account is None or amount <= 0:
             return False
         
-        self.accounts[account_number]['balance'] += amount
+        account.balance += amount
+        self.transactions.append(account_number, 'deposit', amount)
+        self._rescore(account_number)
         return True
     
     def withdraw(self, account_number, amount):
         """Withdraw money from account."""
-        if account_number not in self.accounts or amount <= 0:
+        account = self.accounts.get(account_number)
+        if account is None or amount <= 0:
             return False
         
-        if self.accounts[account_number]['balance'] < amount:
+        if account.balance < amount:
+            self.credit_scorer.record_declined(account_number)
+            self._rescore(account_number)
             return False
         
-        self.accounts[account_number]['balance'] -= amount
+        account.balance -= amount
+        self.transactions.append(account_number, 'withdrawal', amount)
+        self._rescore(account_number)
         return True
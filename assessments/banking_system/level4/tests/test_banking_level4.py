@@ -1,6 +1,7 @@
 import pytest
 import sys
 import os
+import time
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
 from banking_system.level4.model_solution.banking import BankingSystem
@@ -57,3 +58,275 @@ class TestBankingLevel4:
         bank.create_account("user2", 1000, "checking")
         assert bank.has_premium_features("user2") == False
         assert bank.get_monthly_fee("user2") > 0
+
+
+class TestMonthEnd:
+    def test_month_end_matches_per_account_rules(self):
+        bank = BankingSystem()
+        checking = bank.create_account("alice", 1000, "checking")
+        savings = bank.create_account("bob", 1200, "savings")
+        premium = bank.create_account("carol", 5000, "premium")
+        other = bank.create_account("dave", 100, "investment")
+        expected = {
+            account: bank.get_balance(account) + bank.calculate_interest(account) - bank.get_monthly_fee(account)
+            for account in (checking, savings, premium, other)
+        }
+        
+        result = bank.run_month_end()
+        assert result == {'accounts': 4, 'interest_paid': 2.0, 'fees_charged': 15}
+        for account, balance in expected.items():
+            assert bank.get_balance(account) == pytest.approx(balance)
+        
+        history = bank.transactions.history(savings)
+        assert [(t['type'], t['amount'], t['description']) for t in history[-2:]] == [
+            ('interest', 2.0, 'Monthly interest'), ('fee', 5, 'Monthly fee')
+        ]
+        assert bank.transactions.count(premium) == 1  # Initial deposit only
+    
+    def test_fee_skipped_when_balance_cannot_cover_it(self):
+        bank = BankingSystem()
+        poor = bank.create_account("alice", 4, "checking")
+        
+        assert bank.run_month_end()['fees_charged'] == 0
+        assert bank.get_balance(poor) == 4
+        assert bank.transactions.total(poor, 'fee') == 0.0
+
+
+class TestCreditScoring:
+    def test_scores_are_deterministic_and_follow_events(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", 5000)
+        acc2 = bank.create_account("bob", 5000)
+        assert bank.get_credit_score(acc1) == bank.get_credit_score(acc2) == 650
+        
+        assert bank.withdraw(acc2, 10000) == False  # Declined withdrawals count against the score
+        assert bank.get_credit_score(acc2) == 620
+        
+        # A pending request costs nothing; granted debt raises utilization until it is paid down
+        loan_id = bank.request_loan(acc1, 5000, 12)
+        assert loan_id is not None
+        assert bank.get_credit_score(acc1) == 650
+        assert bank.request_loan(acc1, 5000, 12) is not None
+        assert bank.approve_loan(loan_id) == True
+        assert bank.get_credit_score(acc1) == 633
+        assert bank.get_balance(acc1) == 10000
+        
+        # A payment comes out of the balance and pays down the loan itself
+        assert bank.make_payment(acc1, 2000) == True
+        assert bank.get_balance(acc1) == 8000
+        assert bank.get_loan_balance(loan_id) == 3000
+        assert bank.get_credit_score(acc1) == 665
+        
+        # Only what is still owed is taken, and a paid-off loan is closed
+        assert bank.make_payment(acc1, 5000) == True
+        assert bank.get_balance(acc1) == 5000
+        assert bank.get_loan_balance(loan_id) == 0
+        assert bank.get_loan_status(loan_id) == "paid_off"
+        assert bank.transactions.total(acc1, 'loan_payment') == 5000
+        assert bank.get_credit_score(acc1) == 750
+    
+    def test_payments_need_a_loan_and_the_money(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", 5000)
+        assert bank.make_payment(acc, 100) == False  # Nothing owed: no free score boost
+        assert bank.get_credit_score(acc) == 650
+        
+        loan_id = bank.request_loan(acc, 3000, 12)
+        bank.approve_loan(loan_id)
+        score = bank.get_credit_score(acc)
+        assert bank.make_payment(acc, 9000) == False  # More than the balance
+        assert bank.make_payment(acc, 0) == False
+        assert bank.get_balance(acc) == 8000
+        assert bank.get_loan_balance(loan_id) == 3000
+        assert bank.get_credit_score(acc) == score
+    
+    def test_loan_decisions_use_fresh_scores(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", 1000)
+        assert bank.request_loan(acc, 500, 6) is None
+        
+        bank.deposit(acc, 4000)
+        assert bank.request_loan(acc, 500, 6) is not None
+    
+    def test_batch_passes_leave_fresh_scores(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", 3000)
+        bank.credit_scores[acc] = 800
+        loan_id = bank.request_loan(acc, 20000, 12)
+        bank.approve_loan(loan_id)
+        
+        before = bank.get_credit_score(acc)
+        bank.run_loan_payments()
+        assert bank.get_credit_score(acc) != before
+        assert bank.get_credit_score(acc) == bank.credit_scorer.score(acc, bank.get_balance(acc))
+        
+        bank.credit_scores[acc] = 800  # Stale
+        bank.run_month_end()
+        assert bank.get_credit_score(acc) == bank.credit_scorer.score(acc, bank.get_balance(acc))
+    
+    def test_batch_rescore_matches_per_account_scores(self):
+        bank = BankingSystem()
+        accounts = [bank.create_account(f"customer{i}", i * 700) for i in range(20)]
+        bank.withdraw(accounts[4], 10**6)
+        loan_id = bank.request_loan(accounts[19], 3000, 12)
+        assert bank.approve_loan(loan_id) == True
+        assert bank.make_payment(accounts[19], 1200) == True
+        
+        later = time.time() + 350 * 86400
+        assert bank.rescore_all_accounts(now=later) == 20
+        for account in accounts:
+            balance = bank.get_balance(account)
+            assert bank.get_credit_score(account) == bank.credit_scorer.score(account, balance, now=later)
+        assert bank.get_credit_score(accounts[0]) == 650  # Empty, but old enough for the full age bonus
+
+
+class TestPositionBook:
+    def test_withdrawals_consume_oldest_lots_first(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", 10000, "investment")
+        bank.invest(acc, 1000, "bonds")
+        bank.invest(acc, 2000, "stocks")
+        bank.invest(acc, 500, "crypto")
+        
+        assert bank.withdraw_investment(acc, 1500) == True
+        assert bank.get_investment_balance(acc) == 2000
+        assert bank.get_balance(acc) == 10000 - 3500 + 1500
+        assert [(p['type'], p['amount']) for p in bank.get_investments(acc)] == [("stocks", 1500), ("crypto", 500)]
+        
+        assert bank.withdraw_investment(acc, 2500) == False  # More than is invested: nothing changes
+        assert bank.get_investment_balance(acc) == 2000
+    
+    def test_investment_ids_are_never_reused(self):
+        bank = BankingSystem()
+        acc1 = bank.create_account("alice", 10000, "investment")
+        acc2 = bank.create_account("bob", 10000, "investment")
+        bank.invest(acc1, 100, "bonds")
+        bank.invest(acc2, 100, "bonds")
+        bank.withdraw_investment(acc1, 100)
+        bank.invest(acc1, 100, "stocks")
+        
+        assert [p['investment_id'] for p in bank.get_investments(acc1)] == ["inv_3"]
+        assert [p['investment_id'] for p in bank.get_investments(acc2)] == ["inv_2"]
+    
+    def test_many_small_lots(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", 10**6, "investment")
+        for _ in range(1000):
+            bank.invest(acc, 10, "index")
+        
+        for _ in range(300):
+            assert bank.withdraw_investment(acc, 25) == True
+        assert bank.get_investment_balance(acc) == 2500
+        positions = bank.get_investments(acc)
+        assert len(positions) == 250
+        assert positions[0]['investment_id'] == "inv_751"
+
+
+class TestLoanAmortization:
+    def _approved_loan(self, bank, balance, amount, months):
+        acc = bank.create_account("alice", balance)
+        bank.credit_scores[acc] = 800  # Skip building credit history
+        loan_id = bank.request_loan(acc, amount, months)
+        assert bank.approve_loan(loan_id) == True
+        return acc, loan_id
+    
+    def test_schedule_repays_principal(self):
+        bank = BankingSystem()
+        acc, loan_id = self._approved_loan(bank, 1000, 1200, 12)
+        
+        assert bank.get_loan_status(loan_id) == "approved"
+        assert bank.get_balance(acc) == 2200
+        schedule = bank.get_loan_schedule(loan_id)
+        assert len(schedule) == 12
+        assert schedule[0]['interest'] == 6.0  # 6% a year on 1200
+        assert schedule[0]['payment'] == 103.28
+        assert schedule[-1]['remaining'] == 0
+        assert round(sum(payment['principal'] for payment in schedule), 2) == 1200
+        assert bank.approve_loan(loan_id) == False
+    
+    def test_month_end_posting_follows_schedule(self):
+        bank = BankingSystem()
+        acc, loan_id = self._approved_loan(bank, 1000, 1200, 12)
+        schedule = bank.get_loan_schedule(loan_id)
+        
+        result = bank.run_loan_payments()
+        assert result == {'loans': 1, 'collected': schedule[0]['payment'], 'missed': 0, 'paid_off': 0}
+        assert bank.get_loan_balance(loan_id) == schedule[0]['remaining']
+        assert bank.get_loan_schedule(loan_id) == [dict(payment, month=payment['month'] - 1) for payment in schedule[1:]]
+        assert bank.transactions.history(acc)[-1]['type'] == "loan_payment"
+        
+        for _ in range(11):
+            bank.run_loan_payments()
+        assert bank.get_loan_status(loan_id) == "paid_off"
+        assert bank.get_loan_balance(loan_id) == 0
+        assert bank.get_balance(acc) == pytest.approx(2200 - sum(payment['payment'] for payment in schedule))
+        assert bank.run_loan_payments()['loans'] == 0
+    
+    def test_installments_pay_down_principal_only(self):
+        bank = BankingSystem()
+        acc, loan_id = self._approved_loan(bank, 1000, 1200, 12)
+        first = bank.get_loan_schedule(loan_id)[0]
+        
+        bank.run_loan_payments()
+        row = bank.credit_scorer.rows[acc]
+        assert bank.credit_scorer.payment_totals[row] == first['payment']
+        assert bank.credit_scorer.debts[row] == pytest.approx(1200 - first['principal'])
+    
+    def test_uncovered_installment_is_missed(self):
+        bank = BankingSystem()
+        acc1, loan1 = self._approved_loan(bank, 0, 600, 6)
+        acc2, loan2 = self._approved_loan(bank, 0, 600, 6)
+        bank.withdraw(acc1, 600)
+        
+        result = bank.run_loan_payments()
+        assert result['missed'] == 1
+        assert bank.get_loan_balance(loan1) == 600
+        assert bank.get_loan_balance(loan2) < 600
+        assert len(bank.get_loan_schedule(loan1)) == 6
+    
+    def test_invalid_loan_terms_are_rejected(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", 1000)
+        bank.credit_scores[acc] = 800
+        
+        assert bank.request_loan(acc, -500, 12) is None
+        assert bank.request_loan(acc, 0, 12) is None
+        assert bank.request_loan(acc, 500, 0) is None
+        assert bank.request_loan(acc, 500, -3) is None
+        
+        # Terms edited after the request are checked again on approval
+        loan_id = bank.request_loan(acc, 500, 6)
+        bank.loans[loan_id]['months'] = 0
+        assert bank.approve_loan(loan_id) == False
+        assert bank.get_loan_status(loan_id) == "pending"
+        assert bank.get_balance(acc) == 1000
+    
+    def test_failed_open_leaves_the_book_consistent(self):
+        bank = BankingSystem()
+        acc, loan_id = self._approved_loan(bank, 1000, 600, 6)
+        
+        with pytest.raises(ValueError):
+            bank.loan_book.open("bad", acc, 600, 0.06, -1)
+        assert len(bank.loan_book) == 1
+        assert len(bank.loan_book.months_left) == len(bank.loan_book.remaining) == 1
+        assert bank.run_loan_payments()['collected'] > 0
+        assert len(bank.get_loan_schedule(loan_id)) == 5
+
+
+class TestLedger:
+    def test_every_balance_change_is_posted(self):
+        bank = BankingSystem()
+        acc = bank.create_account("alice", 1000, "investment")
+        bank.deposit(acc, 200)
+        bank.withdraw(acc, 50)
+        bank.withdraw(acc, 10**6)  # Declined: no row
+        bank.invest(acc, 300, "bonds")
+        bank.withdraw_investment(acc, 100)
+        
+        history = bank.transactions.history(acc)
+        assert [(t['type'], t['amount']) for t in history] == [
+            ('deposit', 1000), ('deposit', 200), ('withdrawal', 50),
+            ('investment', 300), ('investment_withdrawal', 100)
+        ]
+        assert history[2]['description'] == "Withdrawal of $50.00"
+        assert bank.transactions.total(acc, 'deposit') == 1200
@@ -0,0 +1,6 @@
+"""
+Fixtures shared by the level 4 tests.
+"""
+
+# Fixtures are looked up by name, so importing one here makes it available to every test module in this directory
+from assessments.snapshot_fixtures import state_snapshots  # noqa: F401
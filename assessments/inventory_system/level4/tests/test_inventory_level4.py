@@ -12,6 +12,24 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'candidate'))
 
 from inventory import InventoryManager
 
+LARGE_ITEM_COUNT = 5000
+LARGE_CATEGORY_COUNT = 20
+
+
+def build_large_inventory():
+    """Populate an inventory with LARGE_ITEM_COUNT items, each with some stock history."""
+    inventory = InventoryManager()
+    for i in range(LARGE_ITEM_COUNT):
+        inventory.add_item(f"item{i}", f"Item {i}", f"category{i % LARGE_CATEGORY_COUNT}", float(i % 100 + 1), 50)
+        inventory.update_stock(f"item{i}", 10, "add")
+    return inventory
+
+
+@pytest.fixture
+def large_inventory(state_snapshots):
+    """A populated inventory built once per session; each test gets its own copy."""
+    return state_snapshots.clone(build_large_inventory)
+
 
 class TestInventoryManagerLevel4:
     """Test cases for Level 4 InventoryManager."""
@@ -300,6 +318,61 @@ class TestInventoryManagerLevel4:
         assert stats['total_backups'] == 1
 
 
+class TestInventoryManagerLevel4LargeState:
+    """Level 4 operations against a large, pre-populated inventory."""
+    
+    def test_large_state_is_populated(self, large_inventory):
+        """Test that the shared large state arrives fully built."""
+        assert large_inventory.get_item_count() == LARGE_ITEM_COUNT
+        assert len(large_inventory.get_categories()) == LARGE_CATEGORY_COUNT
+        assert large_inventory.get_item("item42")['stock'] == 60
+    
+    def test_large_state_mutation(self, large_inventory):
+        """Test changes to one copy; test_large_state_is_independent checks they do not leak."""
+        large_inventory.process_sale("item42", 60)
+        large_inventory.remove_item("item7")
+        
+        assert large_inventory.get_item("item42")['stock'] == 0
+        assert large_inventory.get_item_count() == LARGE_ITEM_COUNT - 1
+    
+    def test_large_state_is_independent(self, large_inventory, state_snapshots):
+        """Test that each test gets its own copy of the shared state."""
+        assert large_inventory.get_item("item42")['stock'] == 60
+        assert large_inventory.get_item("item7") is not None
+        
+        other = state_snapshots.clone(build_large_inventory)
+        other.update_stock("item1", 5, "add")
+        other.get_stock_history("item1").clear()
+        
+        assert large_inventory.get_item("item1")['stock'] == 60
+        assert len(large_inventory.get_stock_history("item1")) == 2
+    
+    def test_large_backup_and_restore(self, large_inventory):
+        """Test backup and restore on a large inventory."""
+        assert large_inventory.backup_inventory("large") is True
+        
+        bulk_result = large_inventory.bulk_update_stock([
+            {'item_id': f"item{i}", 'quantity': 60, 'operation': 'remove'} for i in range(100)
+        ])
+        assert bulk_result['updated'] == 100
+        assert large_inventory.get_system_stats()['low_stock_items'] == 100
+        
+        assert large_inventory.restore_inventory("large") is True
+        stats = large_inventory.get_system_stats()
+        assert stats['total_stock_units'] == LARGE_ITEM_COUNT * 60
+        assert stats['low_stock_items'] == 0
+    
+    def test_large_export_import_round_trip(self, large_inventory):
+        """Test exporting a large inventory into a fresh manager."""
+        exported = large_inventory.export_inventory()
+        
+        restored = InventoryManager()
+        assert restored.import_inventory(exported) is True
+        assert restored.get_item_count() == LARGE_ITEM_COUNT
+        assert restored.get_system_stats()['total_inventory_value'] == \
+            large_inventory.get_system_stats()['total_inventory_value']
+
+
 def run_tests():
     """Run all tests and display results."""
     print("🧪 Level 4: Advanced Operations & Data Management")
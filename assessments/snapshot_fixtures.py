@@ -0,0 +1,70 @@
+"""
+Snapshot Fixtures
+Build a large, populated system once per test session and hand each test
+its own copy, so large-state tests stay independent without paying the
+setup cost every time.
+
+Usage: make the fixture visible from the tests directory's conftest.py,
+    
+    from assessments.snapshot_fixtures import state_snapshots  # noqa: F401
+    
+then, in a test module:
+    
+    def build_large_inventory():
+        inventory = InventoryManager()
+        ...
+        return inventory
+    
+    @pytest.fixture
+    def large_inventory(state_snapshots):
+        return state_snapshots.clone(build_large_inventory)
+"""
+
+import copy
+import pickle
+
+import pytest
+
+
+class StateSnapshot:
+    """A frozen copy of a system that can be cloned cheaply and repeatedly."""
+    
+    def __init__(self, system):
+        # Unpickling is several times faster than deepcopy for the plain
+        # dict/list state these systems keep; deepcopy is only the fallback
+        # for state pickle cannot handle (lambdas, locks, ...).
+        try:
+            self._data = pickle.dumps(system, protocol=pickle.HIGHEST_PROTOCOL)
+            self._pickled = True
+        except (pickle.PicklingError, AttributeError, TypeError):
+            self._data = copy.deepcopy(system)
+            self._pickled = False
+    
+    def clone(self):
+        """Return a fresh, fully independent copy of the snapshotted system."""
+        if self._pickled:
+            return pickle.loads(self._data)
+        return copy.deepcopy(self._data)
+
+
+class SnapshotCache:
+    """Session-wide snapshots, built on first use and keyed by their builder."""
+    
+    def __init__(self):
+        self.snapshots = {}
+    
+    def snapshot(self, build):
+        """Get the snapshot for a builder, calling the builder only the first time."""
+        if build not in self.snapshots:
+            self.snapshots[build] = StateSnapshot(build())
+        return self.snapshots[build]
+    
+    def clone(self, build):
+        """Get an independent copy of the state the builder produces."""
+        return self.snapshot(build).clone()
+
+
+@pytest.fixture(scope="session")
+def state_snapshots():
+    """Session-scoped cache of built states; clone from it in function-scoped fixtures."""
+    return SnapshotCache()
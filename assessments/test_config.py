@@ -8,21 +8,32 @@ TEST_MODEL_SOLUTIONS = True
 
 # Alternative: Use environment variable for more flexibility
 import os
+import sys
+import contextlib
+import importlib.abc
+import importlib.machinery
+import importlib.util
+
+SOLUTION_DIRS = ['candidate', 'model_solution']
+
 if 'TEST_MODEL_SOLUTIONS' in os.environ:
     TEST_MODEL_SOLUTIONS = os.environ.get('TEST_MODEL_SOLUTIONS', 'false').lower() == 'true'
 
-def get_solution_path(assessment_name, level):
+def get_solution_path(assessment_name, level, use_model=None):
     """
     Get the import path for the solution based on configuration.
     
     Args:
         assessment_name (str): Name of the assessment (e.g., 'banking_system')
         level (str): Level name (e.g., 'level1')
+        use_model (bool): Override TEST_MODEL_SOLUTIONS when not None
         
     Returns:
         str: Import path for the solution
     """
-    if TEST_MODEL_SOLUTIONS:
+    if use_model is None:
+        use_model = TEST_MODEL_SOLUTIONS
+    if use_model:
         return f"assessments.{assessment_name}.{level}.model_solution"
     else:
         return f"assessments.{assessment_name}.{level}.candidate"
@@ -49,17 +60,82 @@ def get_solution_module_name(assessment_name):
     
     return module_map.get(assessment_name, assessment_name)
 
-def get_full_import_path(assessment_name, level):
+def get_full_import_path(assessment_name, level, use_model=None):
     """
     Get the full import path for testing.
     
     Args:
         assessment_name (str): Name of the assessment
         level (str): Level name
+        use_model (bool): Override TEST_MODEL_SOLUTIONS when not None
         
     Returns:
         str: Full import path (e.g., 'assessments.banking_system.level1.model_solution.banking')
     """
-    solution_path = get_solution_path(assessment_name, level)
+    solution_path = get_solution_path(assessment_name, level, use_model)
     module_name = get_solution_module_name(assessment_name)
     return f"{solution_path}.{module_name}"
+
+def get_solution_import_paths(assessment_name, level):
+    """
+    Get every import path a level's tests may use to reach its solution.
+    
+    Tests import the solution through get_full_import_path, through a
+    hard-coded 'banking_system.level3.model_solution.banking' style path,
+    or by bare module name after putting candidate/ on sys.path.
+    
+    Args:
+        assessment_name (str): Name of the assessment
+        level (str): Level name
+        
+    Returns:
+        set: Module names that all refer to this level's solution
+    """
+    import_paths = {get_solution_module_name(assessment_name)}
+    for use_model in (False, True):
+        full_path = get_full_import_path(assessment_name, level, use_model)
+        import_paths.add(full_path)
+        import_paths.add(full_path[len('assessments.'):])
+    return import_paths
+
+
+class SolutionFinder(importlib.abc.MetaPathFinder):
+    """Import hook that points every solution import of one level at one directory."""
+    
+    def __init__(self, assessment_name, level, solution_dir):
+        self.module_name = get_solution_module_name(assessment_name)
+        self.module_file = os.path.join(str(solution_dir), f"{self.module_name}.py")
+        self.import_paths = get_solution_import_paths(assessment_name, level)
+    
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in self.import_paths:
+            return None
+        
+        if fullname == self.module_name:
+            # A bare name such as 'task_queue' may also be a package; only
+            # redirect it when it would resolve into a solution directory.
+            spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+            if not spec or not spec.origin:
+                return None
+            if os.path.basename(os.path.dirname(spec.origin)) not in SOLUTION_DIRS:
+                return None
+        
+        return importlib.util.spec_from_file_location(fullname, self.module_file)
+
+
+@contextlib.contextmanager
+def solution_imports(assessment_name, level, solution_dir):
+    """
+    Resolve a level's solution imports to solution_dir while the block runs.
+    
+    Args:
+        assessment_name (str): Name of the assessment
+        level (str): Level name
+        solution_dir (str): Directory holding the solution module (candidate/ or model_solution/)
+    """
+    finder = SolutionFinder(assessment_name, level, solution_dir)
+    sys.meta_path.insert(0, finder)
+    try:
+        yield finder
+    finally:
+        sys.meta_path.remove(finder)
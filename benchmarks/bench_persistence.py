@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Persistence Benchmarks
+Write throughput of the level 3 banking write-ahead log at different group
+commit sizes, and recovery time from a log alone versus a snapshot.
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from workloads import load_solution
+
+
+DEFAULT_GROUP_SIZES = [1, 16, 256]
+DEFAULT_OPERATIONS = 20000
+DEFAULT_RECOVERY_SIZES = [10**4, 10**5]
+
+
+def _apply_operations(bank, n, rng):
+    """Deposits, withdrawals and transfers over a fixed pool of accounts; every one is logged."""
+    accounts = [bank.create_account(f"Customer {i}", "checking", 1000.0) for i in range(100)]
+    for _ in range(n):
+        r = rng.random()
+        account = accounts[rng.randrange(len(accounts))]
+        if r < 0.45:
+            bank.deposit(account, rng.randint(1, 500))
+        elif r < 0.80:
+            bank.withdraw(account, rng.randint(1, 300))
+        else:
+            bank.transfer_funds(account, accounts[rng.randrange(len(accounts))], rng.randint(1, 200))
+
+
+def measure_write_throughput(BankingSystem, BankStorage, group_size, n):
+    """Logged operations per second with an fsync every group_size records."""
+    directory = tempfile.mkdtemp(prefix="bank-wal-")
+    try:
+        # An interval longer than the run, so only the group size triggers syncs
+        bank = BankingSystem(storage=BankStorage(directory, group_size=group_size, group_interval=3600))
+        start = time.perf_counter()
+        _apply_operations(bank, n, random.Random(n))
+        bank.close()
+        return n / (time.perf_counter() - start)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def measure_recovery(BankingSystem, BankStorage, n, snapshot):
+    """Seconds to reopen a bank after n operations, replaying the whole log or loading a snapshot."""
+    directory = tempfile.mkdtemp(prefix="bank-wal-")
+    try:
+        bank = BankingSystem(storage=BankStorage(directory, group_size=4096, snapshot_every=10**9))
+        _apply_operations(bank, n, random.Random(n))
+        if snapshot:
+            bank.checkpoint()
+        bank.close()
+        
+        start = time.perf_counter()
+        recovered = BankingSystem(storage=BankStorage(directory))
+        elapsed = time.perf_counter() - start
+        recovered.close()
+        return elapsed
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write-ahead log and recovery benchmarks for the banking system")
+    parser.add_argument(
+        "--group-sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_GROUP_SIZES,
+        help="Records per fsync to compare (default: 1 16 256)"
+    )
+    parser.add_argument(
+        "--operations",
+        type=int,
+        default=DEFAULT_OPERATIONS,
+        help="Operations per throughput run (default: 20000)"
+    )
+    parser.add_argument(
+        "--recovery-sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_RECOVERY_SIZES,
+        help="Operation counts to recover from (default: 10000 100000)"
+    )
+    
+    args = parser.parse_args()
+    
+    BankingSystem = load_solution("banking_system", "level3", "BankingSystem")
+    BankStorage = load_solution("banking_system", "level3", "BankStorage")
+    
+    print(f"\n📝 Write throughput ({args.operations} operations)")
+    print(f"{'records/fsync':>14}  {'ops/sec':>12}  {'speedup':>8}")
+    print("-" * 38)
+    baseline = None
+    for group_size in args.group_sizes:
+        ops_per_sec = measure_write_throughput(BankingSystem, BankStorage, group_size, args.operations)
+        baseline = baseline or ops_per_sec
+        print(f"{group_size:>14}  {ops_per_sec:>12,.0f}  {ops_per_sec / baseline:>7.1f}x")
+    
+    print("\n♻️  Recovery time")
+    print(f"{'operations':>12}  {'log replay':>11}  {'snapshot':>9}")
+    print("-" * 37)
+    for n in args.recovery_sizes:
+        replay = measure_recovery(BankingSystem, BankStorage, n, snapshot=False)
+        snapshot = measure_recovery(BankingSystem, BankStorage, n, snapshot=True)
+        print(f"{n:>12}  {replay:>10.2f}s  {snapshot:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
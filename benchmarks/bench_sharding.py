@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Sharding Benchmarks
+Throughput of the level 3 banking system split across worker processes,
+for a mostly-local workload, compared with a single in-process instance.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from workloads import load_solution
+
+
+DEFAULT_SHARD_COUNTS = [1, 2, 4]
+DEFAULT_OPERATIONS = 200000
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_CROSS_SHARD = 0.01
+
+
+def _operations(account_numbers, n, cross_shard, shard_of, rng):
+    """Deposits, withdrawals and reads, plus transfers of which a cross_shard fraction leave the shard."""
+    by_shard = {}
+    for account_number in account_numbers:
+        by_shard.setdefault(shard_of(account_number), []).append(account_number)
+    
+    operations = []
+    for _ in range(n):
+        r = rng.random()
+        account = account_numbers[rng.randrange(len(account_numbers))]
+        if r < 0.40:
+            operations.append(('deposit', account, rng.randint(1, 500)))
+        elif r < 0.70:
+            operations.append(('withdraw', account, rng.randint(1, 300)))
+        elif r < 0.85:
+            operations.append(('get_balance', account))
+        else:
+            if rng.random() < cross_shard:
+                other = account_numbers[rng.randrange(len(account_numbers))]
+            else:
+                neighbours = by_shard[shard_of(account)]
+                other = neighbours[rng.randrange(len(neighbours))]
+            operations.append(('transfer_funds', account, other, rng.randint(1, 200)))
+    return operations
+
+
+def measure_single(BankingSystem, n, cross_shard):
+    """Operations per second on one BankingSystem in this process."""
+    bank = BankingSystem()
+    accounts = [bank.create_account(f"Customer {i}", "checking", 1000.0) for i in range(1000)]
+    operations = _operations(accounts, n, cross_shard, lambda account_number: 0, random.Random(n))
+    
+    start = time.perf_counter()
+    for method, *args in operations:
+        getattr(bank, method)(*args)
+    return n / (time.perf_counter() - start)
+
+
+def measure_sharded(ShardedBankingSystem, shards, n, batch_size, cross_shard):
+    """Operations per second through the router, sent batch_size operations at a time."""
+    with ShardedBankingSystem(shards) as bank:
+        accounts = bank.execute([('create_account', f"Customer {i}", "checking", 1000.0) for i in range(1000)])
+        operations = _operations(accounts, n, cross_shard, bank.shard_of, random.Random(n))
+        
+        start = time.perf_counter()
+        for offset in range(0, n, batch_size):
+            bank.execute(operations[offset:offset + batch_size])
+        return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded banking throughput benchmarks")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SHARD_COUNTS,
+        help="Shard counts to compare (default: 1 2 4)"
+    )
+    parser.add_argument(
+        "--operations",
+        type=int,
+        default=DEFAULT_OPERATIONS,
+        help="Operations per run (default: 200000)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Operations per execute() call (default: 2000)"
+    )
+    parser.add_argument(
+        "--cross-shard",
+        type=float,
+        default=DEFAULT_CROSS_SHARD,
+        help="Fraction of transfers between shards (default: 0.01)"
+    )
+    
+    args = parser.parse_args()
+    
+    BankingSystem = load_solution("banking_system", "level3", "BankingSystem")
+    ShardedBankingSystem = load_solution("banking_system", "level3", "ShardedBankingSystem")
+    
+    print(f"\n🧩 Sharded throughput ({args.operations} operations, {os.cpu_count()} cores)")
+    print(f"{'shards':>10}  {'ops/sec':>12}  {'speedup':>8}")
+    print("-" * 34)
+    baseline = measure_single(BankingSystem, args.operations, args.cross_shard)
+    print(f"{'in-process':>10}  {baseline:>12,.0f}  {1.0:>7.1f}x")
+    for shards in args.shards:
+        ops_per_sec = measure_sharded(ShardedBankingSystem, shards, args.operations, args.batch_size, args.cross_shard)
+        print(f"{shards:>10}  {ops_per_sec:>12,.0f}  {ops_per_sec / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
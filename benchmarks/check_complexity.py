@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Complexity Regression Checker
+Times public methods at growing state sizes, fits the observed growth class
+and fails when a method grows faster than its declared budget.
+
+A solution can pass every correctness test and still be accidentally
+quadratic; this catches that for model and candidate solutions alike.
+"""
+
+import argparse
+import gc
+import inspect
+import math
+import statistics
+import sys
+import time
+
+from workloads import load_solution
+
+
+DEFAULT_SIZES = [500, 1000, 2000, 4000, 8000, 16000]
+
+# Each size is rebuilt and timed this many times; the median timing is fitted
+DEFAULT_ROUNDS = 3
+
+# Ordered from cheapest to most expensive
+COMPLEXITY_CLASSES = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log(n)),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log(n)),
+    ("O(n^2)", lambda n: float(n) * n),
+]
+CLASS_NAMES = [name for name, _ in COMPLEXITY_CLASSES]
+
+# Polynomial degree of each class. A log factor is about as large as cache
+# effects across the size range, so fits flip between e.g. O(n) and
+# O(n log n) from run to run; a method only fails a full degree over budget.
+CLASS_DEGREES = {"O(1)": 0, "O(log n)": 0, "O(n)": 1, "O(n log n)": 1, "O(n^2)": 2}
+
+# Slowest/fastest timing ratio below which a method is treated as constant time
+FLAT_RATIO = 2.5
+
+
+# =================== STATE BUILDERS ===================
+# Each builds a system whose relevant state has size n. Budgets are stated
+# in terms of that n, with the size of each call's result held constant.
+
+def _bank_with_history(BankingSystem, n):
+    bank = BankingSystem()
+    # Large enough that probing withdrawals never drain it and start failing fast
+    hot = bank.create_account("Hot", "checking", 10.0**9)
+    other = bank.create_account("Other", "savings", 1000.0)
+    for _ in range(n):
+        bank.deposit(hot, 10.0)
+    if hasattr(bank, 'schedule_transfer'):
+        for i in range(n):
+            bank.schedule_transfer(hot, other, 1.0, 10**12 + i)
+    return bank
+
+
+def _chat_with_messages(ChatPlatform, n):
+    chat = ChatPlatform()
+    for i in range(100):
+        chat.register_user(f"user{i}", f"User {i}")
+    # Message k goes to user(k % 100), so message n lands in the last inbox scanned
+    for k in range(n):
+        chat.send_message(f"user{(k + 1) % 100}", f"user{k % 100}", f"message {k}")
+    return chat
+
+
+def _newest_message(chat):
+    """(message_id, author) of the most recent message sent by _chat_with_messages."""
+    message_id = chat.message_id_counter - 1
+    return str(message_id), f"user{message_id % 100}"
+
+
+def _file_system_with_files(FileSystemSimulator, n):
+    fs = FileSystemSimulator()
+    for i in range(n):
+        fs.upload_file(f"file{i}.txt", 100, 1000 + i)
+    return fs
+
+
+def _inventory_with_items(InventoryManager, n):
+    inventory = InventoryManager()
+    for i in range(n):
+        inventory.add_item(f"item{i}", f"Item {i}", f"category{i % 20}", 10.0, 1000)
+    return inventory
+
+
+def _task_queue_with_tasks(TaskQueue, n):
+    queue = TaskQueue()
+    # Lowest priorities first: a linear-insert queue then stops scanning early,
+    # so building stays cheap at large n while the queue itself is the same
+    for priority in range(1, 11):
+        for i in range(priority - 1, n, 10):
+            queue.add_task(f"task{i}", priority=priority)
+    return queue
+
+
+def _tracker_with_interactions(ModelWelfareTracker, n):
+    tracker = ModelWelfareTracker()
+    for i in range(10):
+        tracker.register_model(f"model{i}", f"Model {i}", "llm")
+    # 'probe_user' has the same 5 interactions at every size
+    for i in range(5):
+        tracker.log_interaction("model0", "probe_user", i)
+    for i in range(n):
+        tracker.log_interaction(f"model{i % 10}", f"user{i}", 1000 + i)
+    return tracker
+
+
+# A query that reaches into the amount ("$7.50") makes the ledger format
+# every default-description row, unlike a word from the fixed text
+AMOUNT_QUERY = "$7.50"
+
+# (assessment, level, class name) -> (state builder, [(method, budget, call)]);
+# a method probed more than once names each case as 'method[case]'
+PROBES = {
+    ('banking_system', 'level2', 'BankingSystem'): (_bank_with_history, [
+        ('deposit', "O(1)", lambda bank, i: bank.deposit("1000001", 1.0)),
+        ('get_balance', "O(1)", lambda bank, i: bank.get_balance("1000001")),
+        ('get_transactions_in_timerange', "O(log n)",
+         lambda bank, i: bank.get_transactions_in_timerange("1000001", 0, 1)),
+        ('search_transactions[text]', "O(1)", lambda bank, i: bank.search_transactions("1000001", "bonus")),
+        ('search_transactions[amount]', "O(n)", lambda bank, i: bank.search_transactions("1000001", AMOUNT_QUERY)),
+    ]),
+    ('banking_system', 'level3', 'BankingSystem'): (_bank_with_history, [
+        ('deposit', "O(1)", lambda bank, i: bank.deposit("1000001", 1.0)),
+        ('withdraw', "O(1)", lambda bank, i: bank.withdraw("1000001", 1.0)),
+        ('get_balance', "O(1)", lambda bank, i: bank.get_balance("1000001")),
+        ('transfer_funds', "O(1)", lambda bank, i: bank.transfer_funds("1000001", "1000002", 1.0)),
+        ('get_transactions_in_timerange', "O(log n)",
+         lambda bank, i: bank.get_transactions_in_timerange("1000001", 0, 1)),
+        ('get_account_summary', "O(1)", lambda bank, i: bank.get_account_summary("1000001")),
+        ('detect_suspicious_activity', "O(1)", lambda bank, i: bank.detect_suspicious_activity("1000001")),
+        ('screen_accounts', "O(1)", lambda bank, i: bank.screen_accounts()),
+        ('search_transactions[text]', "O(1)", lambda bank, i: bank.search_transactions("1000001", "bonus")),
+        ('search_transactions[amount]', "O(n)", lambda bank, i: bank.search_transactions("1000001", AMOUNT_QUERY)),
+        ('schedule_transfer', "O(log n)", lambda bank, i: bank.schedule_transfer("1000001", "1000002", 1.0, 10**13)),
+        ('process_scheduled_transfers', "O(1)", lambda bank, i: bank.process_scheduled_transfers()),
+    ]),
+    ('chat_platform', 'level3', 'ChatPlatform'): (_chat_with_messages, [
+        ('send_message', "O(1)", lambda chat, i: chat.send_message("user1", "user2", "hi")),
+        ('edit_message', "O(1)", lambda chat, i: chat.edit_message(_newest_message(chat)[0], f"edit {i}", _newest_message(chat)[1])),
+        ('delete_message', "O(1)", lambda chat, i: chat.delete_message(*_newest_message(chat))),
+        ('get_user', "O(1)", lambda chat, i: chat.get_user("user1")),
+    ]),
+    ('file_system_commands', 'level4', 'FileSystemSimulator'): (_file_system_with_files, [
+        ('upload_file', "O(1)", lambda fs, i: fs.upload_file(f"new{i}.txt", 10, 10**9)),
+        ('get_file', "O(1)", lambda fs, i: fs.get_file("file7.txt", 10**9)),
+        ('copy_file', "O(1)", lambda fs, i: fs.copy_file("file7.txt", f"copy{i}.txt", 10**9)),
+        ('search_files', "O(n)", lambda fs, i: fs.search_files("file7.", 10**9)),
+    ]),
+    ('inventory_system', 'level4', 'InventoryManager'): (_inventory_with_items, [
+        ('get_item', "O(1)", lambda inventory, i: inventory.get_item("item7")),
+        ('update_stock', "O(1)", lambda inventory, i: inventory.update_stock("item7", 1, "add")),
+        ('process_sale', "O(1)", lambda inventory, i: inventory.process_sale("item7", 1)),
+        ('get_items_by_category', "O(n)", lambda inventory, i: inventory.get_items_by_category("category7")),
+    ]),
+    ('task_queue', 'level4', 'TaskQueue'): (_task_queue_with_tasks, [
+        ('add_task', "O(log n)", lambda queue, i: queue.add_task(f"probe{i}", priority=5)),
+        ('get_task_status', "O(1)", lambda queue, i: queue.get_task_status("7")),
+        ('get_next_task', "O(log n)", lambda queue, i: queue.get_next_task()),
+    ]),
+    ('model_welfare_tracker', 'level4', 'ModelWelfareTracker'): (_tracker_with_interactions, [
+        ('log_interaction', "O(1)", lambda tracker, i: tracker.log_interaction("model1", "user1", 10**9)),
+        ('get_interaction_count', "O(1)", lambda tracker, i: tracker.get_interaction_count("model1")),
+        ('get_interactions_in_timerange', "O(n)",
+         lambda tracker, i: tracker.get_interactions_in_timerange("model1", 0, 10)),
+        ('get_user_interactions', "O(1)", lambda tracker, i: tracker.get_user_interactions("probe_user")),
+    ]),
+}
+
+
+def time_call(system, call, min_seconds=0.005, max_calls=10000, repeats=5):
+    """
+    Best-of-N seconds per call, batching calls until a batch is long enough to time.
+    
+    Probes that add state (e.g. add_task) grow the system with every call,
+    so cap max_calls well below the state size or the small sizes end up
+    being timed at a much larger one.
+    """
+    # A collection pass walks the whole state, which would make every method look O(n)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _time_batches(system, call, min_seconds, max_calls, repeats)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _time_batches(system, call, min_seconds, max_calls, repeats):
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(calls):
+            call(system, i)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or calls >= max_calls:
+            break
+        calls = min(calls * 4, max_calls)
+    
+    best = elapsed / calls
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for i in range(calls):
+            call(system, i)
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def fit_complexity(sizes, times):
+    """
+    Fit times to each growth class as t = a + b*f(n) and pick the cheapest
+    class that fits nearly as well as the best one.
+    
+    Returns:
+        str: Name of the fitted class (e.g. 'O(n)')
+    """
+    # Across the default 32x range of sizes even a pure O(log n) method only
+    # slows down by ~1.5x, which is within timer and cache noise for
+    # sub-microsecond calls; anything flatter than this counts as constant.
+    if max(times) < FLAT_RATIO * min(times):
+        return COMPLEXITY_CLASSES[0][0]
+    
+    # Weighted least squares on relative error, so the small sizes count as
+    # much as the large ones (whose timings also carry cache effects)
+    weights = [1.0 / (t * t) for t in times]
+    total_weight = sum(weights)
+    y_mean = sum(w * t for w, t in zip(weights, times)) / total_weight
+    
+    residuals = []
+    for _, f in COMPLEXITY_CLASSES:
+        xs = [f(n) for n in sizes]
+        x_mean = sum(w * x for w, x in zip(weights, xs)) / total_weight
+        var = sum(w * (x - x_mean) ** 2 for w, x in zip(weights, xs))
+        covar = sum(w * (x - x_mean) * (t - y_mean) for w, x, t in zip(weights, xs, times))
+        b = max(covar / var, 0.0) if var else 0.0
+        a = y_mean - b * x_mean
+        residuals.append(sum(w * (t - (a + b * x)) ** 2 for w, x, t in zip(weights, xs, times)))
+    
+    # Extra growth terms always fit noise slightly better, so prefer the
+    # cheapest class within a margin of the best fit.
+    best = min(residuals)
+    for (name, _), residual in zip(COMPLEXITY_CLASSES, residuals):
+        if residual <= best * 1.5 + 0.01:
+            return name
+    return COMPLEXITY_CLASSES[-1][0]
+
+
+class ComplexityChecker:
+    """Checks each probed method's empirical growth against its budget."""
+    
+    def __init__(self, sizes=None, use_model=True, rounds=DEFAULT_ROUNDS):
+        self.sizes = sizes or DEFAULT_SIZES
+        self.use_model = use_model
+        self.rounds = rounds
+    
+    def check(self, assessment_names=None):
+        """Check every probe of the given assessments; return the failures."""
+        failures = []
+        for (assessment_name, level, class_name), (build, probes) in PROBES.items():
+            if assessment_names and assessment_name not in assessment_names:
+                continue
+            
+            print(f"\n🔬 {assessment_name} {level} {class_name}")
+            print("-" * 60)
+            try:
+                system_class = load_solution(assessment_name, level, class_name, self.use_model)
+            except (ImportError, AttributeError) as e:
+                print(f"❌ Could not load solution: {e}")
+                failures.append((assessment_name, class_name, None))
+                continue
+            
+            for method_name, budget, call in probes:
+                if not hasattr(system_class, method_name.partition('[')[0]):
+                    print(f"  ⚠️  {method_name}: not implemented")
+                    continue
+                
+                try:
+                    fitted = self._measure(system_class, build, call)
+                except Exception as e:
+                    print(f"  ❌ {method_name}: raised {type(e).__name__}: {e}")
+                    failures.append((assessment_name, class_name, method_name))
+                    continue
+                
+                if CLASS_NAMES.index(fitted) <= CLASS_NAMES.index(budget):
+                    status = "✅"
+                elif CLASS_DEGREES[fitted] <= CLASS_DEGREES[budget]:
+                    status = "⚠️ "  # Only a log factor over: within timing noise
+                else:
+                    status = "❌"
+                    failures.append((assessment_name, class_name, method_name))
+                print(f"  {status} {method_name}: observed {fitted}, budget {budget}")
+            
+            probed = {method_name.partition('[')[0] for method_name, _, _ in probes}
+            unbudgeted = sorted(
+                name for name, _ in inspect.getmembers(system_class, inspect.isfunction)
+                if not name.startswith('_') and name not in probed
+            )
+            if unbudgeted:
+                print(f"  ℹ️  No budget declared: {', '.join(unbudgeted)}")
+        
+        return failures
+    
+    def _measure(self, system_class, build, call, repeats=5):
+        """Time one method at each size over several rounds and fit the median timings."""
+        samples = {n: [] for n in self.sizes}
+        # Rounds sweep every size in turn, so drift in machine load hits all sizes alike
+        for _ in range(self.rounds):
+            for n in self.sizes:
+                system = build(system_class, n)
+                # Keep the calls of all repeats within a tenth of the state size
+                max_calls = max(1, n // (10 * repeats))
+                samples[n].append(time_call(system, call, max_calls=max_calls, repeats=repeats))
+        times = [statistics.median(samples[n]) for n in self.sizes]
+        return fit_complexity(self.sizes, times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Empirical complexity checks for assessment solutions")
+    parser.add_argument(
+        "assessments",
+        nargs="*",
+        metavar="assessment",
+        help="Assessments to check (default: all)"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["candidate", "model"],
+        default="model",
+        help="Check model solutions or candidate implementations"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="State sizes to time each method at (default: 500 1000 2000 4000 8000 16000)"
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=DEFAULT_ROUNDS,
+        help="Times each size is rebuilt and timed; the median is fitted (default: 3)"
+    )
+    
+    args = parser.parse_args()
+    
+    checker = ComplexityChecker(sizes=args.sizes, use_model=args.mode == "model", rounds=args.rounds)
+    failures = checker.check(args.assessments)
+    
+    print(f"\n{'='*60}")
+    if failures:
+        print(f"❌ {len(failures)} check(s) over budget or failing")
+        sys.exit(1)
+    print("✅ All probed methods within budget")
+
+
+if __name__ == "__main__":
+    main()
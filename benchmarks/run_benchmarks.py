@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Scalability Benchmark Runner
+Drives each model solution at growing operation counts and reports
+throughput (ops/sec) and peak memory, saving results as a JSON baseline.
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from workloads import WORKLOADS, load_solution
+
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6]
+DEFAULT_RESULTS = Path(__file__).parent / "results" / "latest.json"
+
+
+def _run_size(assessment_name, n, measure_memory, conn):
+    """Run one workload size in a child process and send back its measurements."""
+    level, class_name, workload = WORKLOADS[assessment_name]
+    system_class = load_solution(assessment_name, level, class_name)
+    
+    start = time.perf_counter()
+    workload(system_class, n, random.Random(n))
+    elapsed = time.perf_counter() - start
+    
+    peak_mb = None
+    if measure_memory:
+        # Separate pass: tracemalloc slows allocation-heavy code down noticeably
+        tracemalloc.start()
+        workload(system_class, n, random.Random(n))
+        peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    
+    conn.send({'ops_per_sec': n / elapsed, 'seconds': elapsed, 'peak_mb': peak_mb})
+    conn.close()
+
+
+class BenchmarkRunner:
+    """Runs workloads at each size, isolating every run in its own process."""
+    
+    def __init__(self, timeout=60.0, measure_memory=True):
+        self.timeout = timeout
+        self.measure_memory = measure_memory
+    
+    def run(self, assessment_names, sizes):
+        """Benchmark each assessment at each size; larger sizes are skipped after a timeout."""
+        results = {}
+        for assessment_name in assessment_names:
+            level, class_name, _ = WORKLOADS[assessment_name]
+            print(f"\n📊 {assessment_name} ({level} {class_name})")
+            print(f"{'size':>12}  {'ops/sec':>12}  {'seconds':>9}  {'peak MB':>9}")
+            print("-" * 50)
+            
+            results[assessment_name] = {}
+            timed_out = False
+            for n in sizes:
+                if timed_out:
+                    result = {'status': 'skipped'}
+                else:
+                    result = self._run_isolated(assessment_name, n)
+                    timed_out = result['status'] == 'timeout'
+                results[assessment_name][str(n)] = result
+                self._print_row(n, result)
+        
+        return results
+    
+    def _run_isolated(self, assessment_name, n):
+        """Run one size in a child process so a blow-up cannot hang the whole suite."""
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_run_size, args=(assessment_name, n, self.measure_memory, child_conn)
+        )
+        process.start()
+        child_conn.close()
+        
+        if not parent_conn.poll(self.timeout):
+            process.terminate()
+            process.join()
+            return {'status': 'timeout'}
+        
+        try:
+            result = parent_conn.recv()
+        except EOFError:
+            result = None
+        process.join()
+        
+        if result is None:
+            return {'status': 'error', 'exit_code': process.exitcode}
+        
+        result['status'] = 'ok'
+        return result
+    
+    def _print_row(self, n, result):
+        """Print one result row."""
+        if result['status'] == 'ok':
+            peak = f"{result['peak_mb']:9.2f}" if result['peak_mb'] is not None else f"{'-':>9}"
+            print(f"{n:>12,}  {result['ops_per_sec']:>12,.0f}  {result['seconds']:>9.2f}  {peak}")
+        elif result['status'] == 'timeout':
+            print(f"{n:>12,}  ⏰ timed out after {self.timeout:.0f}s")
+        elif result['status'] == 'skipped':
+            print(f"{n:>12,}  ⏭️  skipped (smaller size timed out)")
+        else:
+            print(f"{n:>12,}  ❌ failed (exit code {result['exit_code']})")
+    
+    def compare(self, results, baseline, tolerance):
+        """Print throughput changes against a baseline; return the regressions found."""
+        regressions = []
+        print(f"\n{'='*60}")
+        print(f"📈 COMPARISON WITH BASELINE (tolerance {tolerance:.0%})")
+        print(f"{'='*60}")
+        
+        for assessment_name, sizes in results.items():
+            for size, result in sizes.items():
+                base = baseline.get(assessment_name, {}).get(size)
+                if not base or base['status'] != 'ok':
+                    continue
+                
+                if result['status'] != 'ok':
+                    regressions.append((assessment_name, size))
+                    print(f"❌ {assessment_name} @ {int(size):,}: {result['status']} (baseline ok)")
+                    continue
+                
+                ratio = result['ops_per_sec'] / base['ops_per_sec']
+                regressed = ratio < 1 - tolerance
+                if regressed:
+                    regressions.append((assessment_name, size))
+                status = "❌" if regressed else "✅"
+                print(f"{status} {assessment_name} @ {int(size):,}: {ratio:.2f}x baseline throughput")
+        
+        return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalability benchmarks for the model solutions")
+    parser.add_argument(
+        "assessments",
+        nargs="*",
+        metavar="assessment",
+        help="Assessments to benchmark (default: all)"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Operation counts to run (default: 1000 10000 100000 1000000)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Seconds allowed per size before larger sizes are skipped (default: 60)"
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the tracemalloc pass that measures peak memory"
+    )
+    parser.add_argument(
+        "--save",
+        type=Path,
+        default=DEFAULT_RESULTS,
+        help=f"Where to write the JSON results (default: {DEFAULT_RESULTS})"
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="BASELINE",
+        help="Compare throughput against a saved JSON baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed throughput drop before a size counts as a regression (default: 0.2)"
+    )
+    
+    args = parser.parse_args()
+    
+    assessment_names = args.assessments or list(WORKLOADS)
+    unknown = [name for name in assessment_names if name not in WORKLOADS]
+    if unknown:
+        print(f"❌ Unknown assessment(s): {', '.join(unknown)}")
+        print(f"   Available: {', '.join(WORKLOADS)}")
+        sys.exit(2)
+    
+    runner = BenchmarkRunner(timeout=args.timeout, measure_memory=not args.no_memory)
+    results = runner.run(assessment_names, args.sizes)
+    
+    args.save.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.save, 'w') as f:
+        json.dump({
+            'python': sys.version,
+            'created_at': time.time(),
+            'results': results
+        }, f, indent=2)
+    print(f"\n💾 Results saved to {args.save}")
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = runner.compare(results, baseline, args.tolerance)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark Workloads
+One deterministic operation mix per assessment, driving its model solution.
+
+Each workload performs exactly n operations against a fresh system so that
+ops/sec is comparable across sizes and across runs.
+"""
+
+import importlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from assessments.test_config import get_full_import_path
+
+
+def load_solution(assessment_name, level, class_name, use_model=True):
+    """Import a class from an assessment's model solution (or candidate solution)."""
+    module = importlib.import_module(get_full_import_path(assessment_name, level, use_model))
+    return getattr(module, class_name)
+
+
+def bench_banking(BankingSystem, n, rng):
+    """Accounts with deposits, withdrawals, transfers, summaries and searches."""
+    bank = BankingSystem()
+    account_count = n // 100 + 2
+    accounts = [bank.create_account(f"Customer {i}", "checking", 1000.0) for i in range(account_count)]
+    
+    for _ in range(n - account_count):
+        r = rng.random()
+        account = accounts[rng.randrange(account_count)]
+        if r < 0.40:
+            bank.deposit(account, rng.randint(1, 500))
+        elif r < 0.65:
+            bank.withdraw(account, rng.randint(1, 300))
+        elif r < 0.80:
+            bank.transfer_funds(account, accounts[rng.randrange(account_count)], rng.randint(1, 200))
+        elif r < 0.90:
+            bank.get_balance(account)
+        elif r < 0.95:
+            bank.get_account_summary(account)
+        else:
+            bank.search_transactions(account, "transfer")
+    
+    return bank
+
+
+def bench_chat(ChatPlatform, n, rng):
+    """Users sending, reading and editing direct messages."""
+    chat = ChatPlatform()
+    user_count = n // 100 + 2
+    for i in range(user_count):
+        chat.register_user(f"user{i}", f"User {i}")
+    
+    sent = []
+    for _ in range(n - user_count):
+        r = rng.random()
+        sender = f"user{rng.randrange(user_count)}"
+        if r < 0.60 or not sent:
+            message_id = chat.send_message(sender, f"user{rng.randrange(user_count)}", "hello there")
+            sent.append((message_id, sender))
+        elif r < 0.85:
+            chat.get_messages(sender)
+        elif r < 0.95:
+            message_id, author = sent[rng.randrange(len(sent))]
+            chat.edit_message(message_id, "edited hello", author)
+        else:
+            chat.search_messages(sender, "hello")
+    
+    return chat
+
+
+def bench_file_system(FileSystemSimulator, n, rng):
+    """Uploads, reads, copies and prefix searches at increasing timestamps."""
+    fs = FileSystemSimulator()
+    uploaded = 0
+    
+    for i in range(n):
+        r = rng.random()
+        timestamp = 1000 + i
+        if r < 0.50 or uploaded == 0:
+            fs.upload_file(f"file{uploaded}.txt", rng.randint(1, 1000), timestamp)
+            uploaded += 1
+        elif r < 0.85:
+            fs.get_file(f"file{rng.randrange(uploaded)}.txt", timestamp)
+        elif r < 0.99:
+            fs.copy_file(f"file{rng.randrange(uploaded)}.txt", f"copy{i}.txt", timestamp)
+        else:
+            fs.search_files(f"file{rng.randrange(10)}", timestamp)
+    
+    return fs
+
+
+def bench_inventory(InventoryManager, n, rng):
+    """Items with stock updates, sales, lookups and category filters."""
+    inventory = InventoryManager()
+    item_count = n // 10 + 2
+    categories = [f"category{i}" for i in range(20)]
+    for i in range(item_count):
+        inventory.add_item(f"item{i}", f"Item {i}", categories[i % 20], rng.randint(1, 100), 1000)
+    
+    for _ in range(n - item_count):
+        r = rng.random()
+        item_id = f"item{rng.randrange(item_count)}"
+        if r < 0.45:
+            inventory.update_stock(item_id, rng.randint(1, 10), "add")
+        elif r < 0.70:
+            inventory.process_sale(item_id, rng.randint(1, 5))
+        elif r < 0.99:
+            inventory.get_item(item_id)
+        else:
+            inventory.get_items_by_category(categories[rng.randrange(20)])
+    
+    return inventory
+
+
+def bench_task_queue(TaskQueue, n, rng):
+    """Prioritised task submission, dispatch and completion."""
+    queue = TaskQueue()
+    task_ids = []
+    
+    for i in range(n):
+        r = rng.random()
+        if r < 0.50 or not task_ids:
+            task_ids.append(queue.add_task(f"task{i}", priority=rng.randint(1, 10)))
+        elif r < 0.70:
+            queue.get_next_task()
+        elif r < 0.90:
+            queue.complete_task(task_ids[rng.randrange(len(task_ids))])
+        else:
+            queue.get_task_status(task_ids[rng.randrange(len(task_ids))])
+    
+    return queue
+
+
+def bench_welfare_tracker(ModelWelfareTracker, n, rng):
+    """Interaction logging with per-model and per-user queries."""
+    tracker = ModelWelfareTracker()
+    model_count = n // 1000 + 2
+    user_count = n // 10 + 2
+    for i in range(model_count):
+        tracker.register_model(f"model{i}", f"Model {i}", "llm")
+    
+    for i in range(n - model_count):
+        r = rng.random()
+        model_id = f"model{rng.randrange(model_count)}"
+        if r < 0.80:
+            tracker.log_interaction(model_id, f"user{rng.randrange(user_count)}", 1000 + i)
+        elif r < 0.95:
+            tracker.get_interaction_count(model_id)
+        elif r < 0.99:
+            tracker.get_interactions_in_timerange(model_id, i, i + 100)
+        else:
+            tracker.get_user_interactions(f"user{rng.randrange(user_count)}")
+    
+    return tracker
+
+
+# assessment_name -> (level, class name, workload)
+WORKLOADS = {
+    'banking_system': ('level3', 'BankingSystem', bench_banking),
+    'chat_platform': ('level3', 'ChatPlatform', bench_chat),
+    'file_system_commands': ('level4', 'FileSystemSimulator', bench_file_system),
+    'inventory_system': ('level4', 'InventoryManager', bench_inventory),
+    'task_queue': ('level4', 'TaskQueue', bench_task_queue),
+    'model_welfare_tracker': ('level4', 'ModelWelfareTracker', bench_welfare_tracker),
+}